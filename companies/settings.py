@@ -32,6 +32,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
 ]
 
 REST_FRAMEWORK = {
@@ -47,6 +48,9 @@ REST_FRAMEWORK = {
 
 MIDDLEWARE = [
     # 'django.middleware.locale.LocaleMiddleware',
+    'companies_app.instrumentation.InstrumentationMiddleware',
+    'companies_app.duplicates.DuplicateQueriesMiddleware',
+    'companies_app.routers.ReplicaMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -60,7 +64,7 @@ ROOT_URLCONF = 'companies.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'BACKEND': 'companies_app.instrumentation.TimedTemplates',
         'DIRS': [BASE_DIR / 'templates']
         ,
         'APP_DIRS': True,
@@ -70,6 +74,7 @@ TEMPLATES = [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'companies_app.fragments.fragment_settings',
             ],
         },
     },
@@ -95,6 +100,103 @@ DATABASES = {
     }
 }
 
+# Optional connection pool of companies_app.pool, enabled by a pool size; Django then
+# returns the connection to the pool at the end of every request (CONN_MAX_AGE=0)
+
+POSTGRES_POOL_SIZE = int(getenv('POSTGRES_POOL_SIZE', '0'))
+if POSTGRES_POOL_SIZE:
+    DATABASES['default']['ENGINE'] = 'companies_app.pool'
+    DATABASES['default']['OPTIONS']['pool'] = {
+        'max_size': POSTGRES_POOL_SIZE,
+        'idle_timeout': float(getenv('POSTGRES_POOL_IDLE_TIMEOUT', '300')),
+        'timeout': float(getenv('POSTGRES_POOL_TIMEOUT', '5')),
+    }
+
+# Read replicas: comma-separated host[:port][/name] of hot standbys of the default
+# database, read by safe requests, see companies_app.routers
+
+DATABASE_REPLICAS = []
+for index, replica in enumerate(filter(None, getenv('POSTGRES_REPLICAS', '').split(',')), start=1):
+    replica_address, _, replica_name = replica.partition('/')
+    replica_host, _, replica_port = replica_address.partition(':')
+    DATABASES[f'replica{index}'] = {
+        **DATABASES['default'],
+        'NAME': replica_name or DATABASES['default']['NAME'],
+        'HOST': replica_host,
+        'PORT': replica_port or DATABASES['default']['PORT'],
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append(f'replica{index}')
+
+DATABASE_ROUTERS = ['companies_app.routers.ReplicaRouter']
+REPLICA_PIN_SECONDS = int(getenv('REPLICA_PIN_SECONDS', '5'))
+
+# Cache of the counters and the template fragments: 'locmem', 'file' or 'db'.
+# The 'db' backend needs its table: python manage.py createcachetable
+
+CACHE_BACKENDS = {
+    'locmem': ('django.core.cache.backends.locmem.LocMemCache', ''),
+    'file': ('django.core.cache.backends.filebased.FileBasedCache', str(BASE_DIR / '.cache')),
+    'db': ('django.core.cache.backends.db.DatabaseCache', 'cache_table'),
+}
+CACHE_BACKEND, CACHE_LOCATION = CACHE_BACKENDS[getenv('CACHE_BACKEND', 'locmem')]
+
+CACHES = {
+    'default': {
+        'BACKEND': CACHE_BACKEND,
+        'LOCATION': getenv('CACHE_LOCATION') or CACHE_LOCATION,
+    }
+}
+
+# Template fragment cache, see companies_app.fragments
+
+FRAGMENT_CACHE_TIMEOUT = int(getenv('FRAGMENT_CACHE_TIMEOUT', '600'))
+
+# Serialization of the API list pages from database rows, see companies_app.rows
+
+FAST_LIST_SERIALIZATION = getenv('FAST_LIST_SERIALIZATION', 'on') != 'off'
+
+# Equipment leaderboards: rows per leaderboard and weight of the prior mean of the
+# Bayesian average, in reviews, see companies_app.leaderboards
+
+LEADERBOARD_SIZE = int(getenv('LEADERBOARD_SIZE', '20'))
+LEADERBOARD_PRIOR_WEIGHT = int(getenv('LEADERBOARD_PRIOR_WEIGHT', '10'))
+
+# Homepage counters: 'exact', 'refresh' or 'estimate', see companies_app.counters
+
+COUNTERS_MODE = getenv('COUNTERS_MODE', 'exact')
+COUNTERS_TIMEOUT = int(getenv('COUNTERS_TIMEOUT', '300'))
+
+# Request instrumentation, see companies_app.instrumentation
+
+INSTRUMENTATION_SAMPLE_RATE = float(getenv('INSTRUMENTATION_SAMPLE_RATE', '1'))
+INSTRUMENTATION_SLOW_MS = float(getenv('INSTRUMENTATION_SLOW_MS', '500'))
+
+# N+1 query detector: 'off', 'log' or 'raise', see companies_app.duplicates
+
+DUPLICATE_QUERIES = getenv('DUPLICATE_QUERIES', 'off')
+DUPLICATE_QUERIES_THRESHOLD = int(getenv('DUPLICATE_QUERIES_THRESHOLD', '3'))
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'companies_app.instrumentation': {
+            'handlers': ['console'],
+            'level': getenv('INSTRUMENTATION_LOG_LEVEL', 'WARNING'),
+            'propagate': False,
+        },
+        'companies_app.duplicates': {
+            'handlers': ['console'],
+            'level': 'WARNING',
+            'propagate': False,
+        },
+    },
+}
+
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
 
@@ -0,0 +1,18 @@
+"""
+Production settings of the companies project.
+
+Use with DJANGO_SETTINGS_MODULE=companies.settings_production. Debug pages are
+off and database connections are reused: kept open for POSTGRES_CONN_MAX_AGE
+seconds and checked before the first query of a request, or, with
+POSTGRES_POOL_SIZE set, taken from the pool of companies_app.pool and returned
+to it at the end of every request.
+"""
+from .settings import *  # noqa: F401, F403
+from .settings import DATABASES, POSTGRES_POOL_SIZE, getenv
+
+DEBUG = False
+ALLOWED_HOSTS = getenv('ALLOWED_HOSTS', 'localhost').split(',')
+
+for database in DATABASES.values():
+    database['CONN_MAX_AGE'] = 0 if POSTGRES_POOL_SIZE else int(getenv('POSTGRES_CONN_MAX_AGE', '600'))
+    database['CONN_HEALTH_CHECKS'] = True
@@ -14,8 +14,7 @@ Defines inlines for related models.
 
 from django.contrib import admin
 
-from .models import (Address, Category, Client, Company, CompanyEquipment,
-                     Equipment, Review)
+from .models import Address, Category, Client, Company, CompanyEquipment, Equipment, Review
 
 
 class EquipmentInline(admin.TabularInline):
@@ -8,3 +8,7 @@ class CompaniesAppConfig(AppConfig):
 
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'companies_app'
+
+    def ready(self):
+        """Connect the signal handlers of the application, before any database connects."""
+        from companies_app import signals, wrappers  # noqa: F401, WPS433
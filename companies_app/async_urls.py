@@ -0,0 +1,18 @@
+"""
+URL configuration of the async pages, included under async/ with the 'async' namespace.
+
+The routes mirror the names and arguments of their sync versions in companies_app.urls.
+"""
+from django.urls import path
+
+from . import async_views
+
+app_name = 'async'
+
+urlpatterns = [
+    path('', async_views.homepage, name='homepage'),
+    path('equipments/', async_views.equipments_view, name='equipments'),
+    path('equipment/<uuid:equipment_id>/', async_views.equipment_view, name='equipment_view'),
+    path('companies/', async_views.companies_view, name='companies'),
+    path('company/<uuid:company_id>/', async_views.company_detail_view, name='company_detail'),
+]
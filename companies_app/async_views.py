@@ -0,0 +1,183 @@
+"""
+Async versions of the read-heavy HTML pages, served under async/.
+
+The views read through the async ORM and run their independent queries
+together with asyncio.gather, so under an ASGI server a request waiting on
+the database leaves the event loop to the other requests. Templates are
+rendered in a thread through sync_to_async, as they read the session, the
+user and the lazy querysets of the cached fragments. Django runs every async
+ORM call through thread-sensitive sync_to_async, so the gathered queries of
+one request still run one after another on its thread.
+"""
+import asyncio
+from functools import partial, update_wrapper
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.views import redirect_to_login
+from django.shortcuts import aget_object_or_404, redirect, render
+
+from .autocomplete import linkable_companies, linkable_state
+from .conditional import async_conditional_page
+from .counters import aget_counters
+from .forms import ReviewForm
+from .models import Client, Company, CompanyStats, Equipment
+from .pagination import KeysetPaginator, lazy_page
+from .views import (
+    CLIENT_USER,
+    CONTEXT_COMPANIES,
+    CONTEXT_EQUIPMENTS,
+    CONTEXT_REVIEWS,
+    CURSOR,
+    METHOD_POST,
+)
+
+arender = sync_to_async(render)
+
+
+def async_login_required(view):
+    """
+    Redirect anonymous users of an async view to the login page.
+
+    Args:
+        view: Async view function.
+
+    Returns:
+        Async view function checking the user first.
+    """
+    return update_wrapper(partial(_require_login, view), view)
+
+
+async def _require_login(view, request, *args, **kwargs):
+    user = await request.auser()
+    if not user.is_authenticated:
+        return redirect_to_login(request.get_full_path())
+    # Spares the sync code of the request, templates included, loading the user again.
+    request.user = user
+    return await view(request, *args, **kwargs)
+
+
+async def homepage(request):
+    """
+    Async view function for rendering the homepage.
+
+    Args:
+        request: Request object.
+
+    Returns:
+        HttpResponse: Rendered HTML template.
+    """
+    return await arender(request, 'index.html', context=await aget_counters())
+
+
+@async_login_required
+async def equipments_view(request):
+    """
+    Async view function for rendering the equipments page.
+
+    Args:
+        request: Request object.
+
+    Returns:
+        HttpResponse: Rendered HTML template.
+    """
+    paginator = KeysetPaginator(
+        Equipment.objects.select_related(CLIENT_USER, 'category'), ('title', 'size'),
+    )
+    context = {
+        # Fetched while rendering, only if the equipment-list fragment is not cached.
+        CONTEXT_EQUIPMENTS: lazy_page(paginator, request.GET.get(CURSOR)),
+    }
+    return await arender(request, 'pages/equipments.html', context)
+
+
+@async_login_required
+async def companies_view(request):
+    """
+    Async view function for rendering the companies page.
+
+    Args:
+        request: Request object.
+
+    Returns:
+        HttpResponse: Rendered HTML template.
+    """
+    paginator = KeysetPaginator(
+        Company.objects.select_related(CLIENT_USER, 'address'), ('title', 'phone'),
+    )
+    context = {
+        CONTEXT_COMPANIES: await paginator.apage(request.GET.get(CURSOR)),
+    }
+    return await arender(request, 'pages/companies.html', context)
+
+
+@async_login_required
+@async_conditional_page(Company, 'company_id')
+async def company_detail_view(request, company_id):
+    """
+    Async view function for rendering the company detail page.
+
+    The company and its statistics are read concurrently.
+
+    Args:
+        request: Request object.
+        company_id (int): Company ID.
+
+    Returns:
+        HttpResponse: Rendered HTML template.
+    """
+    company, stats = await asyncio.gather(
+        aget_object_or_404(Company, id=company_id),
+        CompanyStats.objects.filter(pk=company_id).afirst(),
+    )
+    context = {'company': company, 'stats': stats}
+    return await arender(request, 'pages/company_detail.html', context)
+
+
+@async_login_required
+@async_conditional_page(Equipment, 'equipment_id', linkable_state)
+async def equipment_view(request, equipment_id):
+    """
+    Async view function for rendering the equipment detail page.
+
+    The equipment and the companies it can be added to are read concurrently.
+
+    Args:
+        request: Request object.
+        equipment_id (int): Equipment ID.
+
+    Returns:
+        HttpResponse: Rendered HTML template.
+    """
+    user = await request.auser()
+    equipment, companies = await asyncio.gather(
+        aget_object_or_404(Equipment, id=equipment_id),
+        _alist(linkable_companies(user, equipment_id)),
+    )
+    if request.method == METHOD_POST:
+        form = ReviewForm(request.POST)
+        if await _save_review(form, equipment, user):
+            return redirect('async:equipment_view', equipment_id=equipment_id)
+    else:
+        form = ReviewForm()
+
+    context = {
+        'equipment': equipment,
+        CONTEXT_REVIEWS: equipment.reviews.select_related(CLIENT_USER).all(),
+        'form': form,
+        CONTEXT_COMPANIES: companies,
+    }
+    return await arender(request, 'pages/equipment_details.html', context)
+
+
+async def _save_review(form, equipment, user) -> bool:
+    if not await sync_to_async(form.is_valid)():
+        return False
+    review = form.save(commit=False)
+    review.equipment = equipment
+    review.client = await Client.objects.aget(user=user)
+    await review.asave()
+    return True
+
+
+async def _alist(queryset) -> list:
+    return [row async for row in queryset]
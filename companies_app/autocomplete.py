@@ -0,0 +1,55 @@
+"""Lookup of the companies a user can link an equipment to."""
+from django.db.models import Count, Exists, Max, OuterRef
+
+from .models import Company, CompanyEquipment
+
+SUGGESTIONS_LIMIT = 20
+
+
+def linkable_companies(user, equipment_id=None, prefix=''):
+    """
+    Return the user's companies not linked to an equipment yet.
+
+    The companies are read through the (client, title) indexes and the link check is
+    a NOT EXISTS probe of the (company, equipment) unique index, so the cost depends
+    on the user's own companies only.
+
+    Args:
+        user: User owning the companies.
+        equipment_id: Equipment the companies must not be linked to, if any.
+        prefix (str): Case-insensitive prefix of the company title.
+
+    Returns:
+        QuerySet: Matching companies ordered by title, at most SUGGESTIONS_LIMIT.
+    """
+    companies = Company.objects.filter(client__user=user)
+    if equipment_id is not None:
+        links = CompanyEquipment.objects.filter(company=OuterRef('pk'), equipment=equipment_id)
+        companies = companies.filter(~Exists(links))
+    if prefix:
+        companies = companies.filter(title__istartswith=prefix)
+    return companies.order_by('title', 'phone')[:SUGGESTIONS_LIMIT]
+
+
+def linkable_state(user, equipment_id) -> tuple:
+    """
+    Read the state of the companies offered by linkable_companies.
+
+    A company is offered or not depending on its title and its link to the
+    equipment, so the state counts the user's companies and those linked.
+
+    Args:
+        user: User owning the companies.
+        equipment_id: Equipment the companies are offered for.
+
+    Returns:
+        tuple: Latest modified timestamp of the companies, and their number with
+            the number of those linked to the equipment.
+    """
+    links = CompanyEquipment.objects.filter(company=OuterRef('pk'), equipment=equipment_id)
+    state = Company.objects.filter(client__user=user).aggregate(
+        latest=Max('modified'),
+        companies=Count('id'),
+        linked=Count('pk', filter=Exists(links)),
+    )
+    return state['latest'], f'{state["companies"]}.{state["linked"]}'
@@ -0,0 +1,123 @@
+"""
+Benchmark suites and the JSON baselines summarizing their runs.
+
+A baseline holds the environment, the size of the dataset and the results of
+every suite; compare_baselines diffs two runs.
+"""
+import platform
+from datetime import datetime, timezone
+
+import django
+from django.db import connection
+
+from .benchmark import BENCHMARK_REPEAT, EQUIPMENT, run_routes
+from .connection_benchmark import run_connections
+from .load import run_asgi
+from .models import Client, Company, CompanyEquipment, Equipment, Review
+from .serializer_benchmark import run_serializers
+
+BASELINE_VERSION = 1
+SUITES = 'suites'
+# Name and runner of every suite, and whether the runner requests pages as the user.
+SUITE_RUNNERS = (
+    ('routes', run_routes, True),
+    ('connections', run_connections, True),
+    ('asgi', run_asgi, True),
+    ('serializers', run_serializers, False),
+)
+SUITE_NAMES = tuple(name for name, _, _ in SUITE_RUNNERS)
+METRICS = ('queries', 'throughput_rps', 'rows_per_s', 'p50_ms', 'p95_ms', 'peak_memory_kb')
+DATASET_MODELS = (
+    ('clients', Client),
+    ('companies', Company),
+    (EQUIPMENT, Equipment),
+    ('links', CompanyEquipment),
+    ('reviews', Review),
+)
+
+
+def run_suites(names, user, repeat=BENCHMARK_REPEAT) -> dict:
+    """
+    Run benchmark suites as a user.
+
+    Args:
+        names (list): Suite names from SUITE_NAMES.
+        user: Benchmarked user.
+        repeat (int): Number of timed requests of every benchmark.
+
+    Returns:
+        dict: Results by suite name.
+    """
+    runners = {name: (runner, as_user) for name, runner, as_user in SUITE_RUNNERS}
+    suites = {}
+    for name in names:
+        runner, as_user = runners[name]
+        suites[name] = runner(user, repeat) if as_user else runner(repeat)
+    return suites
+
+
+def build_baseline(suites: dict, repeat: int) -> dict:
+    """
+    Wrap suite results into a baseline.
+
+    Args:
+        suites (dict): Results by suite name.
+        repeat (int): Number of timed requests of every benchmark.
+
+    Returns:
+        dict: JSON-serializable baseline.
+    """
+    return {
+        'version': BASELINE_VERSION,
+        'created': datetime.now(timezone.utc).isoformat(),
+        'repeat': repeat,
+        'environment': {
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'database': f'{connection.vendor} {connection.pg_version}',
+        },
+        'dataset': {name: model.objects.count() for name, model in DATASET_MODELS},
+        SUITES: suites,
+    }
+
+
+def compare_baselines(previous: dict, current: dict) -> list:
+    """
+    Describe the changes between two baselines.
+
+    Args:
+        previous (dict): Earlier baseline.
+        current (dict): Later baseline.
+
+    Returns:
+        list: One line per benchmark present in either baseline.
+    """
+    lines = []
+    for suite in sorted(previous[SUITES].keys() | current[SUITES].keys()):
+        before = previous[SUITES].get(suite, {})
+        after = current[SUITES].get(suite, {})
+        for name in sorted(before.keys() | after.keys()):
+            change = _describe(before.get(name), after.get(name))
+            lines.append(f'{suite}/{name}: {change}')
+    return lines
+
+
+def _describe(before, after) -> str:
+    if before is None:
+        return 'added'
+    if after is None:
+        return 'removed'
+    if after.get('server_error'):
+        return f'server error {after["status"]}'
+    return ', '.join(
+        _change(metric, before[metric], after[metric])
+        for metric in METRICS
+        if metric in before and metric in after
+    )
+
+
+def _change(metric: str, before, after) -> str:
+    if not before:
+        return f'{metric} {before} -> {after}'
+    ratio = (after - before) / before
+    return f'{metric} {before} -> {after} ({ratio:+.0%})'
@@ -0,0 +1,219 @@
+"""
+End-to-end benchmark of the application routes.
+
+The routes suite requests every named route of companies_app.urls, HTML pages
+and API endpoints alike, in process through the Django test client as a
+seeded user. Each route is requested once to count its queries and trace its
+peak memory, then timed over several requests for the p50 and p95 latency.
+A route answering with a server error does not stop the run: it is recorded
+with its status and query count, flagged as server_error and left untimed.
+
+The other suites measure their requests the same way: the connections suite
+in companies_app.connection_benchmark, the asgi suite in companies_app.load
+and the serializers suite in companies_app.serializer_benchmark.
+companies_app.baselines runs the suites and summarizes them in JSON baselines.
+"""
+import tracemalloc
+from contextlib import ExitStack
+from functools import partial
+from http import HTTPStatus
+from statistics import median, quantiles
+from time import perf_counter
+
+from django.conf import settings
+from django.db import connections
+from django.test import Client as TestClient
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLResolver, get_resolver, reverse
+
+from .models import Company, Equipment, Review
+
+BENCHMARK_REPEAT = 20
+ROUTES_URLCONF = 'companies_app.urls'
+SEARCH_TEXT = 'drill'
+EQUIPMENT = 'equipment'
+EXPORT_SAMPLE = (EQUIPMENT, 'ndjson')
+P95_QUANTILES = 20
+KILOBYTE = 1024
+
+
+def discover_routes(urlconf=ROUTES_URLCONF) -> list:
+    """
+    List the named routes of a URL configuration.
+
+    Format suffix variants of the API routes are left out.
+
+    Args:
+        urlconf (str): Module of the URL configuration.
+
+    Returns:
+        list: Route names with the names of their URL arguments, in declaration order.
+    """
+    routes = {}
+    for pattern in _flatten(get_resolver(urlconf).url_patterns):
+        arguments = tuple(pattern.pattern.regex.groupindex)
+        if pattern.name and 'format' not in arguments:
+            routes.setdefault(pattern.name, arguments)
+    return list(routes.items())
+
+
+def route_samples(user) -> dict:
+    """
+    Pick the objects filling the URL arguments of the routes.
+
+    The user's most reviewed equipment is used, so detail pages are benchmarked at their worst.
+
+    Args:
+        user: Benchmarked user.
+
+    Returns:
+        dict: URL argument values by argument name, and by model name for API primary keys.
+
+    Raises:
+        ValueError: If the user has no equipment, company or reviewed equipment.
+    """
+    equipment = Equipment.objects.filter(client__user=user).order_by('-rating_count').first()
+    company = Company.objects.filter(client__user=user).first()
+    review = Review.objects.filter(equipment=equipment).first() if equipment else None
+    if review is None or company is None:
+        raise ValueError(f'{user} has no company or reviewed equipment, seed a dataset first')
+    name, export_format = EXPORT_SAMPLE
+    return {
+        'user_id': user.id,
+        'equipment_id': equipment.id,
+        'company_id': company.id,
+        'review_id': review.id,
+        'name': name,
+        'export_format': export_format,
+        'company': company.id,
+        EQUIPMENT: equipment.id,
+        'review': review.id,
+        'equipment-details': equipment.id,
+        'company-details': company.id,
+        'company-stats': company.id,
+        'category-stats': equipment.category_id,
+    }
+
+
+def route_request(name: str, arguments: tuple, samples: dict) -> tuple:
+    """
+    Build the URL and the query of a route.
+
+    Args:
+        name (str): Route name.
+        arguments (tuple): Names of the URL arguments.
+        samples (dict): Values from route_samples.
+
+    Returns:
+        tuple: URL and query parameters.
+    """
+    kwargs = {}
+    for argument in arguments:
+        sample_key = name.rsplit('-', 1)[0] if argument == 'pk' else argument
+        kwargs[argument] = samples[sample_key]
+    query = {}
+    if name.startswith('search'):
+        query = {'q': SEARCH_TEXT}
+    elif name.startswith('company-autocomplete'):
+        query = {'q': SEARCH_TEXT[0], 'equipment': samples['equipment_id']}
+    return reverse(name, kwargs=kwargs), query
+
+
+def measure(send, repeat: int) -> dict:
+    """
+    Benchmark a request.
+
+    Args:
+        send: Callable sending the request and returning its HTTP status, nothing else.
+        repeat (int): Number of timed requests, at least 2.
+
+    Returns:
+        dict: Status, query count over every database, p50 and p95 latency and peak
+            traced memory, or only the status and query count flagged as server_error.
+    """
+    contexts = [CaptureQueriesContext(db_connection) for db_connection in connections.all()]
+    tracemalloc.start()
+    with ExitStack() as stack:
+        for context in contexts:
+            stack.enter_context(context)
+        status = send()
+    peak_memory = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    # Read before the timed requests, which reset the query logs the contexts slice.
+    queries = sum(len(captured.captured_queries) for captured in contexts)
+    if status >= HTTPStatus.INTERNAL_SERVER_ERROR:
+        return {'status': status, 'queries': queries, 'server_error': True}
+    timings = []
+    for _ in range(repeat):
+        started = perf_counter()
+        send()
+        timings.append((perf_counter() - started) * 1000)
+    return {
+        'status': status,
+        'queries': queries,
+        'p50_ms': round(median(timings), 3),
+        'p95_ms': round(quantiles(timings, n=P95_QUANTILES, method='inclusive')[-1], 3),
+        'peak_memory_kb': round(peak_memory / KILOBYTE, 1),
+    }
+
+
+def run_routes(user, repeat=BENCHMARK_REPEAT) -> dict:
+    """
+    Benchmark every named route as a user.
+
+    Args:
+        user: Logged in user.
+        repeat (int): Number of timed requests of every route.
+
+    Returns:
+        dict: Measurements by route name, with the requested path.
+    """
+    client = TestClient(raise_request_exception=False, HTTP_HOST=benchmark_host())
+    client.force_login(user)
+    samples = route_samples(user)
+    measurements = {}
+    for name, arguments in discover_routes():
+        url, query = route_request(name, arguments, samples)
+        send = partial(get_status, client, url, query)
+        measurements[name] = {'path': url, **measure(send, repeat)}
+    return measurements
+
+
+def benchmark_host() -> str:
+    """
+    Return a host name accepted by ALLOWED_HOSTS.
+
+    Returns:
+        str: Host name.
+    """
+    hosts = [host for host in settings.ALLOWED_HOSTS if host != '*']
+    return hosts[0].lstrip('.') if hosts else 'localhost'
+
+
+def get_status(client, url: str, query: dict, db_connection=None) -> int:
+    """
+    Request a page and read it to the end.
+
+    Args:
+        client: Test client.
+        url (str): Requested path.
+        query (dict): Query parameters.
+        db_connection: Connection closed as at the end of a served request, if given.
+
+    Returns:
+        int: Response status.
+    """
+    response = client.get(url, query)
+    if response.streaming:
+        response.getvalue()
+    if db_connection is not None:
+        db_connection.close_if_unusable_or_obsolete()
+    return response.status_code
+
+
+def _flatten(patterns):
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            yield from _flatten(pattern.url_patterns)
+        else:
+            yield pattern
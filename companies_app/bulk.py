@@ -0,0 +1,175 @@
+"""
+Bulk write actions of the API viewsets.
+
+One request to the bulk/ route of a model creates (POST), updates (PUT) or
+deletes (DELETE) up to BULK_MAX_ITEMS objects. Items are validated with a
+many=True serializer and the valid ones are written in chunks of
+BULK_BATCH_SIZE rows inside a single transaction. The response lists the result
+of every entry in request order, with the errors of the invalid ones.
+"""
+from copy import copy
+
+from django.db import transaction
+from django.db.models import prefetch_related_objects
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+from .serializers import NOT_FOUND, item_pk
+from .signals import post_bulk_write
+
+BULK_MAX_ITEMS = 1000
+BULK_BATCH_SIZE = 500
+
+
+class BulkWriteMixin:
+    """Bulk create, update and delete actions for a model viewset."""
+
+    prefetch_lookups = ()
+
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk_create(self, request):
+        """
+        Create the objects of a list.
+
+        Args:
+            request: Request object with a list of objects.
+
+        Returns:
+            Response: Created objects and errors in request order.
+        """
+        errors, _, validated = self._validate(None, request.data)
+        model = self.get_queryset().model
+        instances = [model(**attrs) for attrs in validated]
+        with transaction.atomic():
+            model.objects.bulk_create(instances, batch_size=BULK_BATCH_SIZE)
+            post_bulk_write.send(sender=model, instances=instances, created=True)
+        prefetch_related_objects(instances, *self.prefetch_lookups)
+        rows = self.get_serializer(instances, many=True).data
+        return self._respond(errors, rows, status.HTTP_201_CREATED)
+
+    @bulk_create.mapping.put
+    def bulk_update(self, request):
+        """
+        Replace the objects of a list, each found by its id.
+
+        Args:
+            request: Request object with a list of objects.
+
+        Returns:
+            Response: Updated objects and errors in request order.
+        """
+        entries = request.data[:BULK_MAX_ITEMS] if isinstance(request.data, list) else []
+        instances = self.get_queryset().in_bulk(list(filter(None, map(item_pk, entries))))
+        errors, entries, validated = self._validate(instances, request.data)
+        updated = [instances[item_pk(entry)] for entry in entries]
+        previous = [copy(instance) for instance in updated]
+        fields = _assign(updated, validated)
+        with transaction.atomic():
+            if fields:
+                self.get_queryset().bulk_update(updated, fields, batch_size=BULK_BATCH_SIZE)
+            post_bulk_write.send(
+                sender=self.get_queryset().model, instances=updated, created=False,
+                previous=previous,
+            )
+        rows = self.get_serializer(updated, many=True).data
+        return self._respond(errors, rows, status.HTTP_200_OK)
+
+    @bulk_create.mapping.delete
+    def bulk_delete(self, request):
+        """
+        Delete the objects of a list of ids.
+
+        Args:
+            request: Request object with a list of ids.
+
+        Returns:
+            Response: Deleted ids and errors in request order.
+
+        Raises:
+            ValidationError: If the request is not a list of at most BULK_MAX_ITEMS ids.
+        """
+        if not isinstance(request.data, list) or len(request.data) > BULK_MAX_ITEMS:
+            raise ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [
+                    f'Expected a list of at most {BULK_MAX_ITEMS} ids.',
+                ],
+            })
+        ids = [item_pk(entry) for entry in request.data]
+        found = self.get_queryset().filter(pk__in=list(filter(None, ids))).order_by()
+        existing = set(found.values_list('pk', flat=True))
+        deleted = [pk for pk in ids if pk in existing]
+        with transaction.atomic():
+            for start in range(0, len(deleted), BULK_BATCH_SIZE):
+                chunk = deleted[start:start + BULK_BATCH_SIZE]
+                self.get_queryset().filter(pk__in=chunk).delete()
+        errors = [{} if pk in existing else {'id': [NOT_FOUND]} for pk in ids]
+        return self._respond(errors, [{'id': pk} for pk in deleted], status.HTTP_200_OK)
+
+    def _validate(self, instances, request_data):
+        """
+        Validate the entries of a bulk request.
+
+        Args:
+            instances (dict): Objects to update by primary key, None to create.
+            request_data: Request data.
+
+        Returns:
+            tuple: Errors of every entry, the valid entries and their validated data.
+
+        Raises:
+            ValidationError: If the request is not a list of at most BULK_MAX_ITEMS entries.
+        """
+        serializer = self.get_serializer(
+            instances, data=request_data, many=True, max_length=BULK_MAX_ITEMS,
+        )
+        if serializer.is_valid():
+            return [{} for _ in request_data], request_data, serializer.validated_data
+        if not isinstance(serializer.errors, list):
+            raise ValidationError(serializer.errors)
+        errors = serializer.errors
+        entries = [entry for entry, error in zip(request_data, errors) if not error]
+        serializer = self.get_serializer(instances, data=entries, many=True)
+        serializer.is_valid(raise_exception=True)
+        return errors, entries, serializer.validated_data
+
+    def _respond(self, errors, rows, success_status):
+        """
+        Merge the written rows and the entry errors into a response.
+
+        Args:
+            errors (list): Errors of every entry, empty for written ones.
+            rows (list): Results of the written entries.
+            success_status (int): Status when every entry was written.
+
+        Returns:
+            Response: Results in request order, 207 Multi-Status if some entries failed.
+        """
+        rows = iter(rows)
+        merged = [{'errors': error} if error else next(rows) for error in errors]
+        response_status = status.HTTP_207_MULTI_STATUS if any(errors) else success_status
+        return Response(merged, status=response_status)
+
+
+def _assign(instances, validated) -> list:
+    """
+    Set validated values on the objects being updated and bump their modified time.
+
+    Args:
+        instances (list): Objects to update.
+        validated (list): Validated data of each object.
+
+    Returns:
+        list: Names of the assigned fields.
+    """
+    fields = set()
+    modified = timezone.now()
+    for instance, attrs in zip(instances, validated):
+        for field, field_value in attrs.items():
+            setattr(instance, field, field_value)
+        instance.modified = modified
+        fields.update(attrs)
+    return sorted(fields | {'modified'}) if fields else []
@@ -0,0 +1,185 @@
+"""
+Changes feed of the model API endpoints, for clients keeping a local copy.
+
+GET /api/<model>/changes/?since=<watermark> returns the rows modified since the
+watermark of the previous call, the ids of the rows deleted since then, and the
+watermark to send next; without since, it starts from the first row. A client
+applies the changes, then the deletions, and repeats until complete is true,
+so a sync reads what changed rather than the whole table.
+
+Database triggers of migration 0013 keep the feed exact: modified is set on
+every insert and update, bulk and raw writes included, a link between a
+company and an equipment touches both, and every deleted row leaves a
+Tombstone. Both timestamps are never earlier than the start of the writing
+transaction, and the watermark stays before the start of every transaction
+still in progress, so rows committed late are not skipped. The feed reads the
+primary database, which sees those transactions.
+
+A page holds up to page_size rows but never splits rows sharing a timestamp,
+such as those of one bulk update: it ends before the first timestamp past the
+limit, or holds the whole group when the group alone is over the limit.
+"""
+from datetime import timedelta, timezone
+
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils.dateparse import parse_datetime
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from .models import Tombstone
+from .pagination import API_MAX_PAGE_SIZE, API_PAGE_SIZE
+from .rows import serialize_queryset
+
+SINCE_PARAM = 'since'
+PAGE_SIZE_PARAM = 'page_size'
+MODIFIED = 'modified'
+# Smallest step of a PostgreSQL timestamp.
+TIMESTAMP_STEP = timedelta(microseconds=1)
+# Start of the oldest transaction in progress on another connection, or now. The
+# activity statistics are read once per transaction unless their snapshot is cleared.
+CLEAR_ACTIVITY_SQL = 'SELECT pg_stat_clear_snapshot()'
+SAFE_WATERMARK_SQL = """
+    SELECT least(statement_timestamp(), min(xact_start))
+    FROM pg_stat_activity
+    WHERE datname = current_database()
+        AND backend_type = 'client backend'
+        AND pid <> pg_backend_pid()
+"""
+
+
+class ChangesFeedMixin:
+    """Changes feed action for a model viewset."""
+
+    @action(detail=False, methods=['get'], url_path='changes')
+    def changes(self, request):
+        """
+        Return the rows changed and deleted since a watermark.
+
+        Args:
+            request: Request object with the optional since and page_size parameters.
+
+        Returns:
+            Response: Changed rows, deleted ids, the next watermark and whether the
+                feed is complete.
+        """
+        since = parse_since(request.query_params.get(SINCE_PARAM))
+        page_size = _page_size(request.query_params.get(PAGE_SIZE_PARAM))
+        queryset = self.get_queryset().using(DEFAULT_DB_ALIAS)
+        until, complete = changes_window(queryset, since, page_size)
+        changed = _between(queryset, MODIFIED, since, until).order_by(MODIFIED, 'pk')
+        return Response({
+            'changes': serialize_queryset(self, changed),
+            'deleted': deleted_ids(queryset.model, since, until),
+            'watermark': format_watermark(until),
+            'complete': complete,
+        })
+
+
+def parse_since(since):
+    """
+    Read the watermark of a changes request.
+
+    Args:
+        since (str | None): Watermark from the previous response.
+
+    Returns:
+        datetime | None: Start of the changes, None for every row.
+
+    Raises:
+        ValidationError: If the watermark is not an ISO 8601 time with a time zone.
+    """
+    if since is None:
+        return None
+    watermark = parse_datetime(since.replace(' ', '+'))
+    if watermark is None or watermark.tzinfo is None:
+        raise ValidationError({SINCE_PARAM: ['Expected a watermark returned by the feed.']})
+    return watermark
+
+
+def format_watermark(watermark) -> str:
+    """
+    Format a watermark for the since parameter.
+
+    Args:
+        watermark (datetime): End of the returned changes.
+
+    Returns:
+        str: ISO 8601 time in UTC.
+    """
+    return watermark.astimezone(timezone.utc).isoformat().replace('+00:00', 'Z')
+
+
+def safe_watermark():
+    """
+    Return the latest time no transaction in progress can still write rows before.
+
+    Returns:
+        datetime: Start of the oldest other transaction in progress, or now.
+    """
+    with connections[DEFAULT_DB_ALIAS].cursor() as cursor:
+        cursor.execute(CLEAR_ACTIVITY_SQL)
+        cursor.execute(SAFE_WATERMARK_SQL)
+        return cursor.fetchone()[0]
+
+
+def changes_window(queryset, since, page_size: int) -> tuple:
+    """
+    Pick the end of a page of changes.
+
+    Args:
+        queryset (QuerySet): Rows of the endpoint.
+        since (datetime | None): Start of the changes, inclusive.
+        page_size (int): Number of rows of a page.
+
+    Returns:
+        tuple: End of the page, exclusive, and whether no later change is ready.
+    """
+    until = safe_watermark()
+    stamps = list(
+        _between(queryset, MODIFIED, since, until).order_by(MODIFIED).values_list(
+            MODIFIED, flat=True,
+        )[:page_size + 1],
+    )
+    if len(stamps) <= page_size:
+        return until, True
+    boundary = stamps[page_size]
+    if boundary == stamps[0]:
+        return boundary + TIMESTAMP_STEP, False
+    return boundary, False
+
+
+def deleted_ids(model, since, until) -> list:
+    """
+    List the rows of a model deleted in a time window and not recreated since.
+
+    Args:
+        model: Model class of the endpoint.
+        since (datetime | None): Start of the window, inclusive.
+        until (datetime): End of the window, exclusive.
+
+    Returns:
+        list: Ids of the deleted rows, none for a first sync, which holds no rows yet.
+    """
+    if since is None:
+        return []
+    tombstones = Tombstone.objects.using(DEFAULT_DB_ALIAS).filter(
+        model=model._meta.model_name,  # noqa: WPS437
+    ).exclude(object_id__in=model.objects.using(DEFAULT_DB_ALIAS).values('pk'))
+    return list(
+        tombstones.filter(deleted__gte=since, deleted__lt=until).order_by().values_list(
+            'object_id', flat=True,
+        ).distinct(),
+    )
+
+
+def _between(queryset, field: str, since, until):
+    queryset = queryset.filter(**{f'{field}__lt': until})
+    return queryset if since is None else queryset.filter(**{f'{field}__gte': since})
+
+
+def _page_size(page_size) -> int:
+    try:
+        return min(max(int(page_size), 1), API_MAX_PAGE_SIZE) if page_size else API_PAGE_SIZE
+    except ValueError:
+        raise ValidationError({PAGE_SIZE_PARAM: ['Expected a number.']})
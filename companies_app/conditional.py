@@ -0,0 +1,230 @@
+"""
+Conditional GET of the detail pages and API objects.
+
+The state of an object is the latest modified timestamp among the object, the
+rows it shows (category, address, the refresh of the company statistics) and
+its child rows (reviews, company equipment links), together with the number
+of child rows, so deleting a child changes it too. It is read with one
+aggregate query over indexed foreign keys. An ETag and a Last-Modified
+derived from it let clients revalidate their copy and get a 304 Not Modified
+while the state is unchanged. A page also showing rows of the user, like the
+companies an equipment can be added to, folds their state in too. API objects
+with expanded relations are always served, as the state leaves the expanded
+rows out.
+"""
+from functools import partial, update_wrapper
+
+from asgiref.sync import sync_to_async
+from django.contrib.messages import get_messages
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Max, Value
+from django.db.models.functions import Greatest
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
+
+from .fieldsets import EXPAND_PARAM
+from .models import Company, Equipment
+
+MODIFIED = 'modified'
+SAFE_METHODS = ('GET', 'HEAD')
+MICROSECONDS = 1000000
+
+# Model, foreign key of the counted child rows, timestamps of rows shown with the object.
+CONDITIONAL_STATES = (
+    (Equipment, 'reviews__equipment', ('category__modified', 'reviews__modified')),
+    (Company, 'companyequipment__company', (
+        'address__modified',
+        'companyequipment__created',
+        'companyequipment__equipment__modified',
+        'stats__refreshed',
+    )),
+)
+
+
+def resource_state(model, pk) -> tuple:
+    """
+    Read the state of an object.
+
+    Args:
+        model: Model class.
+        pk: Primary key of the object.
+
+    Returns:
+        tuple: Latest modified timestamp and number of child rows, None if the object
+            does not exist.
+    """
+    count_relation, timestamps = {
+        state[0]: state[1:] for state in CONDITIONAL_STATES
+    }.get(model, (None, ()))
+    latest = [Max(field) for field in (MODIFIED, *timestamps)]
+    try:
+        return model.objects.filter(pk=pk).values('pk').annotate(
+            latest=Greatest(*latest) if timestamps else latest[0],
+            children=Count(count_relation) if count_relation else Value(0),
+        ).values_list('latest', 'children').first()
+    except (ValidationError, ValueError):
+        return None
+
+
+def state_etag(state: tuple, variant: str) -> str:
+    """
+    Build the weak ETag of a state.
+
+    Args:
+        state (tuple): State from resource_state.
+        variant (str): Part telling apart representations of the same state.
+
+    Returns:
+        str: Quoted weak ETag.
+    """
+    latest, children = state
+    stamp = round(latest.timestamp() * MICROSECONDS) if latest else 0
+    return f'W/"{variant}-{children}-{stamp}"'
+
+
+def conditional_page(model, pk_kwarg: str, user_state=None):
+    """
+    Make a detail page view answer conditional GETs from the state of its object.
+
+    The ETag includes the user, as the pages show per-user actions, and the state
+    of the user's rows from user_state(user, pk) if given. Pages with pending
+    messages are always rendered, so the messages are not lost on a 304.
+    Cache-Control makes browsers revalidate the page on every visit.
+
+    Args:
+        model: Model class of the object.
+        pk_kwarg (str): URL argument holding the primary key.
+        user_state: Callable reading the state of the rows of the user shown on the page.
+
+    Returns:
+        Decorator of the view.
+    """
+    page = (model, pk_kwarg, user_state)
+    return partial(_decorate, (
+        cache_control(private=True, no_cache=True),
+        condition(
+            etag_func=partial(_page_etag, page),
+            last_modified_func=partial(_page_last_modified, page),
+        ),
+    ))
+
+
+def async_conditional_page(model, pk_kwarg: str, user_state=None):
+    """
+    Make an async detail page view answer conditional GETs, like conditional_page.
+
+    The state is read in a thread through sync_to_async, as condition calls its
+    functions synchronously.
+
+    Args:
+        model: Model class of the object.
+        pk_kwarg (str): URL argument holding the primary key.
+        user_state: Callable reading the state of the rows of the user shown on the page.
+
+    Returns:
+        Decorator of the view.
+    """
+    return partial(_decorate, (
+        cache_control(private=True, no_cache=True),
+        partial(_async_condition, (model, pk_kwarg, user_state)),
+    ))
+
+
+class ConditionalRetrieveMixin:
+    """Conditional GET of the retrieve action of a model viewset."""
+
+    def retrieve(self, request, *args, **kwargs):
+        """
+        Return an object, or 304 Not Modified if the client has its current state.
+
+        Args:
+            request: Request object.
+            args: args.
+            kwargs: URL arguments.
+
+        Returns:
+            Response: Serialized object or 304 Not Modified.
+        """
+        if request.query_params.get(EXPAND_PARAM):
+            return super().retrieve(request, *args, **kwargs)
+        model = self.get_queryset().model
+        state = resource_state(model, kwargs[self.lookup_url_kwarg or self.lookup_field])
+        if state is None:
+            return super().retrieve(request, *args, **kwargs)
+        etag = state_etag(state, request.accepted_renderer.format)
+        last_modified = int(state[0].timestamp()) if state[0] else None
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is not None:
+            return response
+        response = super().retrieve(request, *args, **kwargs)
+        response['ETag'] = etag
+        if last_modified:
+            response['Last-Modified'] = http_date(last_modified)
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+
+def _decorate(decorators, view):
+    for decorator in reversed(decorators):
+        view = decorator(view)
+    return view
+
+
+def _async_condition(page: tuple, view):
+    return update_wrapper(partial(_serve_conditional, page, view), view)
+
+
+async def _serve_conditional(page: tuple, view, request, *args, **kwargs):
+    etag, last_modified = await sync_to_async(_page_validators)(page, request, **kwargs)
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is not None:
+        return response
+    response = await view(request, *args, **kwargs)
+    if request.method in SAFE_METHODS:
+        if last_modified and not response.has_header('Last-Modified'):
+            response['Last-Modified'] = http_date(last_modified)
+        if etag:
+            response.headers.setdefault('ETag', etag)
+    return response
+
+
+def _page_validators(page: tuple, request, **kwargs) -> tuple:
+    last_modified = _page_last_modified(page, request, **kwargs)
+    return (
+        _page_etag(page, request, **kwargs),
+        int(last_modified.timestamp()) if last_modified else None,
+    )
+
+
+def _page_state(page: tuple, request, **kwargs):
+    if get_messages(request):
+        return None
+    model, pk_kwarg, user_state = page
+    cache_key = (model, kwargs[pk_kwarg])
+    states = getattr(request, 'resource_states', None)
+    if states is None:
+        states = request.resource_states = {}
+    if cache_key not in states:
+        state = resource_state(model, kwargs[pk_kwarg])
+        if state and user_state:
+            state = _fold_state(state, user_state(request.user, kwargs[pk_kwarg]))
+        states[cache_key] = state
+    return states[cache_key]
+
+
+def _fold_state(state: tuple, user_state: tuple) -> tuple:
+    latest = max(filter(None, (state[0], user_state[0])), default=None)
+    return latest, f'{state[1]}.{user_state[1]}'
+
+
+def _page_etag(page: tuple, request, **kwargs):
+    state = _page_state(page, request, **kwargs)
+    user_id = request.user.pk
+    return state_etag(state, f'user{user_id}') if state else None
+
+
+def _page_last_modified(page: tuple, request, **kwargs):
+    state = _page_state(page, request, **kwargs)
+    return state[0] if state else None
@@ -0,0 +1,67 @@
+"""
+Benchmark of the ways of handling database connections.
+
+The connections suite requests the equipment list with a new connection per
+request, a persistent connection and a connection of companies_app.pool, to
+show what the connection handshake costs a request.
+"""
+from functools import partial
+
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.utils import load_backend
+from django.test import Client as TestClient
+from django.urls import reverse
+
+from .benchmark import BENCHMARK_REPEAT, benchmark_host, get_status, measure
+from .pool.base import DatabaseWrapper as PooledDatabaseWrapper
+
+CONNECTIONS_ROUTE = 'equipments'
+POSTGRES_ENGINE = 'django.db.backends.postgresql'
+# Name, CONN_MAX_AGE and engine of every benchmarked way of handling connections.
+CONNECTION_MODES = (
+    ('per-request', 0, POSTGRES_ENGINE),
+    ('persistent', None, POSTGRES_ENGINE),
+    ('pooled', 0, 'companies_app.pool'),
+)
+
+
+def run_connections(user, repeat=BENCHMARK_REPEAT) -> dict:
+    """
+    Benchmark a page with a new, a persistent and a pooled database connection.
+
+    Every request ends as a served one does, closing the connection if it is
+    obsolete, so the per-request mode pays the connection handshake each time.
+    The benchmarked connections are opened next to the current one and only see
+    committed data.
+
+    Args:
+        user: Logged in user.
+        repeat (int): Number of timed requests of every mode.
+
+    Returns:
+        dict: Measurements by mode, with the requested path and the pool counters.
+    """
+    client = TestClient(raise_request_exception=False, HTTP_HOST=benchmark_host())
+    client.force_login(user)
+    url = reverse(CONNECTIONS_ROUTE)
+    default = connections[DEFAULT_DB_ALIAS]
+    measurements = {}
+    for mode, max_age, engine in CONNECTION_MODES:
+        mode_connection = _connection(default.settings_dict, max_age, engine)
+        connections[DEFAULT_DB_ALIAS] = mode_connection
+        measurements[mode] = {
+            'path': url, **measure(partial(get_status, client, url, {}, mode_connection), repeat),
+        }
+        mode_connection.close()
+        connections[DEFAULT_DB_ALIAS] = default
+        if isinstance(mode_connection, PooledDatabaseWrapper):
+            measurements[mode]['pool'] = mode_connection.pool.stats()
+            mode_connection.pool.close()
+    return measurements
+
+
+def _connection(settings_dict: dict, max_age, engine: str):
+    options = {name: option for name, option in settings_dict['OPTIONS'].items() if name != 'pool'}
+    mode_settings = {**settings_dict, 'CONN_MAX_AGE': max_age, 'ENGINE': engine}
+    mode_settings['OPTIONS'] = options
+    return load_backend(engine).DatabaseWrapper(mode_settings, DEFAULT_DB_ALIAS)
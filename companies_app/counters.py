@@ -0,0 +1,188 @@
+"""
+Row counters of the homepage served from the cache.
+
+COUNTERS_MODE picks how a counter is computed:
+
+- exact: COUNT(*) cached for COUNTERS_TIMEOUT seconds and shifted by the
+  create and delete signals in between; the shifts only reach the cache of
+  the writing process unless the cache is shared, and a write racing the
+  first count is missed, so the count is redone when it expires;
+- refresh: COUNT(*) cached for COUNTERS_TIMEOUT seconds;
+- estimate: the planner statistics in pg_class.reltuples cached for
+  COUNTERS_TIMEOUT seconds, counting exactly while the table is small.
+
+aget_counters reads the counters from async code, counting the missing ones together.
+
+Writes bypassing the signals (bulk_create, QuerySet.update and delete, raw SQL)
+must call invalidate_counters.
+"""
+import asyncio
+from functools import partial
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection, transaction
+
+from .models import Company, Equipment, Review
+
+MODE_EXACT = 'exact'
+MODE_REFRESH = 'refresh'
+MODE_ESTIMATE = 'estimate'
+MODES = (MODE_EXACT, MODE_REFRESH, MODE_ESTIMATE)
+
+ESTIMATE_EXACT_BELOW = 1000
+ESTIMATE_SQL = 'SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass'  # noqa: WPS323
+
+COUNTED_MODELS = (
+    ('companies', Company),
+    ('equipments', Equipment),
+    ('reviews', Review),
+)
+
+
+def counters_mode() -> str:
+    """
+    Return the configured counters mode.
+
+    Returns:
+        str: One of MODES.
+
+    Raises:
+        ImproperlyConfigured: If COUNTERS_MODE is not one of MODES.
+    """
+    mode = getattr(settings, 'COUNTERS_MODE', MODE_EXACT)
+    if mode not in MODES:
+        raise ImproperlyConfigured(f'COUNTERS_MODE must be one of: {MODES}')
+    return mode
+
+
+def counter_key(model, mode: str) -> str:
+    """
+    Return the cache key of a model counter.
+
+    Args:
+        model: Counted model.
+        mode (str): Counters mode.
+
+    Returns:
+        str: Cache key.
+    """
+    label = model._meta.label_lower  # noqa: WPS437
+    return f'counters:{mode}:{label}'
+
+
+def estimate_count(model) -> int:
+    """
+    Count the rows of a model from the planner statistics.
+
+    Tables too small for the estimate to matter, or never analyzed, are counted exactly.
+
+    Args:
+        model: Counted model.
+
+    Returns:
+        int: Estimated number of rows.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(ESTIMATE_SQL, [model._meta.db_table])  # noqa: WPS437
+        row = cursor.fetchone()
+    if row is None or row[0] < ESTIMATE_EXACT_BELOW:
+        return model.objects.count()
+    return row[0]
+
+
+def get_counters() -> dict:
+    """
+    Return the number of companies, equipments and reviews.
+
+    Returns:
+        dict: Counts keyed by the COUNTED_MODELS names.
+    """
+    mode = counters_mode()
+    keys = [counter_key(model, mode) for _, model in COUNTED_MODELS]
+    cached = cache.get_many(keys)
+    missing = {
+        key: _count(model, mode) for key, model in _missing_models(keys, cached).items()
+    }
+    if missing:
+        cache.set_many(missing, settings.COUNTERS_TIMEOUT)
+        cached.update(missing)
+    return _by_name(keys, cached)
+
+
+async def aget_counters() -> dict:
+    """
+    Return the number of companies, equipments and reviews from async code.
+
+    The missing counters are counted concurrently with asyncio.gather.
+
+    Returns:
+        dict: Counts keyed by the COUNTED_MODELS names.
+    """
+    mode = counters_mode()
+    keys = [counter_key(model, mode) for _, model in COUNTED_MODELS]
+    cached = await cache.aget_many(keys)
+    missing = _missing_models(keys, cached)
+    if missing:
+        counts = [_acount(model, mode) for model in missing.values()]
+        counted = dict(zip(missing, await asyncio.gather(*counts)))
+        await cache.aset_many(counted, settings.COUNTERS_TIMEOUT)
+        cached.update(counted)
+    return _by_name(keys, cached)
+
+
+def shift_counter(model, delta: int) -> None:
+    """
+    Shift the exact counter of a model once the current transaction commits.
+
+    A counter that is not cached yet is left alone, the next read counts it.
+
+    Args:
+        model: Counted model.
+        delta (int): Number of created rows, negative for deleted ones.
+    """
+    if counters_mode() != MODE_EXACT:
+        return
+    transaction.on_commit(partial(_shift_cached, counter_key(model, MODE_EXACT), delta))
+
+
+def invalidate_counters(*models) -> None:
+    """
+    Drop the cached counters of models in every mode once the current transaction commits.
+
+    Args:
+        models: Models whose rows changed, every counted model if omitted.
+    """
+    keys = [
+        counter_key(model, mode)
+        for model in models or [model for _, model in COUNTED_MODELS]
+        for mode in MODES
+    ]
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def _by_name(keys: list, cached: dict) -> dict:
+    return {name: cached[key] for (name, _), key in zip(COUNTED_MODELS, keys)}
+
+
+def _missing_models(keys: list, cached: dict) -> dict:
+    return {key: model for (_, model), key in zip(COUNTED_MODELS, keys) if key not in cached}
+
+
+def _count(model, mode: str) -> int:
+    return estimate_count(model) if mode == MODE_ESTIMATE else model.objects.count()
+
+
+async def _acount(model, mode: str) -> int:
+    if mode == MODE_ESTIMATE:
+        return await sync_to_async(estimate_count)(model)
+    return await model.objects.acount()
+
+
+def _shift_cached(key: str, delta: int) -> None:
+    try:
+        cache.incr(key, delta)
+    except ValueError:
+        return
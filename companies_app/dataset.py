@@ -0,0 +1,234 @@
+"""
+Synthetic dataset generator for benchmarks and manual testing at scale.
+
+Every client owns companies, each with an address drawn from a shared pool,
+and equipment linked to some of its companies. Reviews are spread over the
+equipment with a Zipf-like skew, so a few items collect most of them, and
+ratings lean positive like on real review sites. The same seed always
+generates the same dataset.
+"""
+import random
+from itertools import accumulate, product
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import connection, transaction
+
+from .models import Address, Category, Client, Company, CompanyEquipment, Equipment, Review
+from .rollups import refresh_rollups
+from .signals import rebuild_denormalized
+
+SEED_BATCH_SIZE = 5000
+REVIEWS = 'reviews'
+DATASET_SIZES = (
+    ('clients', 100, 'Number of clients, each with a user'),
+    ('categories', 20, 'Number of equipment categories'),
+    ('companies_per_client', 5, 'Number of companies of every client'),
+    ('equipment_per_client', 10, 'Number of equipment of every client'),
+    ('links_per_company', 3, 'Number of equipment linked to every company'),
+    (REVIEWS, 20000, 'Total number of reviews'),
+)
+DEFAULT_SKEW = 1.1
+RATINGS = range(1, 6)
+RATING_WEIGHTS = (5, 5, 10, 30, 50)
+MAX_SIZE = 100
+PHONE_FIRST = 9000000000
+PHONE_LAST = 9999999999
+
+EQUIPMENT_NAMES = (
+    'Hammer', 'Drill', 'Saw', 'Grinder', 'Crane', 'Excavator',
+    'Mixer', 'Ladder', 'Welder', 'Compressor', 'Generator', 'Pump',
+)
+EQUIPMENT_KINDS = (
+    'Compact', 'Heavy', 'Cordless', 'Industrial', 'Electric', 'Hydraulic', 'Portable', 'Rotary',
+)
+COMPANY_WORDS = ('Build', 'Stroy', 'Tech', 'Mont', 'Service', 'Group', 'Invest', 'Prom')
+CITIES = (
+    ('Kazan', 'Tatarstan'),
+    ('Innopolis', 'Tatarstan'),
+    ('Moscow', 'Moscow'),
+    ('Samara', 'Samara'),
+    ('Perm', 'Perm'),
+    ('Ufa', 'Bashkortostan'),
+)
+STREETS = ('Lenina', 'Pushkina', 'Gagarina', 'Mira', 'Sovetskaya', 'Sadovaya', 'Lesnaya')
+REVIEW_TEXTS = (
+    'Broke down after a week, would not rent again.',
+    'Worked, but the condition was poor.',
+    'Does the job, nothing special.',
+    'Reliable and well maintained, delivered on time.',
+    'Excellent equipment, the crew was very happy with it.',
+)
+
+
+def random_names(rng, first_words, second_words, count: int) -> list:
+    """
+    Combine random pairs of words.
+
+    Args:
+        rng (random.Random): Random generator.
+        first_words (tuple): Words of the first position.
+        second_words (tuple): Words of the second position.
+        count (int): Number of names.
+
+    Returns:
+        list: Generated names.
+    """
+    pairs = zip(rng.choices(first_words, k=count), rng.choices(second_words, k=count))
+    return [' '.join(pair) for pair in pairs]
+
+
+def address_pool(house_numbers: int) -> list:
+    """
+    Build every address of the CITIES and STREETS up to a house number.
+
+    Args:
+        house_numbers (int): Number of houses on every street.
+
+    Returns:
+        list: Unsaved addresses.
+    """
+    return [
+        Address(street_name=street, house_number=number, city=city, state=state)
+        for (city, state), street, number in product(CITIES, STREETS, range(1, house_numbers + 1))
+    ]
+
+
+def zipf_cum_weights(count: int, skew: float) -> list:
+    """
+    Return cumulative weights making the item of rank r about r ** skew times rarer than the first.
+
+    Args:
+        count (int): Number of items.
+        skew (float): Zipf exponent.
+
+    Returns:
+        list: Cumulative weights for random.choices.
+    """
+    return list(accumulate(rank ** -skew for rank in range(1, count + 1)))
+
+
+class DatasetGenerator:
+    """Generate a reproducible dataset of the DATASET_SIZES shape."""
+
+    def __init__(self, sizes=None, skew=DEFAULT_SKEW, seed=0, prefix='seed'):
+        """
+        Initialize the generator.
+
+        Args:
+            sizes (dict): Overrides of the DATASET_SIZES defaults.
+            skew (float): Zipf exponent of the reviews per equipment, 0 for a uniform spread.
+            seed (int): Seed of the random generator.
+            prefix (str): Prefix of the generated usernames.
+        """
+        self.sizes = {name: default for name, default, _ in DATASET_SIZES}
+        self.sizes.update(sizes or {})
+        self.skew = skew
+        self.prefix = prefix
+        self._random = random.Random(seed)
+
+    def generate(self, password: str) -> dict:
+        """
+        Insert the dataset and refresh the data derived from it.
+
+        Args:
+            password (str): Password of every generated user.
+
+        Returns:
+            dict: Number of created rows by model name.
+        """
+        with transaction.atomic():
+            clients = self._clients(password)
+            companies = self._companies(clients)
+            equipment = self._equipment(clients)
+            created = {
+                'clients': len(clients),
+                'companies': len(companies),
+                'equipment': len(equipment),
+                'links': self._links(companies, equipment),
+                REVIEWS: self._reviews(clients, equipment),
+            }
+            rebuild_denormalized()
+            refresh_rollups()
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        return created
+
+    def _clients(self, password: str) -> list:
+        hashed = make_password(password)
+        users = [
+            User(username=f'{self.prefix}{index}', password=hashed)
+            for index in range(self.sizes['clients'])
+        ]
+        User.objects.bulk_create(users, batch_size=SEED_BATCH_SIZE)
+        clients = [Client(user=user) for user in users]
+        return Client.objects.bulk_create(clients, batch_size=SEED_BATCH_SIZE)
+
+    def _companies(self, clients) -> list:
+        count = len(clients) * self.sizes['companies_per_client']
+        pool = address_pool(max(len(clients), 1))
+        addresses = self._random.sample(pool, min(count, len(pool)))
+        Address.objects.bulk_create(addresses, batch_size=SEED_BATCH_SIZE)
+        titles = random_names(self._random, COMPANY_WORDS, COMPANY_WORDS, count)
+        companies = [
+            Company(
+                title=title,
+                phone=str(self._random.randrange(PHONE_FIRST, PHONE_LAST)),
+                address=self._random.choice(addresses) if addresses else None,
+                client=clients[index % len(clients)],
+            )
+            for index, title in enumerate(titles)
+        ]
+        return Company.objects.bulk_create(companies, batch_size=SEED_BATCH_SIZE)
+
+    def _equipment(self, clients) -> list:
+        kinds = random_names(self._random, EQUIPMENT_KINDS, ('tools',), self.sizes['categories'])
+        categories = Category.objects.bulk_create([Category(title=kind) for kind in kinds])
+        per_client = self.sizes['equipment_per_client']
+        titles = random_names(
+            self._random, EQUIPMENT_KINDS, EQUIPMENT_NAMES, len(clients) * per_client,
+        )
+        equipment = [
+            Equipment(
+                title=title,
+                size=self._random.randint(1, MAX_SIZE),
+                category=self._random.choice(categories) if categories else None,
+                client=clients[index // per_client],
+            )
+            for index, title in enumerate(titles)
+        ]
+        return Equipment.objects.bulk_create(equipment, batch_size=SEED_BATCH_SIZE)
+
+    def _links(self, companies, equipment) -> int:
+        owned = {}
+        for owned_item in equipment:
+            owned.setdefault(owned_item.client_id, []).append(owned_item)
+        links = []
+        for company in companies:
+            candidates = owned.get(company.client_id, [])
+            linked = self._random.sample(
+                candidates, min(self.sizes['links_per_company'], len(candidates)),
+            )
+            links.extend(CompanyEquipment(company=company, equipment=link) for link in linked)
+        CompanyEquipment.objects.bulk_create(links, batch_size=SEED_BATCH_SIZE)
+        return len(links)
+
+    def _reviews(self, clients, equipment) -> int:
+        if not equipment:
+            return 0
+        ranked = self._random.sample(equipment, len(equipment))
+        popularity = zipf_cum_weights(len(ranked), self.skew)
+        for start in range(0, self.sizes[REVIEWS], SEED_BATCH_SIZE):
+            batch = min(self.sizes[REVIEWS] - start, SEED_BATCH_SIZE)
+            reviewed = self._random.choices(ranked, cum_weights=popularity, k=batch)
+            ratings = self._random.choices(RATINGS, weights=RATING_WEIGHTS, k=batch)
+            Review.objects.bulk_create([
+                Review(
+                    text=REVIEW_TEXTS[rating - 1],
+                    rating=rating,
+                    equipment=target,
+                    client=self._random.choice(clients),
+                )
+                for target, rating in zip(reviewed, ratings)
+            ])
+        return self.sizes[REVIEWS]
@@ -0,0 +1,53 @@
+"""Views of the pages ranking equipment across clients: search and leaderboards."""
+
+from django.contrib.auth.decorators import login_required
+from django.http import Http404
+from django.shortcuts import get_object_or_404, render
+
+from .leaderboards import parse_category, top_rated, trending
+from .models import Category
+from .search import search
+
+
+@login_required
+def leaderboards_view(request):
+    """
+    View function for rendering the top rated and trending equipment, overall or in a category.
+
+    Args:
+        request: Request object.
+
+    Returns:
+        HttpResponse: Rendered HTML template.
+
+    Raises:
+        Http404: If the ?category= category does not exist.
+    """
+    try:
+        category_id = parse_category(request.GET.get('category'))
+    except ValueError:
+        raise Http404('No such category.')
+    context = {
+        'categories': Category.objects.all(),
+        'category': get_object_or_404(Category, id=category_id) if category_id else None,
+        'top_rated': top_rated(category_id),
+        'trending': trending(category_id),
+    }
+    return render(request, 'pages/leaderboards.html', context)
+
+
+@login_required
+def search_view(request):
+    """
+    View function for rendering ranked search results.
+
+    Args:
+        request: Request object.
+
+    Returns:
+        HttpResponse: Rendered HTML template.
+    """
+    query = request.GET.get('q', '')
+    context = {'query': query}
+    context.update(search(query))
+    return render(request, 'pages/search.html', context)
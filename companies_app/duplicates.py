@@ -0,0 +1,296 @@
+"""
+Runtime detector of N+1 queries.
+
+DuplicateQueriesMiddleware groups the SQL run during a request by its shape,
+the statement with its parameters left out, and reports every shape run at
+least DUPLICATE_QUERIES_THRESHOLD times: usually a relation read in a loop
+of a template or a view. A report names the code and the template line that
+ran the repeated query and the select_related or prefetch_related call that
+would load the relation with the main query instead.
+
+Server errors are left out: Django reports them, and its error page reads
+every queryset of the failed view.
+
+DUPLICATE_QUERIES turns the detector on: 'log' writes the report as a
+warning, 'raise' fails the request with DuplicateQueriesError, as the test
+suite does. It is off by default.
+"""
+import logging
+import re
+import traceback
+from http import HTTPStatus
+from pathlib import Path
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.apps import apps
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.template.base import Node
+
+from .wrappers import wrap_queries
+
+MODE_OFF = 'off'
+MODE_LOG = 'log'
+MODE_RAISE = 'raise'
+MODES = (MODE_OFF, MODE_LOG, MODE_RAISE)
+
+PLACEHOLDERS = re.compile('%s(?:, %s)*')  # noqa: WPS323
+HELPER_MODULES = ('duplicates.py', 'instrumentation.py', 'wrappers.py')
+LOOKUP = re.compile(r'WHERE \(*((?:"[^"]+"\.)?"[^"]+")\."([^"]+)" (?:= |IN \()%s')  # noqa: WPS323
+
+logger = logging.getLogger(__name__)
+
+
+class DuplicateQueriesError(Exception):
+    """Raised when a request repeats a query shape in DUPLICATE_QUERIES='raise' mode."""
+
+
+class QueryShapes:
+    """Execute wrapper counting the queries of every shape."""
+
+    def __init__(self):
+        """Initialize empty counters."""
+        self.counts = {}
+        self.origins = {}
+
+    def __call__(self, execute, *query):
+        """
+        Count a query and record where its shape first ran.
+
+        Args:
+            execute: Next wrapper or the query execution.
+            query: SQL statement, parameters, executemany flag and context of the query.
+
+        Returns:
+            Result of the query execution.
+        """
+        shape = PLACEHOLDERS.sub('%s', query[0])  # noqa: WPS323
+        self.counts[shape] = self.counts.get(shape, 0) + 1
+        if shape not in self.origins:
+            self.origins[shape] = query_origin()
+        return execute(*query)
+
+    def repeated(self, threshold: int) -> list:
+        """
+        Describe the shapes run at least threshold times.
+
+        Args:
+            threshold (int): Minimal number of runs of a reported shape.
+
+        Returns:
+            list: Count, SQL, view line, template line and suggestion of every repeated shape.
+        """
+        return [
+            {
+                'count': count,
+                'sql': shape,
+                'view': self.origins[shape][0],
+                'template': self.origins[shape][1],
+                'suggestion': suggest_prefetch(shape),
+            }
+            for shape, count in self.counts.items()
+            if count >= threshold
+        ]
+
+
+class DuplicateQueriesMiddleware:
+    """Report the N+1 queries of a request, see DUPLICATE_QUERIES."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        """
+        Initialize the middleware, async if the next middleware is.
+
+        Args:
+            get_response: Next middleware or the view.
+        """
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        """
+        Process a request, counting its queries by shape if the detector is on.
+
+        Args:
+            request: Request object.
+
+        Returns:
+            HttpResponse: Response of the view.
+        """
+        if iscoroutinefunction(self):
+            return self._acall(request)
+        mode = duplicate_queries_mode()
+        if mode == MODE_OFF:
+            return self.get_response(request)
+        shapes = QueryShapes()
+        with wrap_queries(shapes):
+            response = self.get_response(request)
+        return self._report(request, response, shapes, mode)
+
+    async def _acall(self, request):
+        mode = duplicate_queries_mode()
+        if mode == MODE_OFF:
+            return await self.get_response(request)
+        shapes = QueryShapes()
+        with wrap_queries(shapes):
+            response = await self.get_response(request)
+        return self._report(request, response, shapes, mode)
+
+    def _report(self, request, response, shapes: QueryShapes, mode: str):
+        """
+        Report the repeated queries of a request.
+
+        Args:
+            request: Request object.
+            response: Response of the view.
+            shapes (QueryShapes): Queries of the request by shape.
+            mode (str): Detector mode.
+
+        Returns:
+            HttpResponse: Response of the view.
+
+        Raises:
+            DuplicateQueriesError: If the request repeated a query in 'raise' mode.
+        """
+        repeated = shapes.repeated(settings.DUPLICATE_QUERIES_THRESHOLD)
+        if repeated and response.status_code < HTTPStatus.INTERNAL_SERVER_ERROR:
+            report = format_report(f'{request.method} {request.path}', repeated)
+            if mode == MODE_RAISE:
+                raise DuplicateQueriesError(report)
+            logger.warning(report)
+        return response
+
+
+def duplicate_queries_mode() -> str:
+    """
+    Return the configured detector mode.
+
+    Returns:
+        str: One of MODES.
+
+    Raises:
+        ImproperlyConfigured: If DUPLICATE_QUERIES is not one of MODES.
+    """
+    mode = settings.DUPLICATE_QUERIES
+    if mode not in MODES:
+        raise ImproperlyConfigured(f'DUPLICATE_QUERIES must be one of {MODES}, got {mode!r}')
+    return mode
+
+
+def query_origin() -> tuple:
+    """
+    Find the project code and the template line running the current query.
+
+    Returns:
+        tuple: 'path:line in function' of the innermost project frame and
+            'template:line {% tag %}' of the innermost rendered node, None when not found.
+    """
+    base_dir = Path(settings.BASE_DIR)
+    view = template = None
+    for frame, lineno in traceback.walk_stack(None):
+        template = template or _template_line(frame)
+        view = view or _code_line(frame, lineno, base_dir)
+    return view, template
+
+
+def suggest_prefetch(shape: str) -> str:
+    """
+    Suggest the eager loading collapsing the repeated runs of a query shape.
+
+    A lookup by primary key is a forward relation, joined by select_related;
+    a lookup by foreign key is a reverse or many-to-many relation, loaded by
+    prefetch_related.
+
+    Args:
+        shape (str): SQL statement with placeholders.
+
+    Returns:
+        str: Suggested calls, empty if the shape is not a relation lookup.
+    """
+    lookup = LOOKUP.search(shape)
+    if lookup is None:
+        return ''
+    table, column = lookup.groups()
+    models = {
+        connection.ops.quote_name(model._meta.db_table): model  # noqa: WPS437
+        for model in apps.get_models()
+    }
+    model = models.get(table)
+    if model is None:
+        return ''
+    if column == model._meta.pk.column:  # noqa: WPS437
+        calls = [
+            _call(field.model, 'select_related', field.name)
+            for source in models.values()
+            for field in source._meta.concrete_fields  # noqa: WPS437
+            if (field.many_to_one or field.one_to_one) and field.related_model is model
+        ]
+    else:
+        calls = [
+            _call(field.related_model, 'prefetch_related', _accessor(field))
+            for field in model._meta.concrete_fields  # noqa: WPS437
+            if field.many_to_one and field.column == column
+        ]
+    return ' or '.join(calls)
+
+
+def format_report(request_line: str, repeated: list) -> str:
+    """
+    Format the repeated queries of a request.
+
+    Args:
+        request_line (str): Method and path of the request.
+        repeated (list): Entries from QueryShapes.repeated.
+
+    Returns:
+        str: Multiline report.
+    """
+    count = len(repeated)
+    lines = [f'{request_line} repeated {count} queries']
+    for entry in repeated:
+        lines.extend(_format_entry(**entry))
+    return '\n'.join(lines)
+
+
+def _format_entry(count, sql, view, template, suggestion) -> tuple:
+    remedy = suggestion or 'loading the rows with one query'
+    return (
+        f'{count} x {sql}',
+        f'    from {view}, template {template}',
+        f'    try {remedy}',
+    )
+
+
+def _call(model, method: str, relation: str) -> str:
+    return f"{model.__name__}.objects.{method}('{relation}')"
+
+
+def _accessor(field) -> str:
+    for relation in field.related_model._meta.many_to_many:  # noqa: WPS437
+        if relation.remote_field.through is field.model:
+            return relation.name
+    return field.remote_field.get_accessor_name()
+
+
+def _template_line(frame):
+    node = frame.f_locals.get('self')
+    # type() rather than isinstance(), which would load a lazy object and run its queries.
+    if not issubclass(type(node), Node) or node.origin is None:
+        return None
+    template_name, token = node.origin.template_name, node.token
+    return f'{template_name}:{token.lineno} {token.contents}'
+
+
+def _code_line(frame, lineno: int, base_dir: Path):
+    code = frame.f_code
+    filename = Path(code.co_filename)
+    if not filename.is_relative_to(base_dir) or 'site-packages' in filename.parts:
+        return None
+    if filename.parent == Path(__file__).parent and filename.name in HELPER_MODULES:
+        return None
+    relative = filename.relative_to(base_dir)
+    return f'{relative}:{lineno} in {code.co_name}'
@@ -0,0 +1,138 @@
+"""
+Streaming export of the application tables as NDJSON or CSV.
+
+Rows are read through a server-side cursor in chunks of EXPORT_CHUNK_SIZE and
+turned into text one chunk at a time, so memory use does not depend on the
+size of the exported table. Rows come in storage order. ExportView streams
+them from the API.
+"""
+import csv
+import json
+from datetime import datetime
+from functools import partial
+from io import StringIO
+from itertools import islice
+from uuid import UUID
+
+from django.http import StreamingHttpResponse
+from rest_framework.exceptions import NotFound
+from rest_framework.views import APIView
+
+from .models import Company, CompanyEquipment, Equipment, Review
+from .permissions import APIPermission
+
+EXPORT_CHUNK_SIZE = 2000
+FORMAT_NDJSON = 'ndjson'
+FORMAT_CSV = 'csv'
+FORMATS = (FORMAT_NDJSON, FORMAT_CSV)
+CONTENT_TYPES = (
+    (FORMAT_NDJSON, 'application/x-ndjson'),
+    (FORMAT_CSV, 'text/csv'),
+)
+
+ID = 'id'
+CREATED = 'created'
+MODIFIED = 'modified'
+
+EXPORTS = (
+    ('reviews', Review, (
+        ID, 'text', 'rating', 'client_id', 'equipment_id', CREATED, MODIFIED,
+    )),
+    ('equipment', Equipment, (
+        ID, 'title', 'size', 'category_id', 'category__title', 'client_id',
+        'rating_count', 'rating_mean', CREATED, MODIFIED,
+    )),
+    ('companies', Company, (
+        ID, 'title', 'phone', 'client_id', 'address_id', 'address__street_name',
+        'address__house_number', 'address__city', 'address__state', CREATED, MODIFIED,
+    )),
+    ('company-equipment', CompanyEquipment, (
+        ID, 'company_id', 'equipment_id', CREATED,
+    )),
+)
+EXPORT_NAMES = tuple(name for name, _, _ in EXPORTS)
+
+
+def export_chunks(name: str, export_format: str, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Stream a table as text chunks.
+
+    Args:
+        name (str): One of EXPORT_NAMES.
+        export_format (str): One of FORMATS.
+        chunk_size (int): Number of rows fetched and encoded at a time.
+
+    Yields:
+        str: Encoded rows of one chunk, preceded by the header line in CSV.
+    """
+    model, columns = {export[0]: export[1:] for export in EXPORTS}[name]
+    headers = [column.replace('__', '_') for column in columns]
+    rows = model.objects.order_by().values_list(*columns).iterator(chunk_size=chunk_size)
+    if export_format == FORMAT_CSV:
+        yield _encode_csv([headers])
+    encode = _encode_csv if export_format == FORMAT_CSV else partial(_encode_ndjson, headers)
+    chunk = list(islice(rows, chunk_size))
+    while chunk:
+        yield encode([[_plain(cell) for cell in row] for row in chunk])
+        chunk = list(islice(rows, chunk_size))
+
+
+def content_type(export_format: str) -> str:
+    """
+    Return the content type of an export format.
+
+    Args:
+        export_format (str): One of FORMATS.
+
+    Returns:
+        str: MIME type.
+    """
+    return dict(CONTENT_TYPES)[export_format]
+
+
+class ExportView(APIView):
+    """Streaming export of a whole table as NDJSON or CSV."""
+
+    permission_classes = [APIPermission]
+
+    def get(self, request, name, export_format):
+        """
+        Stream the rows of a table.
+
+        Args:
+            request: Request object.
+            name (str): One of the export names.
+            export_format (str): ndjson or csv.
+
+        Returns:
+            StreamingHttpResponse: Rows encoded chunk by chunk.
+
+        Raises:
+            NotFound: If the export or the format does not exist.
+        """
+        if name not in EXPORT_NAMES or export_format not in FORMATS:
+            raise NotFound()
+        response = StreamingHttpResponse(
+            export_chunks(name, export_format), content_type=content_type(export_format),
+        )
+        response['Content-Disposition'] = f'attachment; filename="{name}.{export_format}"'
+        return response
+
+
+def _encode_csv(rows) -> str:
+    buffer = StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue()
+
+
+def _encode_ndjson(headers, rows) -> str:
+    lines = (json.dumps(dict(zip(headers, row))) for row in rows)
+    return ''.join(f'{line}\n' for line in lines)
+
+
+def _plain(cell):
+    if isinstance(cell, datetime):
+        return cell.isoformat()
+    if isinstance(cell, UUID):
+        return str(cell)
+    return cell
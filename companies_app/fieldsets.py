@@ -0,0 +1,178 @@
+"""
+Sparse fieldsets and relation expansion of the API.
+
+The list and retrieve actions of the model viewsets take two query parameters:
+
+- fields: comma-separated fields to return, every field by default;
+- expand: comma-separated relations to return as nested objects instead of
+  primary keys, see companies_app.serializers.EXPANSIONS.
+
+The queryset follows the request: .only() loads the selected columns, only the
+selected many-to-many relations are prefetched, and every expanded relation is
+loaded with the relations its serializer reads, through select_related for
+foreign keys and a Prefetch for many-to-many relations. A page costs the same
+number of queries whatever its length.
+"""
+from django.db.models import Prefetch
+from rest_framework.exceptions import ValidationError
+
+from .serializers import FIELDSET, expandable_relations, expansion
+
+FIELDS_PARAM = 'fields'
+EXPAND_PARAM = 'expand'
+READ_ACTIONS = ('list', 'retrieve')
+
+
+class Fieldset:
+    """Fields and expanded relations requested from an API endpoint."""
+
+    def __init__(self, fields=None, expand=()):
+        """
+        Initialize the fieldset.
+
+        Args:
+            fields (frozenset): Names of the returned fields, None for every field.
+            expand (tuple): Names of the expanded relations.
+        """
+        self.fields = fields
+        self.expand = expand
+
+    def selects(self, name: str) -> bool:
+        """
+        Check whether a field is returned.
+
+        Args:
+            name (str): Field name.
+
+        Returns:
+            bool: True if the field is requested or expanded.
+        """
+        return self.fields is None or name in self.fields or name in self.expand
+
+
+def parse_fieldset(query_params, serializer_class):
+    """
+    Read the fieldset of a request.
+
+    Args:
+        query_params: Query parameters of the request.
+        serializer_class: Serializer class of the endpoint.
+
+    Returns:
+        Fieldset | None: Requested fieldset, None if the request asks for no fieldset.
+
+    Raises:
+        ValidationError: If a field does not exist or a relation cannot be expanded.
+    """
+    fields = _names(query_params, FIELDS_PARAM)
+    expand = _names(query_params, EXPAND_PARAM)
+    if fields is None and expand is None:
+        return None
+    available = serializer_class().fields.keys()
+    expandable = available & set(expandable_relations(serializer_class.Meta.model))
+    errors = {
+        FIELDS_PARAM: _unknown(fields or (), available),
+        EXPAND_PARAM: _unknown(expand or (), expandable),
+    }
+    errors = {parameter: [message] for parameter, message in errors.items() if message}
+    if errors:
+        raise ValidationError(errors)
+    return Fieldset(None if fields is None else frozenset(fields), tuple(expand or ()))
+
+
+def narrow_queryset(queryset, fieldset: Fieldset):
+    """
+    Load the columns and relations of a fieldset.
+
+    Args:
+        queryset (QuerySet): Queryset of the endpoint.
+        fieldset (Fieldset): Requested fieldset.
+
+    Returns:
+        QuerySet: Queryset loading the selected columns and relations only.
+    """
+    model = queryset.model
+    if fieldset.fields is not None:
+        queryset = queryset.only(*(
+            field.name
+            for field in model._meta.concrete_fields  # noqa: WPS437
+            if fieldset.selects(field.name)
+        ))
+    many_to_many = [
+        field.name
+        for field in model._meta.many_to_many  # noqa: WPS437
+        if fieldset.selects(field.name) and field.name not in fieldset.expand
+    ]
+    queryset = queryset.prefetch_related(None).prefetch_related(*many_to_many)
+    for name in fieldset.expand:
+        queryset = _expand(queryset, model._meta.get_field(name))  # noqa: WPS437
+    return queryset
+
+
+class SparseFieldsetMixin:
+    """Serve the fieldset of the ?fields= and ?expand= parameters from the read actions."""
+
+    def initial(self, request, *args, **kwargs):
+        """
+        Read the fieldset of a list or retrieve request.
+
+        Args:
+            request: Request object.
+            args: args.
+            kwargs: URL arguments.
+        """
+        super().initial(request, *args, **kwargs)
+        self.fieldset = None
+        if self.action in READ_ACTIONS:
+            self.fieldset = parse_fieldset(request.query_params, self.get_serializer_class())
+
+    def get_queryset(self):
+        """
+        Return the queryset of the endpoint, narrowed to the fieldset.
+
+        Returns:
+            QuerySet: Queryset of the endpoint.
+        """
+        queryset = super().get_queryset()
+        fieldset = getattr(self, 'fieldset', None)
+        return queryset if fieldset is None else narrow_queryset(queryset, fieldset)
+
+    def get_serializer_context(self) -> dict:
+        """
+        Pass the fieldset to the serializer.
+
+        Returns:
+            dict: Serializer context.
+        """
+        return {**super().get_serializer_context(), FIELDSET: getattr(self, 'fieldset', None)}
+
+
+def _names(query_params, parameter: str):
+    listed = query_params.get(parameter)
+    if listed is None:
+        return None
+    return [name.strip() for name in listed.split(',') if name.strip()]
+
+
+def _unknown(names, known) -> str:
+    unknown = sorted(set(names) - set(known))
+    if not unknown:
+        return ''
+    listed = ', '.join(unknown)
+    return f'Unknown or not allowed: {listed}.'
+
+
+def _expand(queryset, field):
+    _, lookups = expansion(field.related_model)
+    nested = [
+        (lookup, field.related_model._meta.get_field(lookup).many_to_many)  # noqa: WPS437
+        for lookup in lookups
+    ]
+    select = [lookup for lookup, many in nested if not many]
+    prefetch = [lookup for lookup, many in nested if many]
+    if field.many_to_many:
+        related = field.related_model.objects.select_related(*select).prefetch_related(*prefetch)
+        return queryset.prefetch_related(Prefetch(field.name, queryset=related))
+    return queryset.select_related(
+        field.name, *(f'{field.name}__{lookup}' for lookup in select),
+    ).prefetch_related(*(f'{field.name}__{lookup}' for lookup in prefetch))
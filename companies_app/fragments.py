@@ -0,0 +1,129 @@
+"""
+Versioned cache of the rarely changing template fragments.
+
+A cached fragment is keyed by the object it shows and the version of that
+object, read with the fragment_version template tag before the {% cache %}
+block. Writes replace the version of the fragments they change, from the
+signal receivers after the transaction commits, so the old fragments are never
+read again and expire on their own after FRAGMENT_CACHE_TIMEOUT seconds.
+Versions are timestamps rather than counters, so a version evicted from the
+cache comes back as a new one instead of reviving stale fragments.
+
+The fragments are:
+
+- equipment-reviews: the review list of an equipment;
+- company-equipment: the details and the equipment list of a company;
+- equipment-list: every page of the equipment list.
+
+Every version also includes a generation, replaced by invalidate_fragments
+after writes bypassing the signals, such as imports.
+"""
+import time
+from functools import partial
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import Address, Category, Company, CompanyEquipment, Equipment, Review
+
+EQUIPMENT_REVIEWS = 'equipment-reviews'
+COMPANY_EQUIPMENT = 'company-equipment'
+EQUIPMENT_LIST = 'equipment-list'
+GENERATION_KEY = 'fragments:generation'
+
+# Model, fragment showing its objects, attribute holding the primary key of the fragment.
+DIRECT_FRAGMENTS = (
+    (Review, EQUIPMENT_REVIEWS, 'equipment_id'),
+    (CompanyEquipment, COMPANY_EQUIPMENT, 'company_id'),
+    (Company, COMPANY_EQUIPMENT, 'pk'),
+    (Category, EQUIPMENT_LIST, None),
+)
+
+
+def fragment_version(name: str, pk=None) -> str:
+    """
+    Return the current version of a fragment, creating it if missing.
+
+    Args:
+        name (str): Fragment name.
+        pk: Primary key of the object shown by the fragment, None for list fragments.
+
+    Returns:
+        str: Version to vary the cached fragment on.
+    """
+    keys = (GENERATION_KEY, _version_key(name, pk))
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, time.time_ns(), timeout=None)
+            versions[key] = cache.get(key)
+    return '-'.join(str(versions[version_key]) for version_key in keys)
+
+
+def bump_fragments(fragments):
+    """
+    Replace the versions of fragments once the current transaction commits.
+
+    Args:
+        fragments: Pairs of fragment name and primary key.
+    """
+    keys = {_version_key(name, pk) for name, pk in fragments}
+    if keys:
+        transaction.on_commit(partial(_replace_versions, keys))
+
+
+def invalidate_fragments():
+    """Replace the generation of every fragment once the current transaction commits."""
+    transaction.on_commit(partial(_replace_versions, {GENERATION_KEY}))
+
+
+def touched_fragments(model, instances) -> set:
+    """
+    List the fragments showing objects of a model.
+
+    Args:
+        model: Model class of the objects.
+        instances: Written or deleted objects.
+
+    Returns:
+        set: Pairs of fragment name and primary key.
+    """
+    for fragment_model, name, attname in DIRECT_FRAGMENTS:
+        if issubclass(model, fragment_model):
+            return {
+                (name, getattr(instance, attname) if attname else None) for instance in instances
+            }
+    pks = [instance.pk for instance in instances]
+    if issubclass(model, Equipment):
+        links = CompanyEquipment.objects.filter(equipment__in=pks)
+        return {(EQUIPMENT_LIST, None), *_company_fragments(links, 'company_id')}
+    if issubclass(model, Address):
+        return _company_fragments(Company.objects.filter(address__in=pks), 'pk')
+    return set()
+
+
+def fragment_settings(request) -> dict:
+    """
+    Add the fragment cache timeout to the template context.
+
+    Args:
+        request: Request object.
+
+    Returns:
+        dict: Context variables.
+    """
+    return {'fragment_timeout': settings.FRAGMENT_CACHE_TIMEOUT}
+
+
+def _version_key(name: str, pk) -> str:
+    return f'fragments:{name}:{pk}'
+
+
+def _company_fragments(queryset, attname: str) -> set:
+    return {(COMPANY_EQUIPMENT, pk) for pk in queryset.values_list(attname, flat=True)}
+
+
+def _replace_versions(keys):
+    version = time.time_ns()
+    cache.set_many(dict.fromkeys(keys, version), timeout=None)
@@ -0,0 +1,381 @@
+"""
+Bulk import of equipment, reviews and companies from CSV or NDJSON files.
+
+Records are streamed from the file and validated with the validators of the
+model fields. Valid rows are loaded in batches of IMPORT_BATCH_SIZE into an
+unlogged staging table in companies_schema with PostgreSQL COPY, invalid ones
+are written to a rejects stream. Set-based statements then reject rows
+referring to missing objects or repeating an id, insert the missing addresses
+once and upsert the staged rows by id, all in one transaction.
+
+Columns are named like the export columns, so an export can be imported back.
+"""
+import csv
+import json
+from io import StringIO
+from time import monotonic
+from uuid import uuid4
+
+from django.core.exceptions import ValidationError
+from django.db import connection, transaction
+
+from .export import FORMAT_CSV
+from .models import Address, Company, Equipment, Review
+from .signals import rebuild_denormalized
+
+IMPORT_BATCH_SIZE = 10000
+STAGING_SCHEMA = 'companies_schema'
+ID = 'id'
+TIMESTAMPS = ('created', 'modified')
+ADDRESS_PREFIX = 'address_'
+ADDRESS_KEY = ('street_name', 'house_number', 'city', 'state')
+ADDRESS_COLUMNS = tuple(f'{ADDRESS_PREFIX}{column}' for column in ADDRESS_KEY)
+NOT_FOUND = 'Not found.'
+
+IMPORTS = (
+    ('equipment', Equipment, (ID, 'title', 'size', 'category_id', 'client_id')),
+    ('reviews', Review, (ID, 'text', 'rating', 'client_id', 'equipment_id')),
+    ('companies', Company, (ID, 'title', 'phone', 'client_id', *ADDRESS_COLUMNS)),
+)
+IMPORT_NAMES = tuple(name for name, _, _ in IMPORTS)
+
+ADDRESS_INSERT_SQL = """
+    INSERT INTO {address} (id, created, modified, street_name, house_number, city, state)
+    SELECT gen_random_uuid(), now(), now(), s.street_name, s.house_number, s.city, s.state
+    FROM (
+        SELECT DISTINCT
+            address_street_name AS street_name, address_house_number AS house_number,
+            address_city AS city, address_state AS state
+        FROM {staging}
+        WHERE address_street_name IS NOT NULL
+    ) AS s
+    WHERE NOT EXISTS (
+        SELECT 1 FROM {address} AS a
+        WHERE (a.street_name, a.house_number, a.city, a.state)
+            = (s.street_name, s.house_number, s.city, s.state)
+    )
+"""
+
+ADDRESS_JOIN_SQL = """
+    LEFT JOIN (
+        SELECT DISTINCT ON (street_name, house_number, city, state)
+            id, street_name, house_number, city, state
+        FROM {address}
+        WHERE (street_name, house_number, city, state) IN (
+            SELECT address_street_name, address_house_number, address_city, address_state
+            FROM {staging}
+        )
+        ORDER BY street_name, house_number, city, state, created, id
+    ) AS a ON (a.street_name, a.house_number, a.city, a.state)
+        = (s.address_street_name, s.address_house_number, s.address_city, s.address_state)
+"""
+
+TOUCHED_EQUIPMENT_SQL = """
+    SELECT equipment_id FROM {staging} WHERE equipment_id IS NOT NULL
+    UNION
+    SELECT review.equipment_id FROM {review} AS review
+    JOIN {staging} AS s ON s.id = review.id
+    WHERE review.equipment_id IS NOT NULL
+"""
+
+CREATE_STAGING_SQL = 'CREATE UNLOGGED TABLE {staging} (line integer PRIMARY KEY, {definitions})'
+COPY_SQL = 'COPY {staging} ({columns}) FROM STDIN WITH (FORMAT csv)'
+REPEATED_SQL = """
+    DELETE FROM {staging} AS s USING {staging} AS later
+    WHERE s.id = later.id AND s.line < later.line
+    RETURNING s.line
+"""
+ORPHANS_SQL = """
+    DELETE FROM {staging} AS s
+    WHERE s.{column} IS NOT NULL
+        AND NOT EXISTS (SELECT 1 FROM {related} AS r WHERE r.id = s.{column})
+    RETURNING s.line
+"""
+UPSERT_SQL = """
+    INSERT INTO {table} ({targets})
+    SELECT {expressions} FROM {staging} AS s {joins}
+    WHERE true
+    ON CONFLICT (id) DO UPDATE SET {updates}
+"""
+SEPARATOR = ', '
+
+
+def db_table(model) -> str:
+    """
+    Return the quoted table of a model.
+
+    Args:
+        model: Model class.
+
+    Returns:
+        str: Table name.
+    """
+    return model._meta.db_table  # noqa: WPS437
+
+
+def column_field(model, column: str):
+    """
+    Return the model field validating an import column.
+
+    Args:
+        model: Imported model.
+        column (str): Column name, address columns start with ADDRESS_PREFIX.
+
+    Returns:
+        Field: Model field of the column.
+    """
+    if column in ADDRESS_COLUMNS:
+        return Address._meta.get_field(column.removeprefix(ADDRESS_PREFIX))  # noqa: WPS437
+    return model._meta.get_field(column)  # noqa: WPS437
+
+
+def read_records(stream, import_format: str):
+    """
+    Read the records of a file one by one.
+
+    Args:
+        stream: Text stream.
+        import_format (str): csv or ndjson.
+
+    Yields:
+        tuple: Line number and record, None for a record that is not an object.
+    """
+    if import_format == FORMAT_CSV:
+        reader = csv.DictReader(stream)
+        yield from ((reader.line_num, csv_record) for csv_record in reader)
+        return
+    for line_number, line in enumerate(stream, 1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            record = None
+        yield line_number, record if isinstance(record, dict) else None
+
+
+def clean_value(field, raw):
+    """
+    Convert and validate a raw value with the validators of a field.
+
+    Args:
+        field: Model field.
+        raw: Value read from the file, an empty string meaning NULL.
+
+    Returns:
+        Python value of the field.
+    """
+    raw_value = None if raw == '' else raw
+    if field.is_relation:
+        return field.target_field.to_python(raw_value)
+    return field.clean(raw_value, None)
+
+
+def clean_record(columns, fields, record) -> tuple:
+    """
+    Validate the values of a record.
+
+    Address columns are only validated when at least one of them is filled.
+
+    Args:
+        columns (tuple): Column names.
+        fields (list): Model fields of the columns.
+        record (dict): Record read from the file, None if malformed.
+
+    Returns:
+        tuple: Cleaned values and errors by column.
+    """
+    if record is None:
+        return [], {'record': ['Expected an object.']}
+    address = [record.get(column) for column in ADDRESS_COLUMNS]
+    has_address = any(part is not None and part != '' for part in address)
+    cleaned = []
+    errors = {}
+    for column, field in zip(columns, fields):
+        if column in ADDRESS_COLUMNS and not has_address:
+            cleaned.append(None)
+            continue
+        try:
+            cleaned.append(clean_value(field, record.get(column)))
+        except ValidationError as error:
+            errors[column] = error.messages
+    return cleaned, errors
+
+
+def upsert_sql(model, columns, staging: str) -> tuple:
+    """
+    Build the statement inserting staged rows, or updating the rows with their id.
+
+    Args:
+        model: Imported model.
+        columns (tuple): Staged columns.
+        staging (str): Staging table.
+
+    Returns:
+        tuple: SQL and its arguments.
+    """
+    sources = {column: f's.{column}' for column in columns if column not in ADDRESS_COLUMNS}
+    sources[ID] = 'COALESCE(s.id, gen_random_uuid())'
+    joins = ''
+    if ADDRESS_COLUMNS[0] in columns:
+        sources['address_id'] = 'a.id'
+        joins = ADDRESS_JOIN_SQL.format(address=db_table(Address), staging=staging)
+    fields = model._meta.concrete_fields  # noqa: WPS437
+    expressions = []
+    sql_args = []
+    for field in fields:
+        expression = sources.get(field.column)
+        if expression is None and field.column in TIMESTAMPS:
+            expression = 'now()'
+        elif expression is None:
+            expression = '%s'  # noqa: WPS323
+            sql_args.append(field.get_default())
+        expressions.append(expression)
+    sql = UPSERT_SQL.format(
+        table=db_table(model),
+        targets=SEPARATOR.join(target.column for target in fields),
+        expressions=SEPARATOR.join(expressions),
+        staging=staging,
+        joins=joins,
+        updates=SEPARATOR.join(
+            f'{column} = EXCLUDED.{column}' for column in (*sources, 'modified') if column != ID
+        ),
+    )
+    return sql, sql_args
+
+
+class Importer:
+    """Load a file into one of the IMPORTS tables."""
+
+    def __init__(self, name: str, rejects, batch_size=IMPORT_BATCH_SIZE, progress=None):
+        """
+        Initialize the importer.
+
+        Args:
+            name (str): One of IMPORT_NAMES.
+            rejects: Text stream receiving the rejected records as NDJSON.
+            batch_size (int): Number of rows copied to the staging table at a time.
+            progress: Callable receiving the number of staged rows and the elapsed seconds.
+        """
+        self._model, self._columns = {spec[0]: spec[1:] for spec in IMPORTS}[name]
+        self._fields = [column_field(self._model, column) for column in self._columns]
+        self._rejects = rejects
+        self._batch_size = batch_size
+        self._progress = progress
+        self._staging = f'"{STAGING_SCHEMA}"."import_{uuid4().hex}"'
+        self.staged = 0
+        self.rejected = 0
+        self.started = monotonic()
+
+    def run(self, stream, import_format: str) -> int:
+        """
+        Import a file.
+
+        Args:
+            stream: Text stream.
+            import_format (str): csv or ndjson.
+
+        Returns:
+            int: Number of inserted or updated rows.
+        """
+        definitions = SEPARATOR.join(
+            ' '.join((column, field.db_type(connection)))
+            for column, field in zip(self._columns, self._fields)
+        )
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute(CREATE_STAGING_SQL.format(
+                    staging=self._staging, definitions=definitions,
+                ))
+                self._load(cursor, read_records(stream, import_format))
+                cursor.execute(f'ANALYZE {self._staging}')
+                self._reject_staged(cursor)
+                imported = self._merge(cursor)
+                cursor.execute(f'DROP TABLE {self._staging}')
+        return imported
+
+    def reject(self, line_number: int, errors: dict, record=None) -> None:
+        """
+        Write a rejected record.
+
+        Args:
+            line_number (int): Line of the record in the file.
+            errors (dict): Errors by column.
+            record (dict): The record, if it is still at hand.
+        """
+        rejected = {'line': line_number, 'errors': errors}
+        if record is not None:
+            rejected['record'] = record
+        line = json.dumps(rejected, default=str)
+        self._rejects.write(f'{line}\n')
+        self.rejected += 1
+
+    def _load(self, cursor, records) -> None:
+        batch = []
+        for line_number, record in records:
+            cleaned, errors = clean_record(self._columns, self._fields, record)
+            if errors:
+                self.reject(line_number, errors, record)
+                continue
+            batch.append([line_number, *cleaned])
+            if len(batch) >= self._batch_size:
+                self._copy(cursor, batch)
+                batch = []
+        self._copy(cursor, batch)
+
+    def _copy(self, cursor, rows) -> None:
+        if not rows:
+            return
+        buffer = StringIO()
+        csv.writer(buffer).writerows(rows)
+        buffer.seek(0)
+        columns = SEPARATOR.join(('line', *self._columns))
+        cursor.copy_expert(COPY_SQL.format(staging=self._staging, columns=columns), buffer)
+        self.staged += len(rows)
+        if self._progress:
+            self._progress(self.staged, monotonic() - self.started)
+
+    def _reject_staged(self, cursor) -> None:
+        """
+        Reject staged rows repeating the id of a later row or referring to missing objects.
+
+        Args:
+            cursor: Database cursor.
+        """
+        cursor.execute(REPEATED_SQL.format(staging=self._staging))
+        for repeated in cursor.fetchall():
+            self.reject(repeated[0], {ID: ['Repeated on a later line.']})
+        for column, field in zip(self._columns, self._fields):
+            if not field.is_relation:
+                continue
+            cursor.execute(ORPHANS_SQL.format(
+                staging=self._staging, column=column, related=db_table(field.related_model),
+            ))
+            for orphan in cursor.fetchall():
+                self.reject(orphan[0], {column: [NOT_FOUND]})
+
+    def _merge(self, cursor) -> int:
+        """
+        Upsert the staged rows and refresh the data derived from them.
+
+        Args:
+            cursor: Database cursor.
+
+        Returns:
+            int: Number of inserted or updated rows.
+        """
+        tables = {
+            'address': db_table(Address),
+            'review': db_table(Review),
+            'staging': self._staging,
+        }
+        if self._model is Company:
+            cursor.execute(ADDRESS_INSERT_SQL.format(**tables))
+        equipment_ids = []
+        if self._model is Review:
+            cursor.execute(TOUCHED_EQUIPMENT_SQL.format(**tables))
+            equipment_ids = [touched[0] for touched in cursor.fetchall()]
+        cursor.execute(*upsert_sql(self._model, self._columns, self._staging))
+        imported = cursor.rowcount
+        rebuild_denormalized(self._model, equipment_ids=equipment_ids)
+        return imported
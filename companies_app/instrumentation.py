@@ -0,0 +1,232 @@
+"""
+Per-request instrumentation: query count, SQL, template and view time.
+
+InstrumentationMiddleware measures a sample of the requests, picked with
+INSTRUMENTATION_SAMPLE_RATE. Queries of every database connection are
+timed through companies_app.wrappers.wrap_queries and template renders
+through the TimedTemplates backend. The measurements are sent back in a Server-Timing
+header, readable in the network panel of the browser, and logged as one JSON
+line, with the counters of the connection pools if companies_app.pool is
+used. Requests slower than INSTRUMENTATION_SLOW_MS are logged as warnings
+with their full SQL. Under ASGI the middleware runs async; its execute
+wrapper is scoped to the context of the request by wrap_queries, so concurrent
+requests only measure their own queries.
+"""
+import json
+import logging
+import random
+from contextvars import ContextVar
+from heapq import nlargest
+from time import perf_counter
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.template.backends.django import DjangoTemplates, Template
+
+from .pool.pools import pool_stats
+from .wrappers import wrap_queries
+
+SLOWEST_QUERIES = 3
+MILLISECONDS = 1000
+
+logger = logging.getLogger(__name__)
+_current_metrics = ContextVar('request_metrics', default=None)
+
+
+class RequestMetrics:
+    """Measurements of one request, also the execute wrapper timing its queries."""
+
+    def __init__(self):
+        """Initialize empty measurements."""
+        self.queries = []
+        self.template_time = 0
+        self.view_time = 0
+
+    def __call__(self, execute, *query):
+        """
+        Run and time a query.
+
+        Args:
+            execute: Next wrapper or the query execution.
+            query: SQL statement, parameters, executemany flag and context of the query.
+
+        Returns:
+            Result of the query execution.
+        """
+        started = perf_counter()
+        query_result = execute(*query)
+        self.queries.append((perf_counter() - started, query[0]))
+        return query_result
+
+    @property
+    def db_time(self) -> float:
+        """
+        Return the total time of the queries.
+
+        Returns:
+            float: Seconds.
+        """
+        return sum(duration for duration, _ in self.queries)
+
+    def server_timing(self) -> str:
+        """
+        Format the measurements as a Server-Timing header.
+
+        Returns:
+            str: Header value with durations in milliseconds.
+        """
+        db_ms, template_ms, view_ms = map(
+            _milliseconds, (self.db_time, self.template_time, self.view_time),
+        )
+        query_count = len(self.queries)
+        return ', '.join((
+            f'db;dur={db_ms};desc="{query_count} queries"',
+            f'template;dur={template_ms}',
+            f'view;dur={view_ms}',
+        ))
+
+    def log_entry(self, request, response, slow: bool) -> dict:
+        """
+        Build the structured log entry of the request.
+
+        Args:
+            request: Request object.
+            response: Response object.
+            slow (bool): Whether to include the full SQL of the request.
+
+        Returns:
+            dict: JSON-serializable entry.
+        """
+        entry = {
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'queries': len(self.queries),
+            'db_ms': _milliseconds(self.db_time),
+            'template_ms': _milliseconds(self.template_time),
+            'view_ms': _milliseconds(self.view_time),
+            'slowest': [
+                {'ms': _milliseconds(duration), 'sql': sql}
+                for duration, sql in nlargest(SLOWEST_QUERIES, self.queries)
+            ],
+        }
+        if slow:
+            entry['sql'] = [sql for _, sql in self.queries]
+        pools = pool_stats()
+        if pools:
+            entry['pools'] = pools
+        return entry
+
+
+class InstrumentationMiddleware:
+    """Measure a sample of the requests and report them in headers and logs."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        """
+        Initialize the middleware, async if the next middleware is.
+
+        Args:
+            get_response: Next middleware or the view.
+        """
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        """
+        Process a request, measuring it if it is sampled.
+
+        Args:
+            request: Request object.
+
+        Returns:
+            HttpResponse: Response with a Server-Timing header if the request was sampled.
+        """
+        if iscoroutinefunction(self):
+            return self._acall(request)
+        if random.random() >= settings.INSTRUMENTATION_SAMPLE_RATE:  # noqa: S311
+            return self.get_response(request)
+        metrics = RequestMetrics()
+        token = _current_metrics.set(metrics)
+        started = perf_counter()
+        with wrap_queries(metrics):
+            response = self.get_response(request)
+        _current_metrics.reset(token)
+        return self._report(request, response, metrics, started)
+
+    async def _acall(self, request):
+        if random.random() >= settings.INSTRUMENTATION_SAMPLE_RATE:  # noqa: S311
+            return await self.get_response(request)
+        metrics = RequestMetrics()
+        token = _current_metrics.set(metrics)
+        started = perf_counter()
+        with wrap_queries(metrics):
+            response = await self.get_response(request)
+        _current_metrics.reset(token)
+        return self._report(request, response, metrics, started)
+
+    def _report(self, request, response, metrics: RequestMetrics, started: float):
+        metrics.view_time = perf_counter() - started
+        response['Server-Timing'] = metrics.server_timing()
+        slow = metrics.view_time * MILLISECONDS >= settings.INSTRUMENTATION_SLOW_MS
+        level = logging.WARNING if slow else logging.INFO
+        if logger.isEnabledFor(level):
+            logger.log(level, json.dumps(metrics.log_entry(request, response, slow)))
+        return response
+
+
+class TimedTemplate(Template):
+    """Django template adding its render time to the measured request."""
+
+    def render(self, context=None, request=None):
+        """
+        Render the template.
+
+        Args:
+            context (dict): Template context.
+            request: Request object.
+
+        Returns:
+            SafeString: Rendered template.
+        """
+        started = perf_counter()
+        rendered = super().render(context, request)
+        metrics = _current_metrics.get()
+        if metrics is not None:
+            metrics.template_time += perf_counter() - started
+        return rendered
+
+
+class TimedTemplates(DjangoTemplates):
+    """Django template backend whose templates are timed by InstrumentationMiddleware."""
+
+    def from_string(self, template_code):
+        """
+        Compile a template from a string.
+
+        Args:
+            template_code (str): Template source.
+
+        Returns:
+            TimedTemplate: Compiled template.
+        """
+        return TimedTemplate(super().from_string(template_code).template, self)
+
+    def get_template(self, template_name):
+        """
+        Load a template by name.
+
+        Args:
+            template_name (str): Template name.
+
+        Returns:
+            TimedTemplate: Loaded template.
+        """
+        return TimedTemplate(super().get_template(template_name).template, self)
+
+
+def _milliseconds(duration: float) -> float:
+    return round(duration * MILLISECONDS, 3)
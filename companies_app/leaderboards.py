@@ -0,0 +1,265 @@
+"""
+Equipment leaderboards served from precomputed ranking tables.
+
+Every equipment has an EquipmentRanking row holding its review count, its
+rating sum, its score and its number of reviews of the current week:
+
+- top rated orders equipment by their Bayesian average, the mean of their
+  ratings pulled towards the mean of every rating, RankingPrior.mean, as if
+  each had LEADERBOARD_PRIOR_WEIGHT more reviews of that mean, so an equipment
+  with a single 5 does not outrank one with hundreds of 4.9 on average;
+- trending orders equipment by their reviews since Monday, in the current
+  time zone; rows still counting an earlier week are left out.
+
+Every review write shifts the ranking of its equipment with one statement, an
+upsert for an added review and an update for a removed one, so a leaderboard
+is a read of an index rather than a GROUP BY over Review.
+rebuild_rankings recomputes the rows from the Review table and refreshes the
+prior mean, which the incremental writes leave as it is.
+"""
+from datetime import datetime, time, timedelta
+from uuid import UUID
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import Equipment, EquipmentRanking, RankingPrior, Review
+from .ratings import RATING_VALUES
+
+# Prior mean until the first rebuild sees a review: the middle of the rating scale.
+DEFAULT_PRIOR_MEAN = (RATING_VALUES[0] + RATING_VALUES[-1]) / 2
+TOP_RATED_ORDER = ('-score', '-rating_count', 'equipment_id')
+TRENDING_ORDER = ('-week_reviews', '-score', 'equipment_id')
+PRIOR_MEAN_SQL = 'COALESCE((SELECT mean FROM {prior} LIMIT 1), %(prior_mean)s)'  # noqa: WPS323
+SCORE_SQL = '(%(prior_weight)s * {prior_mean} + {total}) / NULLIF(%(prior_weight)s + {count}, 0)'  # noqa: E501, WPS323
+
+SHIFTED_COLUMNS = """
+        rating_count = ranking.rating_count + EXCLUDED.rating_count,
+        rating_sum = ranking.rating_sum + EXCLUDED.rating_sum,
+        score = {score},
+        week = EXCLUDED.week,
+        week_reviews = EXCLUDED.week_reviews
+            + CASE WHEN ranking.week = EXCLUDED.week THEN ranking.week_reviews ELSE 0 END
+"""
+
+SHIFT_SQL = """
+    INSERT INTO {ranking} AS ranking
+        (id, equipment_id, rating_count, rating_sum, score, week, week_reviews)
+    VALUES (
+        gen_random_uuid(), %(equipment)s, %(delta)s, %(rating_delta)s, {inserted_score},
+        %(week)s, %(week_delta)s
+    )
+    ON CONFLICT (equipment_id) DO UPDATE SET {shifted}
+"""  # noqa: WPS323
+
+# A removed review never inserts a ranking: its equipment may be deleted along with it.
+UNSHIFT_SQL = """
+    UPDATE {ranking} AS ranking SET {shifted}
+    FROM (
+        SELECT
+            %(delta)s AS rating_count, %(rating_delta)s AS rating_sum,
+            %(week)s::date AS week, %(week_delta)s AS week_reviews
+    ) AS excluded
+    WHERE ranking.equipment_id = %(equipment)s
+"""  # noqa: WPS323
+
+REBUILD_PRIOR_SQL = """
+    INSERT INTO {prior} (id, mean, rebuilt)
+    SELECT gen_random_uuid(), AVG(rating)::double precision, statement_timestamp()
+    FROM {review}
+    WHERE equipment_id IS NOT NULL
+"""
+
+REBUILD_SQL = """
+    WITH stats AS (
+        SELECT
+            equipment_id,
+            COUNT(*) AS rating_count,
+            SUM(rating) AS rating_sum,
+            COUNT(*) FILTER (WHERE created >= %(week_start)s) AS week_reviews
+        FROM {review}
+        WHERE equipment_id IS NOT NULL {only_reviews}
+        GROUP BY equipment_id
+    ), totals AS (
+        SELECT
+            equipment.id AS equipment_id,
+            COALESCE(stats.rating_count, 0) AS rating_count,
+            COALESCE(stats.rating_sum, 0) AS rating_sum,
+            COALESCE(stats.week_reviews, 0) AS week_reviews
+        FROM {equipment} AS equipment
+        LEFT JOIN stats ON stats.equipment_id = equipment.id
+        WHERE TRUE {only_equipment}
+    )
+    INSERT INTO {ranking} (id, equipment_id, rating_count, rating_sum, score, week, week_reviews)
+    SELECT
+        gen_random_uuid(), equipment_id, rating_count, rating_sum, {score}, %(week)s, week_reviews
+    FROM totals
+    ON CONFLICT (equipment_id) DO UPDATE SET
+        rating_count = EXCLUDED.rating_count,
+        rating_sum = EXCLUDED.rating_sum,
+        score = EXCLUDED.score,
+        week = EXCLUDED.week,
+        week_reviews = EXCLUDED.week_reviews
+"""  # noqa: WPS323
+
+
+def current_week():
+    """
+    Return the first day of the current week.
+
+    Returns:
+        date: Monday of the current week in the current time zone.
+    """
+    today = timezone.localdate()
+    return today - timedelta(days=today.weekday())
+
+
+def week_start(week) -> datetime:
+    """
+    Return the time a week starts at.
+
+    Args:
+        week (date): Monday of the week.
+
+    Returns:
+        datetime: Midnight of the Monday in the current time zone.
+    """
+    return timezone.make_aware(datetime.combine(week, time.min))
+
+
+def parse_category(category):
+    """
+    Read the category a leaderboard is limited to, raising ValueError if it is not a UUID.
+
+    Args:
+        category (str | None): Category ID from the query string.
+
+    Returns:
+        UUID | None: Category ID, None for every category.
+    """
+    return UUID(category) if category else None
+
+
+def top_rated(category_id=None):
+    """
+    Return the best rated equipment.
+
+    Args:
+        category_id (UUID | None): Category to limit the leaderboard to.
+
+    Returns:
+        QuerySet: Rankings of reviewed equipment, best score first.
+    """
+    rankings = EquipmentRanking.objects.filter(rating_count__gt=0)
+    return _leaderboard(rankings, category_id, TOP_RATED_ORDER)
+
+
+def trending(category_id=None):
+    """
+    Return the equipment most reviewed this week.
+
+    Args:
+        category_id (UUID | None): Category to limit the leaderboard to.
+
+    Returns:
+        QuerySet: Rankings of equipment reviewed this week, most reviews first.
+    """
+    rankings = EquipmentRanking.objects.filter(week=current_week(), week_reviews__gt=0)
+    return _leaderboard(rankings, category_id, TRENDING_ORDER)
+
+
+def shift_ranking(equipment_id, rating: int, delta: int, created=None) -> None:
+    """
+    Add or remove one review from the ranking of an equipment.
+
+    Args:
+        equipment_id: Equipment ID.
+        rating (int): Rating of the review.
+        delta (int): 1 when a review is added, -1 when it is removed.
+        created (datetime | None): Creation time of the review, counted this week from Monday.
+    """
+    if equipment_id is None or rating not in RATING_VALUES:
+        return
+    week = current_week()
+    counted = created is not None and created >= week_start(week)
+    shifted = SHIFTED_COLUMNS.format(score=_score_sql(
+        'ranking.rating_sum + EXCLUDED.rating_sum',
+        'ranking.rating_count + EXCLUDED.rating_count',
+    ))
+    sql = (SHIFT_SQL if delta > 0 else UNSHIFT_SQL).format(
+        ranking=_db_table(EquipmentRanking),
+        inserted_score=_score_sql('%(rating_delta)s', '%(delta)s'),  # noqa: WPS323
+        shifted=shifted,
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, {
+            **_prior_args(),
+            'equipment': equipment_id,
+            'delta': delta,
+            'rating_delta': delta * rating,
+            'week': week,
+            'week_delta': delta if counted else 0,
+        })
+
+
+def rebuild_rankings(equipment_ids=None) -> int:
+    """
+    Recompute the rankings from the Review table with one set-based upsert.
+
+    A full rebuild also recomputes the prior mean from every review.
+
+    Args:
+        equipment_ids: Optional iterable of equipment IDs to limit the rebuild to.
+
+    Returns:
+        int: Number of rebuilt rankings.
+    """
+    only_reviews = only_equipment = ''
+    sql_args = {**_prior_args(), 'week': current_week(), 'week_start': week_start(current_week())}
+    if equipment_ids is not None:
+        only_reviews = 'AND equipment_id = ANY(%(equipment_ids)s::uuid[])'  # noqa: WPS323
+        only_equipment = 'AND equipment.id = ANY(%(equipment_ids)s::uuid[])'  # noqa: WPS323
+        sql_args['equipment_ids'] = [str(equipment_id) for equipment_id in equipment_ids]
+    sql = REBUILD_SQL.format(
+        review=_db_table(Review),
+        equipment=_db_table(Equipment),
+        ranking=_db_table(EquipmentRanking),
+        score=_score_sql('rating_sum', 'rating_count'),
+        only_reviews=only_reviews,
+        only_equipment=only_equipment,
+    )
+    with transaction.atomic():
+        if equipment_ids is None:
+            _rebuild_prior()
+        with connection.cursor() as cursor:
+            cursor.execute(sql, sql_args)
+            return cursor.rowcount
+
+
+def _rebuild_prior() -> None:
+    RankingPrior.objects.all().delete()
+    with connection.cursor() as cursor:
+        cursor.execute(REBUILD_PRIOR_SQL.format(
+            prior=_db_table(RankingPrior), review=_db_table(Review),
+        ))
+
+
+def _db_table(model) -> str:
+    return model._meta.db_table  # noqa: WPS437
+
+
+def _leaderboard(rankings, category_id, ordering):
+    if category_id is not None:
+        rankings = rankings.filter(equipment__category_id=category_id)
+    rankings = rankings.select_related('equipment__category').order_by(*ordering)
+    return rankings[:settings.LEADERBOARD_SIZE]
+
+
+def _score_sql(total: str, count: str) -> str:
+    prior_mean = PRIOR_MEAN_SQL.format(prior=_db_table(RankingPrior))
+    return SCORE_SQL.format(prior_mean=prior_mean, total=total, count=count)
+
+
+def _prior_args() -> dict:
+    return {'prior_weight': settings.LEADERBOARD_PRIOR_WEIGHT, 'prior_mean': DEFAULT_PRIOR_MEAN}
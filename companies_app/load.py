@@ -0,0 +1,123 @@
+"""
+ASGI load benchmark of the async pages against their sync versions.
+
+The asgi suite serves every page of companies_app.async_urls in its sync and
+its async version through the ASGI handler, with the Django async test client
+sending LOAD_CONCURRENCY requests at a time, and reports the throughput and
+the p50 and p95 latency under that load.
+
+The sync views run in a thread through sync_to_async, as under an ASGI
+server. In process, the sync code of every request shares one thread, so the
+suite shows how much of a request the event loop overlaps with the others,
+not the gain of a server running each request on its own thread.
+"""
+import asyncio
+from collections import Counter
+from functools import partial
+from http import HTTPStatus
+from statistics import median, quantiles
+from time import perf_counter
+
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+from django.test.utils import override_settings
+
+from .benchmark import (
+    BENCHMARK_REPEAT,
+    P95_QUANTILES,
+    discover_routes,
+    route_request,
+    route_samples,
+)
+
+LOAD_CONCURRENCY = 8
+ASYNC_URLCONF = 'companies_app.async_urls'
+# Host of the requests of the async test client.
+LOAD_HOST = 'testserver'
+# Benchmark name suffix and route namespace of each version of a page.
+VARIANTS = (
+    ('sync', ''),
+    ('async', 'async:'),
+)
+
+
+def run_asgi(user, repeat=BENCHMARK_REPEAT, concurrency=LOAD_CONCURRENCY) -> dict:
+    """
+    Benchmark the sync and async versions of the async pages under concurrent load.
+
+    Args:
+        user: Logged in user.
+        repeat (int): Number of rounds of concurrent requests of every page.
+        concurrency (int): Number of requests sent at a time.
+
+    Returns:
+        dict: Measurements by page and version, with the requested path.
+    """
+    client = AsyncClient(raise_request_exception=False)
+    client.force_login(user)
+    measurements = {}
+    with override_settings(ALLOWED_HOSTS=[LOAD_HOST]):
+        for name, (url, query) in _page_requests(route_samples(user)).items():
+            send = partial(_aget, client, url, query)
+            measurements[name] = {'path': url, **async_to_sync(load)(send, repeat, concurrency)}
+    return measurements
+
+
+async def load(send, repeat: int, concurrency=LOAD_CONCURRENCY) -> dict:
+    """
+    Benchmark a request sent concurrently.
+
+    Args:
+        send: Coroutine function sending the request and returning the response status.
+        repeat (int): Number of rounds of concurrent requests, at least 1.
+        concurrency (int): Number of requests of a round.
+
+    Returns:
+        dict: Status of the first request, number of requests of every status other than
+            2xx and 3xx, number of timed requests, concurrency, throughput, p50 and p95 latency.
+    """
+    statuses = [await send()]
+    timings = []
+    started = perf_counter()
+    for _ in range(repeat):
+        for timing, status in await asyncio.gather(*(_timed(send) for _ in range(concurrency))):
+            timings.append(timing)
+            statuses.append(status)
+    elapsed = perf_counter() - started
+    return {
+        'status': statuses[0],
+        'failed': _failed(statuses),
+        'requests': len(timings),
+        'concurrency': concurrency,
+        'throughput_rps': round(len(timings) / elapsed, 1),
+        'p50_ms': round(median(timings), 3),
+        'p95_ms': round(quantiles(timings, n=P95_QUANTILES, method='inclusive')[-1], 3),
+    }
+
+
+def _page_requests(samples: dict) -> dict:
+    return {
+        f'{page}-{variant}': route_request(f'{namespace}{page}', arguments, samples)
+        for page, arguments in discover_routes(ASYNC_URLCONF)
+        for variant, namespace in VARIANTS
+    }
+
+
+def _failed(statuses: list) -> dict:
+    failed = Counter(str(code) for code in statuses if not _succeeded(code))
+    return dict(failed)
+
+
+def _succeeded(status: int) -> bool:
+    return HTTPStatus.OK <= status < HTTPStatus.BAD_REQUEST
+
+
+async def _timed(send) -> tuple:
+    started = perf_counter()
+    status = await send()
+    return (perf_counter() - started) * 1000, status
+
+
+async def _aget(client, url: str, query: dict) -> int:
+    response = await client.get(url, query)
+    return response.status_code
@@ -0,0 +1,61 @@
+"""Module for benchmarking the application routes."""
+import json
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from companies_app.baselines import SUITE_NAMES, build_baseline, compare_baselines, run_suites
+from companies_app.benchmark import BENCHMARK_REPEAT
+
+
+class Command(BaseCommand):
+    """Benchmark the application and write a JSON baseline."""
+
+    help = 'Time every route with query counts, p50/p95 latency and peak memory'
+
+    def add_arguments(self, parser):
+        """
+        Add the command arguments.
+
+        Args:
+            parser: Argument parser.
+        """
+        parser.add_argument(
+            '--suite', dest='suites', action='append', choices=SUITE_NAMES,
+            help='Suite to run, may be repeated, every suite by default',
+        )
+        parser.add_argument('--repeat', type=int, default=BENCHMARK_REPEAT)
+        parser.add_argument('--username', default='seed0', help='Benchmarked user')
+        parser.add_argument('--output', help='File receiving the baseline, stdout by default')
+        parser.add_argument('--compare', help='Earlier baseline to compare the results with')
+
+    def handle(self, *args, **kwargs):
+        """
+        Execute the command to run the benchmark.
+
+        Args:
+            args: args.
+            kwargs: kwargs.
+
+        Raises:
+            CommandError: If the user or its data is missing or repeat is below 2.
+        """
+        if kwargs['repeat'] < 2:
+            raise CommandError('--repeat must be at least 2')
+        user = User.objects.filter(username=kwargs['username']).first()
+        if user is None:
+            raise CommandError(f'User {kwargs["username"]} not found, seed a dataset first')
+        try:
+            suites = run_suites(kwargs['suites'] or SUITE_NAMES, user, kwargs['repeat'])
+        except ValueError as error:
+            raise CommandError(str(error))
+        baseline = build_baseline(suites, kwargs['repeat'])
+        if kwargs['output']:
+            with open(kwargs['output'], 'w') as output:
+                json.dump(baseline, output, indent=2)
+        else:
+            self.stdout.write(json.dumps(baseline, indent=2))
+        if kwargs['compare']:
+            with open(kwargs['compare']) as previous:
+                lines = compare_baselines(json.load(previous), baseline)
+            self.stdout.write('\n'.join(lines))
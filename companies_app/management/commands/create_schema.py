@@ -4,12 +4,29 @@ import os
 from django.core.management.base import BaseCommand
 from django.db import connection
 
+# SQL file at the root of the project and success message.
+SCHEMA = ('create_companies_schema.sql', 'Successfully created companies_schema schema')
+ROLLUPS = ('create_companies_rollups.sql', 'Successfully created companies_schema rollups')
+
 
 class Command(BaseCommand):
     """Create companies_schema schema in the database if it doesn't exist."""
 
     help = 'Create companies_schema schema in the database'
 
+    def add_arguments(self, parser):
+        """
+        Add the command arguments.
+
+        Args:
+            parser: Argument parser.
+        """
+        parser.add_argument(
+            '--rollups',
+            action='store_true',
+            help='Create the materialized views of companies_app.rollups, once the tables exist',
+        )
+
     def handle(self, *args, **kwargs):
         """
         Execute the command to create the schema.
@@ -19,11 +36,12 @@ class Command(BaseCommand):
             kwargs: kwargs.
 
         """
-        sql_path = os.path.join(os.path.dirname(__file__), '../../../create_companies_schema.sql')
+        sql_name, message = ROLLUPS if kwargs['rollups'] else SCHEMA
+        sql_path = os.path.join(os.path.dirname(__file__), '../../..', sql_name)
         with open(sql_path, 'r') as sql_file:
             sql = sql_file.read()
 
         with connection.cursor() as cursor:
             cursor.execute(sql)
 
-        self.stdout.write(self.style.SUCCESS('Successfully created companies_schema schema'))
+        self.stdout.write(self.style.SUCCESS(message))
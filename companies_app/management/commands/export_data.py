@@ -0,0 +1,40 @@
+"""Module for exporting a table as NDJSON or CSV."""
+from django.core.management.base import BaseCommand
+
+from companies_app.export import EXPORT_NAMES, FORMAT_NDJSON, FORMATS, export_chunks
+
+
+class Command(BaseCommand):
+    """Stream the rows of a table to a file or to the standard output."""
+
+    help = 'Export a table as NDJSON or CSV'
+
+    def add_arguments(self, parser):
+        """
+        Add the command arguments.
+
+        Args:
+            parser: Argument parser.
+        """
+        parser.add_argument('name', choices=EXPORT_NAMES)
+        parser.add_argument(
+            '--format', dest='export_format', choices=FORMATS, default=FORMAT_NDJSON,
+        )
+        parser.add_argument('--output', help='File to write, the standard output by default')
+
+    def handle(self, *args, **kwargs):
+        """
+        Execute the command to export the table.
+
+        Args:
+            args: args.
+            kwargs: kwargs.
+
+        """
+        chunks = export_chunks(kwargs['name'], kwargs['export_format'])
+        if not kwargs['output']:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending='')
+            return
+        with open(kwargs['output'], 'w', newline='') as output:
+            output.writelines(chunks)
@@ -0,0 +1,69 @@
+"""Module for importing a CSV or NDJSON file into a table."""
+from time import monotonic
+
+from django.core.management.base import BaseCommand
+
+from companies_app.export import FORMAT_CSV, FORMAT_NDJSON, FORMATS
+from companies_app.importer import IMPORT_BATCH_SIZE, IMPORT_NAMES, Importer
+
+
+class Command(BaseCommand):
+    """Load equipment, reviews or companies from a file through a staging table."""
+
+    help = 'Import equipment, reviews or companies from a CSV or NDJSON file'
+
+    def add_arguments(self, parser):
+        """
+        Add the command arguments.
+
+        Args:
+            parser: Argument parser.
+        """
+        parser.add_argument('name', choices=IMPORT_NAMES)
+        parser.add_argument('path')
+        parser.add_argument(
+            '--format', dest='import_format', choices=FORMATS,
+            help='File format, guessed from the file extension by default',
+        )
+        parser.add_argument(
+            '--rejects',
+            help='File receiving the rejected records, <path>.rejects.ndjson by default',
+        )
+        parser.add_argument('--batch-size', type=int, default=IMPORT_BATCH_SIZE)
+
+    def handle(self, *args, **kwargs):
+        """
+        Execute the command to import the file.
+
+        Args:
+            args: args.
+            kwargs: kwargs.
+
+        """
+        path = kwargs['path']
+        import_format = kwargs['import_format']
+        if not import_format:
+            import_format = FORMAT_CSV if path.endswith(f'.{FORMAT_CSV}') else FORMAT_NDJSON
+        rejects_path = kwargs['rejects'] or f'{path}.rejects.ndjson'
+        with open(rejects_path, 'w') as rejects:
+            importer = Importer(
+                kwargs['name'], rejects, kwargs['batch_size'], progress=self.report_progress,
+            )
+            with open(path, newline='') as source:
+                imported = importer.run(source, import_format)
+        rate = imported / (monotonic() - importer.started)
+        self.stdout.write(self.style.SUCCESS(
+            f'Successfully imported {imported} rows ({rate:.0f} rows/s), '
+            + f'rejected {importer.rejected}: {rejects_path}',
+        ))
+
+    def report_progress(self, rows: int, elapsed: float):
+        """
+        Write the number of loaded rows and the loading rate.
+
+        Args:
+            rows (int): Number of loaded rows.
+            elapsed (float): Seconds since the import started.
+        """
+        rate = rows / elapsed if elapsed else 0
+        self.stdout.write(f'Loaded {rows} rows ({rate:.0f} rows/s)')
@@ -0,0 +1,24 @@
+"""Module for rebuilding the equipment leaderboards."""
+from django.core.management.base import BaseCommand
+
+from companies_app.leaderboards import rebuild_rankings
+
+
+class Command(BaseCommand):
+    """Recompute the leaderboard rankings of every equipment and the prior mean from reviews."""
+
+    help = 'Rebuild equipment leaderboard rankings from reviews'
+
+    def handle(self, *args, **kwargs):
+        """
+        Execute the command to rebuild the rankings.
+
+        Args:
+            args: args.
+            kwargs: kwargs.
+
+        """
+        rebuilt = rebuild_rankings()
+        self.stdout.write(
+            self.style.SUCCESS(f'Successfully rebuilt the rankings of {rebuilt} equipments'),
+        )
@@ -0,0 +1,24 @@
+"""Module for rebuilding equipment rating aggregates."""
+from django.core.management.base import BaseCommand
+
+from companies_app.ratings import rebuild_ratings
+
+
+class Command(BaseCommand):
+    """Recompute the stored rating aggregates of every equipment from its reviews."""
+
+    help = 'Rebuild equipment rating aggregates from reviews'
+
+    def handle(self, *args, **kwargs):
+        """
+        Execute the command to rebuild the aggregates.
+
+        Args:
+            args: args.
+            kwargs: kwargs.
+
+        """
+        updated = rebuild_ratings()
+        self.stdout.write(
+            self.style.SUCCESS(f'Successfully rebuilt ratings of {updated} equipments'),
+        )
@@ -0,0 +1,44 @@
+"""Module for refreshing the company and category statistics."""
+from time import monotonic, sleep
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from companies_app.rollups import refresh_rollups
+
+
+class Command(BaseCommand):
+    """Refresh the materialized views of companies_app.rollups, once or on a schedule."""
+
+    help = 'Refresh the company and category statistics'
+
+    def add_arguments(self, parser):
+        """
+        Add the command arguments.
+
+        Args:
+            parser: Argument parser.
+        """
+        parser.add_argument(
+            '--every', type=float, default=0,
+            help='Refresh again after this many seconds until stopped, 0 to refresh once',
+        )
+
+    def handle(self, *args, **kwargs):
+        """
+        Execute the command to refresh the statistics.
+
+        Args:
+            args: args.
+            kwargs: kwargs.
+
+        """
+        while True:
+            started = monotonic()
+            refresh_rollups()
+            elapsed = monotonic() - started
+            self.stdout.write(self.style.SUCCESS(f'Successfully refreshed in {elapsed:.2f}s'))
+            if not kwargs['every']:
+                return
+            close_old_connections()
+            sleep(max(kwargs['every'] - elapsed, 0))
@@ -0,0 +1,49 @@
+"""Module for generating a synthetic dataset."""
+from django.core.management.base import BaseCommand
+
+from companies_app.dataset import DATASET_SIZES, DEFAULT_SKEW, DatasetGenerator
+
+
+class Command(BaseCommand):
+    """Insert a reproducible synthetic dataset of configurable size."""
+
+    help = 'Generate clients, companies, addresses, equipment, links and skewed reviews'
+
+    def add_arguments(self, parser):
+        """
+        Add the command arguments.
+
+        Args:
+            parser: Argument parser.
+        """
+        for name, default, description in DATASET_SIZES:
+            option = name.replace('_', '-')
+            parser.add_argument(
+                f'--{option}', dest=name, type=int, default=default, help=description,
+            )
+        parser.add_argument(
+            '--skew', type=float, default=DEFAULT_SKEW,
+            help='Zipf exponent of the reviews per equipment, 0 for a uniform spread',
+        )
+        parser.add_argument('--seed', type=int, default=0, help='Seed of the random generator')
+        parser.add_argument('--prefix', default='seed', help='Prefix of the generated usernames')
+        parser.add_argument('--password', default='password', help='Password of every user')
+
+    def handle(self, *args, **kwargs):
+        """
+        Execute the command to generate the dataset.
+
+        Args:
+            args: args.
+            kwargs: kwargs.
+
+        """
+        generator = DatasetGenerator(
+            sizes={name: kwargs[name] for name, _, _ in DATASET_SIZES},
+            skew=kwargs['skew'],
+            seed=kwargs['seed'],
+            prefix=kwargs['prefix'],
+        )
+        created = generator.generate(kwargs['password'])
+        summary = ', '.join(f'{count} {name}' for name, count in created.items())
+        self.stdout.write(self.style.SUCCESS(f'Successfully generated {summary}'))
@@ -0,0 +1,84 @@
+# Generated by Django 5.0.6 on 2026-10-18 08:27
+
+from django.db import migrations, models
+
+# Rating aggregates of the existing reviews, as computed by ratings.rebuild_ratings at this version.
+REBUILD_RATINGS_SQL = '''
+    UPDATE "companies_schema"."equipment" AS target SET
+        rating_count = COALESCE(stats.rating_count, 0),
+        rating_sum = COALESCE(stats.rating_sum, 0),
+        rating_mean = stats.rating_mean,
+        rating_1 = COALESCE(stats.rating_1, 0),
+        rating_2 = COALESCE(stats.rating_2, 0),
+        rating_3 = COALESCE(stats.rating_3, 0),
+        rating_4 = COALESCE(stats.rating_4, 0),
+        rating_5 = COALESCE(stats.rating_5, 0)
+    FROM "companies_schema"."equipment" AS source
+    LEFT JOIN (
+        SELECT
+            equipment_id,
+            COUNT(*) AS rating_count,
+            SUM(rating) AS rating_sum,
+            AVG(rating)::double precision AS rating_mean,
+            COUNT(*) FILTER (WHERE rating = 1) AS rating_1,
+            COUNT(*) FILTER (WHERE rating = 2) AS rating_2,
+            COUNT(*) FILTER (WHERE rating = 3) AS rating_3,
+            COUNT(*) FILTER (WHERE rating = 4) AS rating_4,
+            COUNT(*) FILTER (WHERE rating = 5) AS rating_5
+        FROM "companies_schema"."review"
+        WHERE equipment_id IS NOT NULL
+        GROUP BY equipment_id
+    ) AS stats ON stats.equipment_id = source.id
+    WHERE target.id = source.id
+'''
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies_app', '0006_alter_address_house_number_alter_company_title_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='equipment',
+            name='rating_1',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='ratings of 1'),
+        ),
+        migrations.AddField(
+            model_name='equipment',
+            name='rating_2',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='ratings of 2'),
+        ),
+        migrations.AddField(
+            model_name='equipment',
+            name='rating_3',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='ratings of 3'),
+        ),
+        migrations.AddField(
+            model_name='equipment',
+            name='rating_4',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='ratings of 4'),
+        ),
+        migrations.AddField(
+            model_name='equipment',
+            name='rating_5',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='ratings of 5'),
+        ),
+        migrations.AddField(
+            model_name='equipment',
+            name='rating_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='rating count'),
+        ),
+        migrations.AddField(
+            model_name='equipment',
+            name='rating_mean',
+            field=models.FloatField(blank=True, editable=False, null=True, verbose_name='rating mean'),
+        ),
+        migrations.AddField(
+            model_name='equipment',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='rating sum'),
+        ),
+        migrations.RunSQL(REBUILD_RATINGS_SQL, migrations.RunSQL.noop),
+    ]
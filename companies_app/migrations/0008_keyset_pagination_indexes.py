@@ -0,0 +1,21 @@
+# Generated by Django 5.0.6 on 2026-10-18 08:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies_app', '0007_equipment_rating_aggregates'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='company',
+            index=models.Index(fields=['title', 'phone', 'id'], name='company_keyset_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='equipment',
+            index=models.Index(fields=['title', 'size', 'id'], name='equipment_keyset_idx'),
+        ),
+    ]
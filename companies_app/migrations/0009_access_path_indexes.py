@@ -0,0 +1,79 @@
+# Generated by Django 5.0.6 on 2026-10-18 08:38
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# The schema editor cannot introspect tables named "schema"."table", so the single
+# column foreign key indexes superseded by the composite ones are dropped explicitly.
+SUPERSEDED_INDEXES = (
+    'company_client_id_a4271994',
+    'company_equipment_company_id_e0f3fb1b',
+    'company_equipment_equipment_id_a46b436f',
+    'equipment_client_id_3a90d423',
+    'review_client_id_f62bdb45',
+    'review_equipment_id_9d68f74e',
+)
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies_app', '0008_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='company',
+            name='client',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, to='companies_app.client'),
+        ),
+        migrations.AlterField(
+            model_name='companyequipment',
+            name='company',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='companies_app.company', verbose_name='company'),
+        ),
+        migrations.AlterField(
+            model_name='companyequipment',
+            name='equipment',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='companies_app.equipment', verbose_name='equipment'),
+        ),
+        migrations.AlterField(
+            model_name='equipment',
+            name='client',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, to='companies_app.client'),
+        ),
+        migrations.AlterField(
+            model_name='review',
+            name='client',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, to='companies_app.client'),
+        ),
+        migrations.AlterField(
+            model_name='review',
+            name='equipment',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='reviews', to='companies_app.equipment'),
+        ),
+        migrations.AddIndex(
+            model_name='company',
+            index=models.Index(fields=['client', 'title', 'phone'], include=('id',), name='company_client_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='companyequipment',
+            index=models.Index(fields=['equipment', 'company'], name='company_equipment_reverse_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='equipment',
+            index=models.Index(fields=['client', 'title', 'size'], include=('id',), name='equipment_client_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['equipment', 'text', 'rating'], include=('id',), name='review_equipment_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['client', 'text', 'rating'], include=('id',), name='review_client_idx'),
+        ),
+        migrations.RunSQL(
+            [f'DROP INDEX IF EXISTS "companies_schema"."{index}"' for index in SUPERSEDED_INDEXES],
+            # Reverting the AlterField operations recreates the indexes.
+            migrations.RunSQL.noop,
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.0.6 on 2026-10-18 08:43
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies_app', '0010_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='company',
+            index=models.Index(models.F('client'), django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('title'), name='text_pattern_ops'), name='company_client_prefix_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.0.6 on 2026-10-18 09:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies_app', '0011_company_prefix_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['equipment', 'modified'], name='review_equipment_modified_idx'),
+        ),
+    ]
@@ -0,0 +1,122 @@
+# Generated by Django 5.0.6 on 2026-10-18 10:27
+
+import companies_app.models
+import uuid
+from django.db import migrations, models
+
+# Tables of the changes feed, see companies_app.changes.
+SYNCED_TABLES = ('company', 'equipment', 'review')
+
+# modified is set on every insert and update, including QuerySet.update(), bulk_update()
+# and COPY, to a time no earlier than the start of the writing transaction.
+STAMP_MODIFIED = '''
+CREATE FUNCTION "companies_schema"."stamp_modified"() RETURNS trigger AS $$
+BEGIN
+    NEW.modified := greatest(NEW.modified, clock_timestamp());
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql
+'''
+
+# Every deleted row, cascades included, leaves a tombstone.
+RECORD_DELETION = '''
+CREATE FUNCTION "companies_schema"."record_deletion"() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO "companies_schema"."tombstone" (id, model, object_id, deleted)
+    VALUES (gen_random_uuid(), TG_ARGV[0], OLD.id, clock_timestamp());
+    RETURN OLD;
+END
+$$ LANGUAGE plpgsql
+'''
+
+# A link changes the company and equipment lists of both sides.
+TOUCH_LINKED = '''
+CREATE FUNCTION "companies_schema"."touch_linked"() RETURNS trigger AS $$
+DECLARE
+    link "companies_schema"."company_equipment";
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        link := OLD;
+    ELSE
+        link := NEW;
+    END IF;
+    UPDATE "companies_schema"."company" SET modified = NULL WHERE id = link.company_id;
+    UPDATE "companies_schema"."equipment" SET modified = NULL WHERE id = link.equipment_id;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql
+'''
+
+
+def _table_triggers(table: str) -> list:
+    return [
+        f'''CREATE TRIGGER "{table}_stamp_modified"
+        BEFORE INSERT OR UPDATE ON "companies_schema"."{table}"
+        FOR EACH ROW EXECUTE FUNCTION "companies_schema"."stamp_modified"()''',
+        f'''CREATE TRIGGER "{table}_record_deletion"
+        AFTER DELETE ON "companies_schema"."{table}"
+        FOR EACH ROW EXECUTE FUNCTION "companies_schema"."record_deletion"('{table}')''',
+    ]
+
+
+TRIGGERS = [
+    STAMP_MODIFIED,
+    RECORD_DELETION,
+    TOUCH_LINKED,
+    *(trigger for table in SYNCED_TABLES for trigger in _table_triggers(table)),
+    '''CREATE TRIGGER "company_equipment_touch_linked"
+    AFTER INSERT OR DELETE ON "companies_schema"."company_equipment"
+    FOR EACH ROW EXECUTE FUNCTION "companies_schema"."touch_linked"()''',
+]
+DROP_TRIGGERS = [
+    'DROP TRIGGER "company_equipment_touch_linked" ON "companies_schema"."company_equipment"',
+    *(
+        f'DROP TRIGGER "{table}_{name}" ON "companies_schema"."{table}"'
+        for table in SYNCED_TABLES
+        for name in ('stamp_modified', 'record_deletion')
+    ),
+    'DROP FUNCTION "companies_schema"."touch_linked"()',
+    'DROP FUNCTION "companies_schema"."record_deletion"()',
+    'DROP FUNCTION "companies_schema"."stamp_modified"()',
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies_app', '0012_review_modified_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tombstone',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('model', models.TextField(verbose_name='model')),
+                ('object_id', models.UUIDField(verbose_name='object id')),
+                ('deleted', models.DateTimeField(default=companies_app.models.get_datetime, verbose_name='deleted')),
+            ],
+            options={
+                'verbose_name': 'tombstone',
+                'verbose_name_plural': 'tombstones',
+                'db_table': '"companies_schema"."tombstone"',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='company',
+            index=models.Index(fields=['modified'], name='company_modified_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='equipment',
+            index=models.Index(fields=['modified'], name='equipment_modified_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['modified'], name='review_modified_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tombstone',
+            index=models.Index(fields=['model', 'deleted'], name='tombstone_model_deleted_idx'),
+        ),
+        migrations.RunSQL(TRIGGERS, DROP_TRIGGERS),
+    ]
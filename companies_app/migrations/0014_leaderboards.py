@@ -0,0 +1,102 @@
+# Generated by Django 5.0.6 on 2026-10-18 10:37
+
+import companies_app.models
+import django.db.models.deletion
+import uuid
+from datetime import datetime, time, timedelta
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+
+# Rankings of the existing reviews, as computed by leaderboards.rebuild_rankings at this version.
+REBUILD_PRIOR_SQL = '''
+    INSERT INTO "companies_schema"."ranking_prior" (id, mean, rebuilt)
+    SELECT gen_random_uuid(), AVG(rating)::double precision, statement_timestamp()
+    FROM "companies_schema"."review"
+    WHERE equipment_id IS NOT NULL
+'''
+
+REBUILD_RANKINGS_SQL = '''
+    WITH stats AS (
+        SELECT
+            equipment_id,
+            COUNT(*) AS rating_count,
+            SUM(rating) AS rating_sum,
+            COUNT(*) FILTER (WHERE created >= %(week_start)s) AS week_reviews
+        FROM "companies_schema"."review"
+        WHERE equipment_id IS NOT NULL
+        GROUP BY equipment_id
+    ), totals AS (
+        SELECT
+            equipment.id AS equipment_id,
+            COALESCE(stats.rating_count, 0) AS rating_count,
+            COALESCE(stats.rating_sum, 0) AS rating_sum,
+            COALESCE(stats.week_reviews, 0) AS week_reviews
+        FROM "companies_schema"."equipment" AS equipment
+        LEFT JOIN stats ON stats.equipment_id = equipment.id
+    )
+    INSERT INTO "companies_schema"."equipment_ranking"
+        (id, equipment_id, rating_count, rating_sum, score, week, week_reviews)
+    SELECT
+        gen_random_uuid(), equipment_id, rating_count, rating_sum,
+        (
+            %(prior_weight)s
+            * COALESCE((SELECT mean FROM "companies_schema"."ranking_prior" LIMIT 1), 3.0)
+            + rating_sum
+        ) / NULLIF(%(prior_weight)s + rating_count, 0),
+        %(week)s, week_reviews
+    FROM totals
+'''
+
+
+def rebuild_leaderboards(apps, schema_editor):
+    today = timezone.localdate()
+    week = today - timedelta(days=today.weekday())
+    schema_editor.execute(REBUILD_PRIOR_SQL)
+    schema_editor.execute(REBUILD_RANKINGS_SQL, {
+        'prior_weight': settings.LEADERBOARD_PRIOR_WEIGHT,
+        'week': week,
+        'week_start': timezone.make_aware(datetime.combine(week, time.min)),
+    })
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies_app', '0013_changes_feed'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RankingPrior',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('mean', models.FloatField(blank=True, null=True, verbose_name='mean rating')),
+                ('rebuilt', models.DateTimeField(default=companies_app.models.get_datetime, verbose_name='rebuilt')),
+            ],
+            options={
+                'verbose_name': 'ranking prior',
+                'verbose_name_plural': 'ranking priors',
+                'db_table': '"companies_schema"."ranking_prior"',
+            },
+        ),
+        migrations.CreateModel(
+            name='EquipmentRanking',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('rating_count', models.IntegerField(default=0, verbose_name='rating count')),
+                ('rating_sum', models.IntegerField(default=0, verbose_name='rating sum')),
+                ('score', models.FloatField(blank=True, null=True, verbose_name='score')),
+                ('week', models.DateField(verbose_name='week')),
+                ('week_reviews', models.IntegerField(default=0, verbose_name='reviews of the week')),
+                ('equipment', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='ranking', to='companies_app.equipment', verbose_name='equipment')),
+            ],
+            options={
+                'verbose_name': 'equipment ranking',
+                'verbose_name_plural': 'equipment rankings',
+                'db_table': '"companies_schema"."equipment_ranking"',
+                'indexes': [models.Index(fields=['-score', '-rating_count', 'equipment'], name='ranking_top_rated_idx'), models.Index(fields=['week', '-week_reviews', '-score', 'equipment'], name='ranking_trending_idx')],
+            },
+        ),
+        migrations.RunPython(rebuild_leaderboards, migrations.RunPython.noop),
+    ]
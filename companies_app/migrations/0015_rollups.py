@@ -0,0 +1,119 @@
+# Generated by Django 5.0.6 on 2026-10-18 10:46
+
+from django.db import migrations, models
+
+# Views of create_companies_rollups.sql at this version, see companies_app.rollups.
+COMPANY_STATS = '''
+CREATE MATERIALIZED VIEW IF NOT EXISTS companies_schema.company_stats AS
+WITH equipment_reviews AS (
+    SELECT equipment_id, COUNT(*) AS review_count, SUM(rating) AS rating_sum
+    FROM companies_schema.review
+    WHERE equipment_id IS NOT NULL
+    GROUP BY equipment_id
+)
+SELECT
+    company.id,
+    company.id AS company_id,
+    COUNT(link.equipment_id) AS equipment_count,
+    COALESCE(SUM(equipment_reviews.review_count), 0) AS review_count,
+    SUM(equipment_reviews.rating_sum)::double precision
+        / NULLIF(SUM(equipment_reviews.review_count), 0) AS rating_mean,
+    statement_timestamp() AS refreshed
+FROM companies_schema.company AS company
+LEFT JOIN companies_schema.company_equipment AS link ON link.company_id = company.id
+LEFT JOIN equipment_reviews ON equipment_reviews.equipment_id = link.equipment_id
+GROUP BY company.id
+'''
+
+COMPANY_STATS_INDEX = '''
+CREATE UNIQUE INDEX IF NOT EXISTS company_stats_id_idx ON companies_schema.company_stats (id)
+'''
+
+COMPANY_STATS_COMPANY_INDEX = '''
+CREATE UNIQUE INDEX IF NOT EXISTS company_stats_company_id_idx
+    ON companies_schema.company_stats (company_id)
+'''
+
+CATEGORY_STATS = '''
+CREATE MATERIALIZED VIEW IF NOT EXISTS companies_schema.category_stats AS
+WITH equipment_reviews AS (
+    SELECT equipment_id, COUNT(*) AS review_count, SUM(rating) AS rating_sum
+    FROM companies_schema.review
+    WHERE equipment_id IS NOT NULL
+    GROUP BY equipment_id
+), category_companies AS (
+    SELECT equipment.category_id, COUNT(DISTINCT link.company_id) AS company_count
+    FROM companies_schema.equipment AS equipment
+    JOIN companies_schema.company_equipment AS link ON link.equipment_id = equipment.id
+    GROUP BY equipment.category_id
+)
+SELECT
+    category.id,
+    category.id AS category_id,
+    COUNT(equipment.id) AS equipment_count,
+    COALESCE(MAX(category_companies.company_count), 0) AS company_count,
+    COALESCE(SUM(equipment_reviews.review_count), 0) AS review_count,
+    SUM(equipment_reviews.rating_sum)::double precision
+        / NULLIF(SUM(equipment_reviews.review_count), 0) AS rating_mean,
+    statement_timestamp() AS refreshed
+FROM companies_schema.category AS category
+LEFT JOIN companies_schema.equipment AS equipment ON equipment.category_id = category.id
+LEFT JOIN equipment_reviews ON equipment_reviews.equipment_id = equipment.id
+LEFT JOIN category_companies ON category_companies.category_id = category.id
+GROUP BY category.id
+'''
+
+CATEGORY_STATS_INDEX = '''
+CREATE UNIQUE INDEX IF NOT EXISTS category_stats_id_idx ON companies_schema.category_stats (id)
+'''
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies_app', '0014_leaderboards'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            [COMPANY_STATS, COMPANY_STATS_INDEX, COMPANY_STATS_COMPANY_INDEX],
+            'DROP MATERIALIZED VIEW IF EXISTS companies_schema.company_stats',
+        ),
+        migrations.RunSQL(
+            [CATEGORY_STATS, CATEGORY_STATS_INDEX],
+            'DROP MATERIALIZED VIEW IF EXISTS companies_schema.category_stats',
+        ),
+        migrations.CreateModel(
+            name='CategoryStats',
+            fields=[
+                ('id', models.UUIDField(primary_key=True, serialize=False)),
+                ('equipment_count', models.IntegerField(verbose_name='equipment count')),
+                ('company_count', models.IntegerField(verbose_name='company count')),
+                ('review_count', models.IntegerField(verbose_name='review count')),
+                ('rating_mean', models.FloatField(null=True, verbose_name='rating mean')),
+                ('refreshed', models.DateTimeField(verbose_name='refreshed')),
+            ],
+            options={
+                'verbose_name': 'category statistics',
+                'verbose_name_plural': 'category statistics',
+                'db_table': '"companies_schema"."category_stats"',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='CompanyStats',
+            fields=[
+                ('id', models.UUIDField(primary_key=True, serialize=False)),
+                ('equipment_count', models.IntegerField(verbose_name='equipment count')),
+                ('review_count', models.IntegerField(verbose_name='review count')),
+                ('rating_mean', models.FloatField(null=True, verbose_name='rating mean')),
+                ('refreshed', models.DateTimeField(verbose_name='refreshed')),
+            ],
+            options={
+                'verbose_name': 'company statistics',
+                'verbose_name_plural': 'company statistics',
+                'db_table': '"companies_schema"."company_stats"',
+                'managed': False,
+            },
+        ),
+    ]
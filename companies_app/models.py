@@ -3,12 +3,18 @@ from datetime import datetime, timezone
 from uuid import uuid4
 
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVector
 from django.core.exceptions import ValidationError
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.db import models
+from django.db.models.functions import Upper
 from django.utils.translation import gettext_lazy as _
 
 
+SEARCH_CONFIG = 'simple'
+
+
 def get_datetime() -> datetime:
     return datetime.now(timezone.utc)
 
@@ -58,6 +64,13 @@ class ModifiedMixin(models.Model):
         default=get_datetime, validators=[check_modified],
     )
 
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            self.modified = get_datetime()
+            if kwargs.get('update_fields') is not None:
+                kwargs['update_fields'] = {*kwargs['update_fields'], 'modified'}
+        super().save(*args, **kwargs)
+
     class Meta:
         abstract = True
 
@@ -67,7 +80,7 @@ class Company(UUIDMixin, CreatedMixin, ModifiedMixin):
     phone = models.TextField(_('phone'), null=False, blank=False, validators=[check_valid_phone])
     address = models.ForeignKey('Address', on_delete=models.CASCADE, verbose_name=_('adress'), null=True, blank=True)
     equipments = models.ManyToManyField('Equipment', verbose_name=_('equipments'), through='CompanyEquipment')
-    client = models.ForeignKey('Client', on_delete=models.CASCADE, null=True, blank=False)
+    client = models.ForeignKey('Client', on_delete=models.CASCADE, null=True, blank=False, db_index=False)
 
     def __str__(self):
         return f'{self.title}: {self.phone} '
@@ -75,6 +88,16 @@ class Company(UUIDMixin, CreatedMixin, ModifiedMixin):
     class Meta:
         db_table = '"companies_schema"."company"'
         ordering = ['title', 'phone', 'address']
+        indexes = [
+            models.Index(fields=['title', 'phone', 'id'], name='company_keyset_idx'),
+            models.Index(fields=['client', 'title', 'phone'], include=['id'], name='company_client_idx'),
+            GinIndex(SearchVector('title', config=SEARCH_CONFIG), name='company_search_idx'),
+            models.Index(
+                models.F('client'), OpClass(Upper('title'), name='text_pattern_ops'),
+                name='company_client_prefix_idx',
+            ),
+            models.Index(fields=['modified'], name='company_modified_idx'),
+        ]
         verbose_name = _('company')
         verbose_name_plural = _('companies')
 
@@ -92,6 +115,9 @@ class Address(CreatedMixin, ModifiedMixin, UUIDMixin):
     class Meta:
         db_table = '"companies_schema"."address"'
         ordering = ['street_name', 'city', 'state', 'house_number']
+        indexes = [
+            GinIndex(SearchVector('city', 'street_name', config=SEARCH_CONFIG), name='address_search_idx'),
+        ]
         verbose_name = _('address')
         verbose_name_plural = _('addresses')
 
@@ -115,7 +141,19 @@ class Equipment(UUIDMixin, CreatedMixin, ModifiedMixin):
     category = models.ForeignKey('Category', on_delete=models.CASCADE, verbose_name=_('category'),
                                  related_name='equipments', null=True, blank=False)
     companies = models.ManyToManyField('Company', verbose_name=_('companies'), through='CompanyEquipment')
-    client = models.ForeignKey('Client', on_delete=models.CASCADE, null=True, blank=False)
+    client = models.ForeignKey('Client', on_delete=models.CASCADE, null=True, blank=False, db_index=False)
+    rating_count = models.PositiveIntegerField(_('rating count'), default=0, editable=False)
+    rating_sum = models.PositiveIntegerField(_('rating sum'), default=0, editable=False)
+    rating_mean = models.FloatField(_('rating mean'), null=True, blank=True, editable=False)
+    rating_1 = models.PositiveIntegerField(_('ratings of 1'), default=0, editable=False)
+    rating_2 = models.PositiveIntegerField(_('ratings of 2'), default=0, editable=False)
+    rating_3 = models.PositiveIntegerField(_('ratings of 3'), default=0, editable=False)
+    rating_4 = models.PositiveIntegerField(_('ratings of 4'), default=0, editable=False)
+    rating_5 = models.PositiveIntegerField(_('ratings of 5'), default=0, editable=False)
+
+    @property
+    def rating_histogram(self) -> dict:
+        return {rating: getattr(self, f'rating_{rating}') for rating in range(1, 6)}
 
     def __str__(self):
         return f'{self.category}: {self.title}, {self.size}'
@@ -123,6 +161,12 @@ class Equipment(UUIDMixin, CreatedMixin, ModifiedMixin):
     class Meta:
         db_table = '"companies_schema"."equipment"'
         ordering = ['title', 'size']
+        indexes = [
+            models.Index(fields=['title', 'size', 'id'], name='equipment_keyset_idx'),
+            models.Index(fields=['client', 'title', 'size'], include=['id'], name='equipment_client_idx'),
+            GinIndex(SearchVector('title', config=SEARCH_CONFIG), name='equipment_search_idx'),
+            models.Index(fields=['modified'], name='equipment_modified_idx'),
+        ]
         verbose_name = _('equipment')
         verbose_name_plural = _('equipments')
 
@@ -136,8 +180,9 @@ class Review(UUIDMixin, CreatedMixin, ModifiedMixin):
         null=False,
         blank=False)
 
-    client = models.ForeignKey('Client', on_delete=models.CASCADE, null=True, blank=False)
-    equipment = models.ForeignKey('Equipment', on_delete=models.CASCADE, null=True, blank=False, related_name='reviews')
+    client = models.ForeignKey('Client', on_delete=models.CASCADE, null=True, blank=False, db_index=False)
+    equipment = models.ForeignKey('Equipment', on_delete=models.CASCADE, null=True, blank=False, related_name='reviews',
+                                  db_index=False)
 
     def __str__(self):
         return f'{self.text}: {self.rating}'
@@ -147,11 +192,18 @@ class Review(UUIDMixin, CreatedMixin, ModifiedMixin):
         verbose_name_plural = _('reviews')
         verbose_name = _('reviews')
         ordering = ['text', 'rating']
+        indexes = [
+            models.Index(fields=['equipment', 'text', 'rating'], include=['id'], name='review_equipment_idx'),
+            models.Index(fields=['client', 'text', 'rating'], include=['id'], name='review_client_idx'),
+            models.Index(fields=['equipment', 'modified'], name='review_equipment_modified_idx'),
+            GinIndex(SearchVector('text', config=SEARCH_CONFIG), name='review_search_idx'),
+            models.Index(fields=['modified'], name='review_modified_idx'),
+        ]
 
 
 class CompanyEquipment(UUIDMixin, CreatedMixin):
-    company = models.ForeignKey(Company, verbose_name=_('company'), on_delete=models.CASCADE)
-    equipment = models.ForeignKey(Equipment, verbose_name=_('equipment'), on_delete=models.CASCADE)
+    company = models.ForeignKey(Company, verbose_name=_('company'), on_delete=models.CASCADE, db_index=False)
+    equipment = models.ForeignKey(Equipment, verbose_name=_('equipment'), on_delete=models.CASCADE, db_index=False)
 
     def __str__(self):
         return f'{self.company} - {self.equipment}'
@@ -159,6 +211,9 @@ class CompanyEquipment(UUIDMixin, CreatedMixin):
     class Meta:
         db_table = '"companies_schema"."company_equipment"'
         unique_together = (('company', 'equipment'),)
+        indexes = [
+            models.Index(fields=['equipment', 'company'], name='company_equipment_reverse_idx'),
+        ]
         verbose_name = _('relation Company Equipment')
         verbose_name_plural = _('relation Company Equipment')
 
@@ -189,3 +244,99 @@ class Client(UUIDMixin, ModifiedMixin, CreatedMixin):
         db_table = '"companies_schema"."client"'
         verbose_name = _('client')
         verbose_name_plural = _('client')
+
+
+class Tombstone(UUIDMixin):
+    model = models.TextField(_('model'))
+    object_id = models.UUIDField(_('object id'))
+    deleted = models.DateTimeField(_('deleted'), default=get_datetime)
+
+    def __str__(self) -> str:
+        return f'{self.model} {self.object_id}'
+
+    class Meta:
+        db_table = '"companies_schema"."tombstone"'
+        indexes = [
+            models.Index(fields=['model', 'deleted'], name='tombstone_model_deleted_idx'),
+        ]
+        verbose_name = _('tombstone')
+        verbose_name_plural = _('tombstones')
+
+
+class EquipmentRanking(UUIDMixin):
+    equipment = models.OneToOneField(
+        Equipment, verbose_name=_('equipment'), on_delete=models.CASCADE, related_name='ranking',
+    )
+    rating_count = models.IntegerField(_('rating count'), default=0)
+    rating_sum = models.IntegerField(_('rating sum'), default=0)
+    score = models.FloatField(_('score'), null=True, blank=True)
+    week = models.DateField(_('week'))
+    week_reviews = models.IntegerField(_('reviews of the week'), default=0)
+
+    def __str__(self) -> str:
+        return f'{self.equipment_id}: {self.score}'
+
+    class Meta:
+        db_table = '"companies_schema"."equipment_ranking"'
+        indexes = [
+            models.Index(fields=['-score', '-rating_count', 'equipment'], name='ranking_top_rated_idx'),
+            models.Index(
+                fields=['week', '-week_reviews', '-score', 'equipment'], name='ranking_trending_idx',
+            ),
+        ]
+        verbose_name = _('equipment ranking')
+        verbose_name_plural = _('equipment rankings')
+
+
+class RankingPrior(UUIDMixin):
+    mean = models.FloatField(_('mean rating'), null=True, blank=True)
+    rebuilt = models.DateTimeField(_('rebuilt'), default=get_datetime)
+
+    def __str__(self) -> str:
+        return f'{self.mean}'
+
+    class Meta:
+        db_table = '"companies_schema"."ranking_prior"'
+        verbose_name = _('ranking prior')
+        verbose_name_plural = _('ranking priors')
+
+
+class CompanyStats(models.Model):
+    id = models.UUIDField(primary_key=True)
+    company = models.OneToOneField(
+        Company, verbose_name=_('company'), on_delete=models.DO_NOTHING, related_name='stats',
+    )
+    equipment_count = models.IntegerField(_('equipment count'))
+    review_count = models.IntegerField(_('review count'))
+    rating_mean = models.FloatField(_('rating mean'), null=True)
+    refreshed = models.DateTimeField(_('refreshed'))
+
+    def __str__(self) -> str:
+        return f'{self.company_id}: {self.equipment_count}, {self.review_count}'
+
+    class Meta:
+        managed = False
+        db_table = '"companies_schema"."company_stats"'
+        verbose_name = _('company statistics')
+        verbose_name_plural = _('company statistics')
+
+
+class CategoryStats(models.Model):
+    id = models.UUIDField(primary_key=True)
+    category = models.OneToOneField(
+        Category, verbose_name=_('category'), on_delete=models.DO_NOTHING, related_name='stats',
+    )
+    equipment_count = models.IntegerField(_('equipment count'))
+    company_count = models.IntegerField(_('company count'))
+    review_count = models.IntegerField(_('review count'))
+    rating_mean = models.FloatField(_('rating mean'), null=True)
+    refreshed = models.DateTimeField(_('refreshed'))
+
+    def __str__(self) -> str:
+        return f'{self.category_id}: {self.equipment_count}, {self.review_count}'
+
+    class Meta:
+        managed = False
+        db_table = '"companies_schema"."category_stats"'
+        verbose_name = _('category statistics')
+        verbose_name_plural = _('category statistics')
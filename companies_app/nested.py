@@ -0,0 +1,137 @@
+"""
+Read-only nested representations of equipment and companies.
+
+An equipment comes with its category, its aggregated rating, its most recent
+reviews and its companies; a company with its address and its equipment.
+The querysets load every nested list with a Prefetch of a sliced queryset,
+which Django runs as one query per relation keeping the first rows of each
+parent with a window function, so a page of N objects costs a fixed number of
+queries and the nested lists stay bounded however many rows a parent has.
+"""
+from django.db.models import Count, Prefetch
+from rest_framework import serializers
+
+from .models import Company, Equipment, Review
+from .serializers import AddressSerializer, CategorySerializer
+
+RECENT_REVIEWS = 5
+LISTED_COMPANIES = 20
+LISTED_EQUIPMENT = 20
+
+
+class ReviewSummarySerializer(serializers.ModelSerializer):
+    """Review nested into its equipment, with the name of its author."""
+
+    username = serializers.CharField(source='client.user.username', read_only=True)
+
+    class Meta:
+        """Meta class."""
+
+        model = Review
+        fields = ('id', 'text', 'rating', 'created', 'username')
+
+
+class CompanySummarySerializer(serializers.ModelSerializer):
+    """Company nested into its equipment."""
+
+    class Meta:
+        """Meta class."""
+
+        model = Company
+        fields = ('id', 'title', 'phone')
+
+
+class EquipmentSummarySerializer(serializers.ModelSerializer):
+    """Equipment nested into its company."""
+
+    category = serializers.CharField(source='category.title', default=None, read_only=True)
+
+    class Meta:
+        """Meta class."""
+
+        model = Equipment
+        fields = ('id', 'title', 'size', 'category', 'rating_count', 'rating_mean')
+
+
+class EquipmentDetailSerializer(serializers.ModelSerializer):
+    """Equipment with its category, rating, recent reviews and companies."""
+
+    category = CategorySerializer(read_only=True)
+    rating = serializers.SerializerMethodField(method_name='rating_summary')
+    recent_reviews = ReviewSummarySerializer(many=True, read_only=True)
+    companies = CompanySummarySerializer(many=True, read_only=True, source='listed_companies')
+    companies_count = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        """Meta class."""
+
+        model = Equipment
+        fields = (
+            'id', 'title', 'size', 'created', 'modified', 'category', 'rating',
+            'recent_reviews', 'companies', 'companies_count',
+        )
+
+    def rating_summary(self, equipment) -> dict:
+        """
+        Return the aggregated rating kept up to date on the equipment row.
+
+        Args:
+            equipment: Serialized equipment.
+
+        Returns:
+            dict: Number of reviews, mean rating and number of reviews by rating.
+        """
+        return {
+            'count': equipment.rating_count,
+            'mean': equipment.rating_mean,
+            'histogram': equipment.rating_histogram,
+        }
+
+
+class CompanyDetailSerializer(serializers.ModelSerializer):
+    """Company with its address and equipment."""
+
+    address = AddressSerializer(read_only=True)
+    equipment = EquipmentSummarySerializer(many=True, read_only=True, source='listed_equipment')
+    equipment_count = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        """Meta class."""
+
+        model = Company
+        fields = (
+            'id', 'title', 'phone', 'created', 'modified', 'address', 'equipment',
+            'equipment_count',
+        )
+
+
+def equipment_details():
+    """
+    Build the queryset of EquipmentDetailSerializer.
+
+    Returns:
+        QuerySet: Equipment with their category, recent reviews and companies loaded.
+    """
+    recent_reviews = Review.objects.select_related('client__user').order_by('-created', 'id')
+    companies = Company.objects.order_by('title', 'id')
+    return Equipment.objects.select_related('category').annotate(
+        companies_count=Count('companyequipment'),
+    ).prefetch_related(
+        Prefetch('reviews', recent_reviews[:RECENT_REVIEWS], to_attr='recent_reviews'),
+        Prefetch('companies', companies[:LISTED_COMPANIES], to_attr='listed_companies'),
+    )
+
+
+def company_details():
+    """
+    Build the queryset of CompanyDetailSerializer.
+
+    Returns:
+        QuerySet: Companies with their address and equipment loaded.
+    """
+    equipment = Equipment.objects.select_related('category').order_by('title', 'id')
+    return Company.objects.select_related('address').annotate(
+        equipment_count=Count('companyequipment'),
+    ).prefetch_related(
+        Prefetch('equipments', equipment[:LISTED_EQUIPMENT], to_attr='listed_equipment'),
+    )
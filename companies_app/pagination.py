@@ -0,0 +1,270 @@
+"""
+Keyset pagination for the HTML list pages and the API.
+
+Pages are addressed by opaque cursors holding the ordering key of the row at
+the page boundary, so fetching any page is an index range scan of page size
+rows instead of an OFFSET scan over every preceding row.
+"""
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as BinasciiError
+from functools import partial, reduce
+from operator import and_, or_
+
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ValidationError
+from django.db import models
+from django.utils.functional import SimpleLazyObject
+from rest_framework.pagination import CursorPagination
+
+PAGE_SIZE = 25
+API_PAGE_SIZE = 50
+API_MAX_PAGE_SIZE = 500
+TIE_BREAKER = 'id'
+DIRECTION_NEXT = 'next'
+DIRECTION_PREVIOUS = 'previous'
+
+
+def encode_cursor(direction: str, key: list) -> str:
+    """
+    Encode a page boundary into an opaque cursor.
+
+    Args:
+        direction (str): Direction to read in from the boundary.
+        key (list): Ordering key values of the boundary row.
+
+    Returns:
+        str: URL-safe cursor.
+    """
+    payload = json.dumps([direction, key], default=str, separators=(',', ':'))
+    return urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str):
+    """
+    Decode a cursor built by encode_cursor.
+
+    Args:
+        cursor (str): URL-safe cursor.
+
+    Returns:
+        tuple | None: Direction and key values, None for a missing or malformed cursor.
+    """
+    if not cursor:
+        return None
+    padding = '=' * (-len(cursor) % 4)
+    try:
+        direction, key = json.loads(urlsafe_b64decode(f'{cursor}{padding}'.encode()))
+    except (BinasciiError, TypeError, ValueError):
+        return None
+    if direction not in {DIRECTION_NEXT, DIRECTION_PREVIOUS} or not isinstance(key, list):
+        return None
+    return direction, key
+
+
+class KeysetPage:
+    """A page of rows with cursors to the neighbouring pages."""
+
+    def __init__(self, rows, next_cursor=None, previous_cursor=None):
+        """
+        Initialize the page.
+
+        Args:
+            rows (list): Rows of the page.
+            next_cursor (str): Cursor to the next page, None on the last one.
+            previous_cursor (str): Cursor to the previous page, None on the first one.
+        """
+        self.rows = rows
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        """
+        Iterate over the rows of the page.
+
+        Returns:
+            iterator: Iterator over the rows.
+        """
+        return iter(self.rows)
+
+    def __len__(self):
+        """
+        Return the number of rows on the page.
+
+        Returns:
+            int: Number of rows.
+        """
+        return len(self.rows)
+
+    @property
+    def has_other_pages(self) -> bool:
+        """
+        Check whether the page has neighbours.
+
+        Returns:
+            bool: True if there is a next or a previous page.
+        """
+        return bool(self.next_cursor or self.previous_cursor)
+
+
+class KeysetPaginator:
+    """
+    Paginate a queryset by its ordering key.
+
+    The key is a tuple of model fields with the primary key appended as tie-breaker.
+    NULL values of nullable fields sort last, like PostgreSQL does for ascending indexes.
+    """
+
+    def __init__(self, queryset, ordering, page_size=PAGE_SIZE):
+        """
+        Initialize the paginator.
+
+        Args:
+            queryset (QuerySet): Queryset to paginate.
+            ordering (tuple): Names of the ascending ordering fields.
+            page_size (int): Number of rows per page.
+        """
+        self.queryset = queryset
+        self.fields = [queryset.model._meta.get_field(name) for name in ordering]  # noqa: WPS437
+        self.fields.append(queryset.model._meta.get_field(TIE_BREAKER))  # noqa: WPS437
+        self.page_size = page_size
+
+    def page(self, cursor=None) -> KeysetPage:
+        """
+        Fetch the page addressed by a cursor.
+
+        Args:
+            cursor (str): Cursor from a previous page, None for the first page.
+
+        Returns:
+            KeysetPage: The requested page.
+        """
+        decoded = decode_cursor(cursor)
+        if decoded is None or len(decoded[1]) != len(self.fields):
+            return self._first_page()
+        direction, key = decoded
+        key = _typed_key(self.fields, key)
+        if key is None:
+            return self._first_page()
+        forward = direction == DIRECTION_NEXT
+        rows = self._fetch(self._boundary(key, forward), forward)
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if not rows:
+            return self._first_page()
+        if not forward:
+            rows.reverse()
+        page = KeysetPage(rows)
+        if has_more or not forward:
+            page.next_cursor = self._cursor(DIRECTION_NEXT, rows[-1])
+        if has_more or forward:
+            page.previous_cursor = self._cursor(DIRECTION_PREVIOUS, rows[0])
+        return page
+
+    async def apage(self, cursor=None) -> KeysetPage:
+        """
+        Fetch the page addressed by a cursor from async code.
+
+        Like the async methods of QuerySet, the page is fetched in a thread through sync_to_async.
+
+        Args:
+            cursor (str): Cursor from a previous page, None for the first page.
+
+        Returns:
+            KeysetPage: The requested page.
+        """
+        return await sync_to_async(self.page)(cursor)
+
+    def _first_page(self) -> KeysetPage:
+        rows = self._fetch(models.Q(), forward=True)
+        if len(rows) <= self.page_size:
+            return KeysetPage(rows)
+        rows = rows[:self.page_size]
+        return KeysetPage(rows, next_cursor=self._cursor(DIRECTION_NEXT, rows[-1]))
+
+    def _fetch(self, condition: models.Q, forward: bool) -> list:
+        if forward:
+            ordering = [models.F(field.attname).asc(nulls_last=True) for field in self.fields]
+        else:
+            ordering = [models.F(field.attname).desc(nulls_first=True) for field in self.fields]
+        return list(self.queryset.filter(condition).order_by(*ordering)[:self.page_size + 1])
+
+    def _cursor(self, direction: str, row) -> str:
+        return encode_cursor(direction, [getattr(row, field.attname) for field in self.fields])
+
+    def _boundary(self, key: list, forward: bool) -> models.Q:
+        """
+        Build the condition selecting rows strictly beyond a key in the reading direction.
+
+        Args:
+            key (list): Ordering key values of the boundary row.
+            forward (bool): True to read rows after the key, False to read rows before it.
+
+        Returns:
+            Q: Condition over the ordering fields.
+        """
+        branches = []
+        equal_prefix = []
+        for field, key_part in zip(self.fields, key):
+            beyond = _beyond(field.attname, key_part, forward, nullable=field.null)
+            if beyond is not None:
+                branches.append(reduce(and_, equal_prefix, beyond))
+            equal_prefix.append(_equal(field.attname, key_part))
+        condition = reduce(or_, branches)
+        leading = self.fields[0]
+        if key[0] is not None and not leading.null:
+            # A redundant range on the leading column gives the planner an index range scan.
+            lookup = 'gte' if forward else 'lte'
+            condition &= models.Q(**{f'{leading.attname}__{lookup}': key[0]})
+        return condition
+
+
+def lazy_page(paginator: KeysetPaginator, cursor=None) -> SimpleLazyObject:
+    """
+    Return the page addressed by a cursor, fetched on first use.
+
+    Args:
+        paginator (KeysetPaginator): Paginator of the queryset.
+        cursor (str): Cursor from a previous page, None for the first page.
+
+    Returns:
+        SimpleLazyObject: The requested page, fetched when first read.
+    """
+    return SimpleLazyObject(partial(paginator.page, cursor))
+
+
+def _typed_key(fields: list, key: list):
+    try:
+        return [field.to_python(key_part) for field, key_part in zip(fields, key)]
+    except (ValidationError, TypeError):
+        return None
+
+
+def _equal(attname: str, key_part) -> models.Q:
+    if key_part is None:
+        return models.Q(**{f'{attname}__isnull': True})
+    return models.Q(**{attname: key_part})
+
+
+def _beyond(attname: str, key_part, forward: bool, nullable: bool):
+    if key_part is None:
+        return None if forward else models.Q(**{f'{attname}__isnull': False})
+    lookup = 'gt' if forward else 'lt'
+    condition = models.Q(**{f'{attname}__{lookup}': key_part})
+    if forward and nullable:
+        condition |= models.Q(**{f'{attname}__isnull': True})
+    return condition
+
+
+class APICursorPagination(CursorPagination):
+    """
+    Cursor pagination for the API viewsets.
+
+    Rows are ordered by the primary key, which is unique and indexed, so a cursor
+    never skips or repeats rows. Clients pick a page size up to API_MAX_PAGE_SIZE.
+    """
+
+    page_size = API_PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = API_MAX_PAGE_SIZE
+    ordering = TIE_BREAKER
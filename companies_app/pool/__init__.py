@@ -0,0 +1,11 @@
+"""
+PostgreSQL backend sharing a pool of open connections between the threads of a process.
+
+Selected with ENGINE 'companies_app.pool' and configured by the 'pool'
+dictionary of OPTIONS: max_size open connections, idle_timeout seconds before
+an idle connection is closed and timeout seconds a request waits for a free
+connection. With CONN_MAX_AGE=0, Django returns the connection to the pool at
+the end of every request instead of closing it, saving the connection
+handshake of the next request. Checkouts, waits and timeouts are counted by
+every pool, see companies_app.pool.pools.pool_stats.
+"""
@@ -0,0 +1,84 @@
+"""PostgreSQL backend taking its connections from a ConnectionPool."""
+from functools import partial
+
+from django.db.backends.postgresql import base, creation
+from django.db.backends.postgresql.psycopg_any import IsolationLevel
+
+from .pools import close_pools, get_pool
+
+POOL_OPTION = 'pool'
+
+
+class DatabaseCreation(creation.DatabaseCreation):
+    """Test database creation closing the pooled connections before dropping the database."""
+
+    def destroy_test_db(self, *args, **kwargs):
+        """
+        Destroy the test database once no pooled connection uses it.
+
+        Args:
+            args: Arguments of DatabaseCreation.destroy_test_db.
+            kwargs: Keyword arguments of DatabaseCreation.destroy_test_db.
+        """
+        close_pools()
+        super().destroy_test_db(*args, **kwargs)
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """PostgreSQL connection returned to its pool when Django closes it."""
+
+    creation_class = DatabaseCreation
+
+    @property
+    def pool(self):
+        """
+        Return the pool of the database.
+
+        Returns:
+            ConnectionPool: Pool configured by the 'pool' option.
+        """
+        settings_dict = self.settings_dict
+        key = (
+            self.alias,
+            settings_dict['HOST'],
+            settings_dict['PORT'],
+            settings_dict['NAME'],
+            settings_dict['USER'],
+        )
+        return get_pool(key, settings_dict['OPTIONS'].get(POOL_OPTION, {}))
+
+    def get_connection_params(self) -> dict:
+        """
+        Return the arguments of psycopg2.connect, without the pool options.
+
+        Returns:
+            dict: Connection arguments.
+        """
+        conn_params = super().get_connection_params()
+        conn_params.pop(POOL_OPTION, None)
+        return conn_params
+
+    def get_new_connection(self, conn_params):
+        """
+        Take a connection from the pool, opening one if none is idle.
+
+        Args:
+            conn_params (dict): Connection arguments.
+
+        Returns:
+            Open connection.
+        """
+        db_connection = self.pool.checkout(partial(super().get_new_connection, conn_params))
+        self.isolation_level = IsolationLevel(
+            self.settings_dict['OPTIONS'].get('isolation_level', IsolationLevel.READ_COMMITTED),
+        )
+        return db_connection
+
+    def _close(self):
+        if self.connection is None:
+            return
+        if self.in_atomic_block:
+            self.pool.discard(self.connection)
+            return
+        with self.wrap_database_errors:
+            self.pool.checkin(self.connection)
@@ -0,0 +1,222 @@
+"""Thread-safe pools of open psycopg2 connections."""
+import threading
+from collections import deque
+from time import monotonic
+
+import psycopg2
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
+
+MAX_SIZE = 10
+IDLE_TIMEOUT = 300
+TIMEOUT = 5
+# Seconds of idleness after which a connection is checked with a query before reuse.
+HEALTH_CHECK_AFTER = 10
+MILLISECONDS = 1000
+# Waits count every sleep of a checkout until a connection is returned.
+COUNTERS = ('checkouts', 'created', 'reused', 'waits', 'timeouts', 'expired', 'discarded')
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+class ConnectionPool:
+    """Bounded pool of connections, reusing the most recently returned one first."""
+
+    def __init__(self, max_size=MAX_SIZE, idle_timeout=IDLE_TIMEOUT, timeout=TIMEOUT):
+        """
+        Initialize an empty pool.
+
+        Args:
+            max_size (int): Maximal number of open connections.
+            idle_timeout (float): Seconds before an idle connection is closed.
+            timeout (float): Seconds a checkout waits for a free connection.
+        """
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        self.counters = dict.fromkeys(COUNTERS, 0)
+        self.wait_time = 0
+        self._idle = deque()
+        self._open = 0
+        self._condition = threading.Condition()
+
+    def checkout(self, connect):
+        """
+        Take an idle connection, or open one if the pool is not full, waiting for a free one.
+
+        Raises psycopg2.OperationalError if no connection was free within the timeout.
+
+        Args:
+            connect: Callable opening a new connection.
+
+        Returns:
+            Open connection.
+
+        Raises:
+            Exception: Error of connect, once the place of the connection is freed.
+        """
+        started = monotonic()
+        with self._condition:
+            self.counters['checkouts'] += 1
+            idle = self._reserve(started)
+            self.wait_time += monotonic() - started
+        if idle is None:
+            try:
+                return connect()
+            except Exception:
+                self.discard()
+                raise
+        db_connection, returned_at = idle
+        if _usable(db_connection, monotonic() - returned_at):
+            return db_connection
+        self.discard(db_connection)
+        return self.checkout(connect)
+
+    def checkin(self, db_connection):
+        """
+        Return a connection to the pool, rolling back its open transaction.
+
+        Args:
+            db_connection: Connection taken with checkout.
+        """
+        if not db_connection.closed:
+            if db_connection.get_transaction_status() != TRANSACTION_STATUS_IDLE:
+                _rollback(db_connection)
+        if db_connection.closed:
+            self.discard(db_connection)
+            return
+        with self._condition:
+            self._idle.append((db_connection, monotonic()))
+            self._condition.notify()
+
+    def discard(self, db_connection=None):
+        """
+        Close a connection taken with checkout and free its place in the pool.
+
+        Args:
+            db_connection: Connection taken with checkout, None if opening it failed.
+        """
+        if db_connection is not None:
+            db_connection.close()
+        with self._condition:
+            self._open -= 1
+            self.counters['discarded'] += 1
+            self._condition.notify()
+
+    def stats(self) -> dict:
+        """
+        Return the counters of the pool.
+
+        Returns:
+            dict: Counters, total wait in milliseconds, idle and used connections.
+        """
+        with self._condition:
+            idle = len(self._idle)
+            return {
+                **self.counters,
+                'wait_ms': round(self.wait_time * MILLISECONDS, 3),
+                'idle': idle,
+                'in_use': self._open - idle,
+            }
+
+    def close(self):
+        """Close the idle connections."""
+        with self._condition:
+            while self._idle:
+                self._idle.pop()[0].close()
+                self._open -= 1
+
+    def _reserve(self, started: float):
+        while True:
+            expired = _close_expired(self._idle, self.idle_timeout)
+            self._open -= expired
+            self.counters['expired'] += expired
+            if self._idle or self._open < self.max_size:
+                break
+            remaining = self.timeout - (monotonic() - started)
+            if remaining <= 0:
+                self.counters['timeouts'] += 1
+                raise psycopg2.OperationalError(
+                    f'No database connection was free within {self.timeout} seconds',
+                )
+            self.counters['waits'] += 1
+            self._condition.wait(remaining)
+        if self._idle:
+            self.counters['reused'] += 1
+            return self._idle.pop()
+        self._open += 1
+        self.counters['created'] += 1
+        return None
+
+
+def get_pool(key: tuple, options: dict) -> ConnectionPool:
+    """
+    Return the pool of a database, creating it on first use.
+
+    Args:
+        key (tuple): Alias, host, port, name and user of the database.
+        options (dict): Keyword arguments of ConnectionPool.
+
+    Returns:
+        ConnectionPool: Pool shared by the threads of the process.
+    """
+    with _pools_lock:
+        if key not in _pools:
+            _pools[key] = ConnectionPool(**options)
+        return _pools[key]
+
+
+def pool_stats() -> dict:
+    """
+    Return the counters of every pool of the process.
+
+    Returns:
+        dict: Stats by 'alias@host:port/name'.
+    """
+    with _pools_lock:
+        pools = list(_pools.items())
+    return {_label(*key): pool.stats() for key, pool in pools}
+
+
+def close_pools():
+    """Close the idle connections of every pool of the process."""
+    with _pools_lock:
+        pools = list(_pools.values())
+    for pool in pools:
+        pool.close()
+
+
+def _close_expired(idle: deque, idle_timeout: float) -> int:
+    expired = 0
+    while idle and _expired(*idle[0], idle_timeout):
+        idle.popleft()[0].close()
+        expired += 1
+    return expired
+
+
+def _expired(db_connection, returned_at: float, idle_timeout: float) -> bool:
+    return bool(db_connection.closed) or monotonic() - returned_at > idle_timeout
+
+
+def _usable(db_connection, idle_time: float) -> bool:
+    if db_connection.closed or idle_time < HEALTH_CHECK_AFTER:
+        return not db_connection.closed
+    try:
+        with db_connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+    except psycopg2.Error:
+        return False
+    if db_connection.get_transaction_status() != TRANSACTION_STATUS_IDLE:
+        _rollback(db_connection)
+    return not db_connection.closed
+
+
+def _rollback(db_connection):
+    try:
+        db_connection.rollback()
+    except psycopg2.Error:
+        db_connection.close()
+
+
+def _label(alias, host, port, name, user) -> str:
+    return f'{alias}@{host}:{port}/{name}'
@@ -0,0 +1,122 @@
+"""API endpoints answering queries over several models: search, autocomplete and leaderboards."""
+from uuid import UUID
+
+from django.db.models import prefetch_related_objects
+from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from .autocomplete import linkable_companies
+from .leaderboards import parse_category, top_rated, trending
+from .permissions import APIPermission
+from .search import search
+from .serializers import (
+    CompanySerializer,
+    EquipmentSerializer,
+    RankingSerializer,
+    ReviewSerializer,
+)
+
+SEARCH_SERIALIZERS = (
+    ('equipments', EquipmentSerializer, 'companies'),
+    ('companies', CompanySerializer, 'equipments'),
+    ('reviews', ReviewSerializer, None),
+)
+
+
+class SearchViewSet(viewsets.ViewSet):
+    """Full-text search over equipment, companies and reviews."""
+
+    permission_classes = [APIPermission]
+
+    def list(self, request):
+        """
+        Return ranked search results for the ?q= query.
+
+        Args:
+            request: Request object.
+
+        Returns:
+            Response: Results of each kind with their rank, best match first.
+        """
+        found = search(request.query_params.get('q', ''))
+        response_data = {}
+        for kind, serializer, many_to_many in SEARCH_SERIALIZERS:
+            if many_to_many:
+                prefetch_related_objects(found[kind], many_to_many)
+            response_data[kind] = [
+                {**serializer(instance).data, 'rank': instance.rank} for instance in found[kind]
+            ]
+        return Response(response_data)
+
+
+class CompanyAutocompleteViewSet(viewsets.ViewSet):
+    """Suggestions of the user's companies an equipment can be added to."""
+
+    permission_classes = [APIPermission]
+
+    def list(self, request):
+        """
+        Return companies whose title starts with ?q=, excluding those linked to ?equipment=.
+
+        Args:
+            request: Request object.
+
+        Returns:
+            Response: List of company IDs and titles.
+
+        Raises:
+            ValidationError: If ?equipment= is not a UUID.
+        """
+        equipment_id = request.query_params.get('equipment')
+        try:
+            equipment_id = UUID(equipment_id) if equipment_id else None
+        except ValueError:
+            raise ValidationError({'equipment': 'Must be a valid UUID.'})
+        companies = linkable_companies(
+            request.user, equipment_id, request.query_params.get('q', '').strip(),
+        )
+        return Response(list(companies.values('id', 'title')))
+
+
+class LeaderboardViewSet(viewsets.ViewSet):
+    """Top rated and trending equipment, overall or in the ?category= category."""
+
+    permission_classes = [APIPermission]
+
+    @action(detail=False, methods=['get'], url_path='top-rated')
+    def top_rated(self, request):
+        """
+        Return the equipment with the best Bayesian average rating.
+
+        Args:
+            request: Request object.
+
+        Returns:
+            Response: Rankings with their rank, best first.
+        """
+        return self._leaderboard(request, top_rated)
+
+    @action(detail=False, methods=['get'])
+    def trending(self, request):
+        """
+        Return the equipment most reviewed since Monday.
+
+        Args:
+            request: Request object.
+
+        Returns:
+            Response: Rankings with their rank, most reviewed first.
+        """
+        return self._leaderboard(request, trending)
+
+    def _leaderboard(self, request, leaderboard):
+        try:
+            category_id = parse_category(request.query_params.get('category'))
+        except ValueError:
+            raise ValidationError({'category': 'Must be a valid UUID.'})
+        rankings = RankingSerializer(leaderboard(category_id), many=True).data
+        return Response([
+            {'rank': rank, **ranking} for rank, ranking in enumerate(rankings, start=1)
+        ])
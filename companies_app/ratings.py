@@ -0,0 +1,100 @@
+"""
+Maintenance of the denormalized rating aggregates stored on Equipment.
+
+Every review write shifts the aggregates of its equipment by a single row with
+one UPDATE, so reading an average rating or a review count never touches the
+Review table. rebuild_ratings recomputes everything from scratch after bulk loads.
+"""
+from django.db import connection, models
+from django.db.models.functions import Cast, NullIf
+
+from .models import Equipment, Review
+
+RATING_VALUES = range(1, 6)
+
+REBUILD_SQL = """
+    UPDATE {equipment} AS target SET
+        rating_count = COALESCE(stats.rating_count, 0),
+        rating_sum = COALESCE(stats.rating_sum, 0),
+        rating_mean = stats.rating_mean,
+        rating_1 = COALESCE(stats.rating_1, 0),
+        rating_2 = COALESCE(stats.rating_2, 0),
+        rating_3 = COALESCE(stats.rating_3, 0),
+        rating_4 = COALESCE(stats.rating_4, 0),
+        rating_5 = COALESCE(stats.rating_5, 0)
+    FROM {equipment} AS source
+    LEFT JOIN (
+        SELECT
+            equipment_id,
+            COUNT(*) AS rating_count,
+            SUM(rating) AS rating_sum,
+            AVG(rating)::double precision AS rating_mean,
+            COUNT(*) FILTER (WHERE rating = 1) AS rating_1,
+            COUNT(*) FILTER (WHERE rating = 2) AS rating_2,
+            COUNT(*) FILTER (WHERE rating = 3) AS rating_3,
+            COUNT(*) FILTER (WHERE rating = 4) AS rating_4,
+            COUNT(*) FILTER (WHERE rating = 5) AS rating_5
+        FROM {review}
+        WHERE equipment_id IS NOT NULL
+        GROUP BY equipment_id
+    ) AS stats ON stats.equipment_id = source.id
+    WHERE target.id = source.id
+"""
+
+
+def histogram_field(rating: int) -> str:
+    """
+    Return the name of the Equipment histogram column for a rating.
+
+    Args:
+        rating (int): Review rating.
+
+    Returns:
+        str: Column name.
+    """
+    return f'rating_{rating}'
+
+
+def apply_rating(equipment_id, rating: int, delta: int) -> None:
+    """
+    Add or remove one review from the aggregates of an equipment.
+
+    Args:
+        equipment_id: Equipment ID.
+        rating (int): Rating of the review.
+        delta (int): 1 when a review is added, -1 when it is removed.
+    """
+    if equipment_id is None or rating not in RATING_VALUES:
+        return
+    new_count = models.F('rating_count') + delta
+    new_sum = models.F('rating_sum') + delta * rating
+    bucket = histogram_field(rating)
+    Equipment.objects.filter(pk=equipment_id).update(
+        rating_count=new_count,
+        rating_sum=new_sum,
+        rating_mean=Cast(new_sum, models.FloatField()) / NullIf(new_count, 0),
+        **{bucket: models.F(bucket) + delta},
+    )
+
+
+def rebuild_ratings(equipment_ids=None) -> int:
+    """
+    Recompute the aggregates from the Review table with one set-based UPDATE.
+
+    Args:
+        equipment_ids: Optional iterable of equipment IDs to limit the rebuild to.
+
+    Returns:
+        int: Number of updated equipment rows.
+    """
+    sql = REBUILD_SQL.format(
+        equipment=Equipment._meta.db_table,  # noqa: WPS437
+        review=Review._meta.db_table,  # noqa: WPS437
+    )
+    sql_args = []
+    if equipment_ids is not None:
+        sql = f'{sql} AND target.id = ANY(%s::uuid[])'  # noqa: WPS323
+        sql_args.append([str(equipment_id) for equipment_id in equipment_ids])
+    with connection.cursor() as cursor:
+        cursor.execute(sql, sql_args)
+        return cursor.rowcount
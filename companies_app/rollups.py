@@ -0,0 +1,107 @@
+"""
+Company and category statistics served from materialized views.
+
+The statistics of a company (linked equipment, reviews of that equipment and
+their mean rating) and of a category (equipment, companies holding them,
+reviews and mean rating) join Company, CompanyEquipment, Equipment and
+Review. The views of create_companies_rollups.sql, created by
+create_schema --rollups, store them with the time of their last refresh, so
+dashboards read one row per company or category.
+
+The views are stale until refreshed: run refresh_rollups on a schedule, for
+example from cron or with --every, or POST to the refresh action of their API
+endpoints. A refresh is concurrent, readers keep the previous rows until it
+commits, and needs the unique index on id every view has.
+"""
+from django.db import connection
+from rest_framework import serializers, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+from .models import CategoryStats, CompanyStats
+from .pagination import APICursorPagination
+from .permissions import APIPermission
+
+ROLLUPS = (CompanyStats, CategoryStats)
+REFRESH_SQL = 'REFRESH MATERIALIZED VIEW CONCURRENTLY {view}'
+
+
+class CompanyStatsSerializer(serializers.ModelSerializer):
+    """Statistics of a company as of the last refresh."""
+
+    title = serializers.CharField(source='company.title', read_only=True)
+
+    class Meta:
+        """Meta class."""
+
+        model = CompanyStats
+        fields = (
+            'company', 'title', 'equipment_count', 'review_count', 'rating_mean', 'refreshed',
+        )
+
+
+class CategoryStatsSerializer(serializers.ModelSerializer):
+    """Statistics of a category as of the last refresh."""
+
+    title = serializers.CharField(source='category.title', read_only=True)
+
+    class Meta:
+        """Meta class."""
+
+        model = CategoryStats
+        fields = (
+            'category',
+            'title',
+            'equipment_count',
+            'company_count',
+            'review_count',
+            'rating_mean',
+            'refreshed',
+        )
+
+
+def refresh_rollups(*models) -> None:
+    """
+    Recompute materialized views without blocking their readers.
+
+    Args:
+        models: Models of the views, every view of ROLLUPS if omitted.
+    """
+    with connection.cursor() as cursor:
+        for model in models or ROLLUPS:
+            cursor.execute(REFRESH_SQL.format(view=model._meta.db_table))  # noqa: WPS437
+
+
+class RollupViewSet(viewsets.ReadOnlyModelViewSet):
+    """Rows of one of the materialized views of ROLLUPS."""
+
+    permission_classes = [APIPermission]
+    pagination_class = APICursorPagination
+
+    @action(detail=False, methods=['post'])
+    def refresh(self, request):
+        """
+        Refresh the view now rather than at its next scheduled refresh.
+
+        Args:
+            request: Request object.
+
+        Returns:
+            Response: Empty response once the refresh is committed.
+        """
+        refresh_rollups(self.queryset.model)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class CompanyStatsViewSet(RollupViewSet):
+    """Equipment, reviews and mean rating of every company."""
+
+    queryset = CompanyStats.objects.select_related('company')
+    serializer_class = CompanyStatsSerializer
+
+
+class CategoryStatsViewSet(RollupViewSet):
+    """Equipment, companies, reviews and mean rating of every category."""
+
+    queryset = CategoryStats.objects.select_related('category')
+    serializer_class = CategoryStatsSerializer
@@ -0,0 +1,171 @@
+"""
+Database router sending the reads of safe requests to the read replicas.
+
+The replicas are the databases listed in DATABASE_REPLICAS, hot standbys of
+the default database. ReplicaMiddleware lets the models of companies_app be
+read from a random replica during GET, HEAD and OPTIONS requests; every
+write, and every read outside such a request (forms, management commands,
+signal receivers of writes), uses the default database.
+
+A request that writes sets a signed cookie pinning the reads of the browser
+to the default database for REPLICA_PIN_SECONDS, longer than the replication
+lag, so a user sees their own writes on the following pages. The reads of a
+request also move to the default database after its first write.
+"""
+import random
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+REPLICATED_APPS = ('companies_app',)
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+PIN_COOKIE = 'pin_primary'
+
+_request_reads = ContextVar('replica_reads', default=None)
+
+
+class ReplicaReads:
+    """Whether the current request may read from a replica and whether it wrote."""
+
+    def __init__(self, allowed: bool):
+        """
+        Initialize the state of a request that did not write yet.
+
+        Args:
+            allowed (bool): Whether the request may read from a replica.
+        """
+        self.allowed = allowed
+        self.wrote = False
+
+
+class ReplicaRouter:
+    """Route the reads of replicated models allowed by ReplicaMiddleware to a replica."""
+
+    def db_for_read(self, model, **hints) -> str:
+        """
+        Pick the database to read a model from.
+
+        Args:
+            model: Model class.
+            hints: Router hints.
+
+        Returns:
+            str: Alias of a random replica, or of the default database.
+        """
+        reads = _request_reads.get()
+        replicas = settings.DATABASE_REPLICAS
+        replicated = model._meta.app_label in REPLICATED_APPS  # noqa: WPS437
+        if reads and reads.allowed and replicas and replicated:
+            return random.choice(replicas)  # noqa: S311
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints) -> str:
+        """
+        Send a write to the default database and pin the current request to it.
+
+        Args:
+            model: Model class.
+            hints: Router hints.
+
+        Returns:
+            str: Alias of the default database.
+        """
+        reads = _request_reads.get()
+        if reads:
+            reads.allowed = False
+            reads.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints) -> bool:
+        """
+        Allow relations between objects of any database, as the replicas hold the same rows.
+
+        Args:
+            obj1: First object.
+            obj2: Second object.
+            hints: Router hints.
+
+        Returns:
+            bool: True.
+        """
+        return True
+
+    def allow_migrate(self, db, app_label, **hints) -> bool:
+        """
+        Migrate the default database only, the replicas follow it.
+
+        Args:
+            db (str): Database alias.
+            app_label (str): Application of the migrated model.
+            hints: Router hints.
+
+        Returns:
+            bool: Whether db is the default database.
+        """
+        return db == DEFAULT_DB_ALIAS
+
+
+class ReplicaMiddleware:
+    """Allow replica reads in safe requests of browsers that did not write recently."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        """
+        Initialize the middleware, async if the next middleware is.
+
+        Args:
+            get_response: Next middleware or the view.
+        """
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        """
+        Process a request, pinning the browser to the default database if the request writes.
+
+        Args:
+            request: Request object.
+
+        Returns:
+            HttpResponse: Response of the view.
+        """
+        if iscoroutinefunction(self):
+            return self._acall(request)
+        reads = _start_reads(request)
+        token = _request_reads.set(reads)
+        response = self.get_response(request)
+        _request_reads.reset(token)
+        return _pin_writer(response, reads)
+
+    async def _acall(self, request):
+        # The threads running the async ORM calls get a copy of the context holding reads.
+        reads = _start_reads(request)
+        token = _request_reads.set(reads)
+        response = await self.get_response(request)
+        _request_reads.reset(token)
+        return _pin_writer(response, reads)
+
+
+def _start_reads(request) -> ReplicaReads:
+    pinned = request.get_signed_cookie(
+        PIN_COOKIE, default=None, salt=PIN_COOKIE, max_age=settings.REPLICA_PIN_SECONDS,
+    )
+    return ReplicaReads(allowed=request.method in SAFE_METHODS and pinned is None)
+
+
+def _pin_writer(response, reads: ReplicaReads):
+    if reads.wrote:
+        response.set_signed_cookie(
+            PIN_COOKIE,
+            '1',
+            salt=PIN_COOKIE,
+            max_age=settings.REPLICA_PIN_SECONDS,
+            httponly=True,
+            samesite='Lax',
+        )
+    return response
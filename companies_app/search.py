@@ -0,0 +1,146 @@
+"""
+Full-text search over equipment, companies, addresses and reviews.
+
+Every searched column set has a GIN index on exactly the tsvector expression
+built here, so matching is an index lookup and only the matches get ranked.
+"""
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+
+from .models import SEARCH_CONFIG, Address, Company, Equipment, Review
+
+RESULTS_LIMIT = 20
+CLIENT_USER = 'client__user'
+
+EQUIPMENT_VECTOR = ('title',)
+COMPANY_VECTOR = ('title',)
+ADDRESS_VECTOR = ('city', 'street_name')
+REVIEW_VECTOR = ('text',)
+
+
+def search_vector(*fields) -> SearchVector:
+    """
+    Build the tsvector expression for a set of columns.
+
+    Args:
+        fields: Names of the text columns.
+
+    Returns:
+        SearchVector: Expression matching the GIN index over the columns.
+    """
+    return SearchVector(*fields, config=SEARCH_CONFIG)
+
+
+def parse_query(text: str):
+    """
+    Turn user input into a prefix-matching tsquery.
+
+    Args:
+        text (str): Search input.
+
+    Returns:
+        SearchQuery | None: Query matching rows with every word as a prefix, None without words.
+    """
+    words = re.findall(r'\w+', text or '')
+    if not words:
+        return None
+    raw = ' & '.join(f'{word}:*' for word in words)
+    return SearchQuery(raw, config=SEARCH_CONFIG, search_type='raw')
+
+
+def _ranked(queryset, fields, query, limit):
+    vector = search_vector(*fields)
+    return queryset.annotate(
+        search=vector, rank=SearchRank(vector, query),
+    ).filter(search=query).order_by('-rank')[:limit]
+
+
+def search_equipments(query, limit=RESULTS_LIMIT) -> list:
+    """
+    Find equipment by title.
+
+    Args:
+        query (SearchQuery): Parsed query.
+        limit (int): Maximum number of results.
+
+    Returns:
+        list: Equipment annotated with rank, best match first.
+    """
+    equipments = Equipment.objects.select_related(CLIENT_USER, 'category')
+    return list(_ranked(equipments, EQUIPMENT_VECTOR, query, limit))
+
+
+def search_reviews(query, limit=RESULTS_LIMIT) -> list:
+    """
+    Find reviews by text.
+
+    Args:
+        query (SearchQuery): Parsed query.
+        limit (int): Maximum number of results.
+
+    Returns:
+        list: Reviews annotated with rank, best match first.
+    """
+    reviews = Review.objects.select_related(CLIENT_USER, 'equipment')
+    return list(_ranked(reviews, REVIEW_VECTOR, query, limit))
+
+
+def search_companies(query, limit=RESULTS_LIMIT) -> list:
+    """
+    Find companies by title or by the city and street of their address.
+
+    Title and address matches are looked up through their own indexes and merged,
+    keeping the best rank of each company.
+
+    Args:
+        query (SearchQuery): Parsed query.
+        limit (int): Maximum number of results.
+
+    Returns:
+        list: Companies annotated with rank, best match first.
+    """
+    ranks = dict(_ranked(Company.objects.all(), COMPANY_VECTOR, query, limit).values_list(
+        'id', 'rank',
+    ))
+    for company_id, rank in _companies_by_address(query, limit):
+        ranks[company_id] = max(ranks.get(company_id, 0), rank)
+    best = sorted(ranks, key=ranks.get, reverse=True)[:limit]
+    companies = Company.objects.select_related(CLIENT_USER, 'address').in_bulk(best)
+    ranked = []
+    for best_id in best:
+        company = companies.get(best_id)
+        if company is not None:
+            company.rank = ranks[best_id]
+            ranked.append(company)
+    return ranked
+
+
+def _companies_by_address(query, limit):
+    addresses = _ranked(Address.objects.all(), ADDRESS_VECTOR, query, limit)
+    address_ranks = dict(addresses.values_list('id', 'rank'))
+    by_address = Company.objects.filter(address__in=list(address_ranks)).values_list(
+        'id', 'address_id',
+    )
+    return [(company_id, address_ranks[address_id]) for company_id, address_id in by_address]
+
+
+def search(text: str, limit=RESULTS_LIMIT) -> dict:
+    """
+    Search every kind of object.
+
+    Args:
+        text (str): Search input.
+        limit (int): Maximum number of results of each kind.
+
+    Returns:
+        dict: Ranked equipments, companies and reviews; empty lists for an empty query.
+    """
+    query = parse_query(text)
+    if query is None:
+        return {'equipments': [], 'companies': [], 'reviews': []}
+    return {
+        'equipments': search_equipments(query, limit),
+        'companies': search_companies(query, limit),
+        'reviews': search_reviews(query, limit),
+    }
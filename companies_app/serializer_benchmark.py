@@ -0,0 +1,106 @@
+"""
+Benchmark of the API serializers.
+
+The serializers suite renders pages of SERIALIZER_PAGE_SIZES rows to JSON,
+queryset included, and reports the query count, the p50 and p95 latency, the
+peak memory and the serialized rows per second of every page size:
+
+- equipment and companies through the nested serializers of companies_app.nested;
+- companies, equipment and reviews of the model endpoints through their
+  ModelSerializer and through the RowSerializer of companies_app.rows.
+
+A page is smaller than its size when the dataset holds fewer rows. The
+serializations are measured like requests answering 200 OK, and the rows of a
+page are counted apart, as the suite is run on whole tables rather than the
+pages of a user.
+"""
+from functools import partial
+from http import HTTPStatus
+
+from rest_framework.renderers import JSONRenderer
+
+from .benchmark import BENCHMARK_REPEAT, measure
+from .nested import (
+    CompanyDetailSerializer,
+    EquipmentDetailSerializer,
+    company_details,
+    equipment_details,
+)
+from .rows import row_serializer
+from .views import CompanyViewSet, EquipmentViewSet, ReviewViewSet
+
+SERIALIZER_PAGE_SIZES = (50, 500, 5000)
+# Benchmark name, queryset builder and serializer of every nested representation.
+SERIALIZED = (
+    ('equipment-details', equipment_details, EquipmentDetailSerializer),
+    ('company-details', company_details, CompanyDetailSerializer),
+)
+# Benchmark name and viewset of every model endpoint with a fast list path.
+LISTED = (
+    ('companies', CompanyViewSet),
+    ('equipment', EquipmentViewSet),
+    ('reviews', ReviewViewSet),
+)
+
+
+def run_serializers(repeat=BENCHMARK_REPEAT, page_sizes=SERIALIZER_PAGE_SIZES) -> dict:
+    """
+    Benchmark the API serializers at several page sizes.
+
+    Args:
+        repeat (int): Number of timed serializations of every page.
+        page_sizes (tuple): Number of rows of the benchmarked pages.
+
+    Returns:
+        dict: Measurements by representation, page size and path, with the number of rows.
+    """
+    measurements = {}
+    for name, queryset, serializer_class in SERIALIZED:
+        for size in page_sizes:
+            measurements[f'{name}-{size}'] = _rows_measurement(
+                measure(partial(_serialize, queryset, serializer_class, size), repeat),
+                min(size, queryset().count()),
+            )
+    for list_name, viewset in LISTED:
+        for list_size in page_sizes:
+            measurements.update(_list_measurements(list_name, viewset, list_size, repeat))
+    return measurements
+
+
+def _list_measurements(name: str, viewset, size: int, repeat: int) -> dict:
+    measurements = {}
+    paths = (
+        ('serializer', _serialize_instances),
+        ('rows', _serialize_rows),
+    )
+    rows = min(size, viewset.queryset.count())
+    for path, serialize in paths:
+        measured = measure(partial(serialize, viewset, size), repeat)
+        measurements[f'{name}-{size}-{path}'] = _rows_measurement(measured, rows)
+    return measurements
+
+
+def _rows_measurement(measured: dict, rows: int) -> dict:
+    measured.pop('status')
+    rows_per_s = rows / measured['p50_ms'] * 1000 if measured['p50_ms'] else 0
+    return {'rows': rows, **measured, 'rows_per_s': round(rows_per_s, 1)}
+
+
+def _serialize(queryset, serializer_class, size: int) -> HTTPStatus:
+    page = list(queryset().order_by('id')[:size])
+    JSONRenderer().render(serializer_class(page, many=True).data)
+    return HTTPStatus.OK
+
+
+def _serialize_instances(viewset, size: int) -> HTTPStatus:
+    page = list(viewset.queryset.order_by('id')[:size])
+    JSONRenderer().render(viewset.serializer_class(page, many=True).data)
+    return HTTPStatus.OK
+
+
+def _serialize_rows(viewset, size: int) -> HTTPStatus:
+    serializer = row_serializer(viewset.serializer_class)
+    queryset = viewset.queryset.prefetch_related(None).order_by('id')
+    page = list(queryset.values_list(*serializer.columns, named=True)[:size])
+    JSONRenderer().render(serializer.serialize(page))
+    return HTTPStatus.OK
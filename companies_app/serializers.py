@@ -5,14 +5,132 @@ Defines serializers for:
 - Company
 - Equipment
 - Review
+- EquipmentRanking, listed by the leaderboards
+- Address, Category and Client, nested into expanded relations
 """
+from uuid import UUID
 
 from rest_framework import serializers
 
-from .models import Company, Equipment, Review
+from .models import Address, Category, Client, Company, Equipment, EquipmentRanking, Review
 
+NOT_FOUND = 'Not found.'
+# Serializer context key of the fieldset requested from a view, see companies_app.fieldsets.
+FIELDSET = 'fieldset'
 
-class CompanySerializer(serializers.ModelSerializer):
+
+def item_pk(entry):
+    """
+    Return the primary key referenced by an entry of a bulk request.
+
+    Args:
+        entry: Object with an id, or the id itself.
+
+    Returns:
+        UUID | None: The primary key, None if the entry has no valid one.
+    """
+    pk = entry.get('id') if isinstance(entry, dict) else entry
+    try:
+        return UUID(str(pk))
+    except ValueError:
+        return None
+
+
+class BulkListSerializer(serializers.ListSerializer):
+    """
+    List serializer of the bulk API actions.
+
+    When the instance is a mapping of primary keys to objects, every entry is
+    validated as an update of the object its id refers to.
+    """
+
+    def run_child_validation(self, entry):
+        """
+        Validate one entry of the list.
+
+        Args:
+            entry: Item of the list.
+
+        Returns:
+            OrderedDict: Validated entry.
+
+        Raises:
+            ValidationError: If the entry is invalid or refers to an unknown object.
+        """
+        if isinstance(self.instance, dict):
+            self.child.instance = self.instance.get(item_pk(entry))
+            if self.child.instance is None:
+                raise serializers.ValidationError({'id': [NOT_FOUND]})
+        return super().run_child_validation(entry)
+
+
+class SparseFieldsetSerializer(serializers.ModelSerializer):
+    """
+    Model serializer returning the fields and expanded relations of the context fieldset.
+
+    Only the top-level serializer, or the child of a top-level list, is narrowed:
+    expanded relations are serialized with every field.
+    """
+
+    def get_fields(self) -> dict:
+        """
+        Return the fields selected by the fieldset, expanded relations as nested serializers.
+
+        Returns:
+            dict: Serializer fields by name.
+        """
+        fields = super().get_fields()
+        fieldset = self.context.get(FIELDSET) if self._is_top_level() else None
+        if fieldset is None:
+            return fields
+        return {
+            name: expanded_field(self.Meta.model, name) if name in fieldset.expand else field
+            for name, field in fields.items()
+            if fieldset.selects(name)
+        }
+
+    def _is_top_level(self) -> bool:
+        parent = self.parent
+        if isinstance(parent, serializers.ListSerializer):
+            parent = parent.parent
+        return parent is None
+
+
+class AddressSerializer(serializers.ModelSerializer):
+    """Serializer for the Address model."""
+
+    class Meta:
+        """Meta class."""
+
+        model = Address
+        fields = '__all__'
+
+
+class CategorySerializer(serializers.ModelSerializer):
+    """Serializer for the Category model."""
+
+    class Meta:
+        """Meta class."""
+
+        model = Category
+        fields = '__all__'
+
+
+class ClientSerializer(serializers.ModelSerializer):
+    """Serializer for the Client model with the public names of its user."""
+
+    username = serializers.CharField(read_only=True)
+    first_name = serializers.CharField(read_only=True)
+    last_name = serializers.CharField(read_only=True)
+
+    class Meta:
+        """Meta class."""
+
+        model = Client
+        fields = ('id', 'username', 'first_name', 'last_name')
+
+
+class CompanySerializer(SparseFieldsetSerializer):
     """Serializer for the Company model."""
 
     class Meta:
@@ -20,9 +138,10 @@ class CompanySerializer(serializers.ModelSerializer):
 
         model = Company
         fields = '__all__'
+        list_serializer_class = BulkListSerializer
 
 
-class EquipmentSerializer(serializers.ModelSerializer):
+class EquipmentSerializer(SparseFieldsetSerializer):
     """Serializer for the Equipment model."""
 
     class Meta:
@@ -30,9 +149,10 @@ class EquipmentSerializer(serializers.ModelSerializer):
 
         model = Equipment
         fields = '__all__'
+        list_serializer_class = BulkListSerializer
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class ReviewSerializer(SparseFieldsetSerializer):
     """Serializer for the Review model."""
 
     class Meta:
@@ -40,3 +160,85 @@ class ReviewSerializer(serializers.ModelSerializer):
 
         model = Review
         fields = '__all__'
+        list_serializer_class = BulkListSerializer
+
+
+class RankingSerializer(serializers.ModelSerializer):
+    """Leaderboard entry: an equipment with its ranking."""
+
+    title = serializers.CharField(source='equipment.title', read_only=True)
+    category = serializers.CharField(
+        source='equipment.category.title', default=None, read_only=True,
+    )
+    rating_mean = serializers.FloatField(source='equipment.rating_mean', read_only=True)
+
+    class Meta:
+        """Meta class."""
+
+        model = EquipmentRanking
+        fields = (
+            'equipment',
+            'title',
+            'category',
+            'score',
+            'rating_count',
+            'rating_mean',
+            'week_reviews',
+        )
+
+
+# Serializer of the rows of an expanded relation by related model, with the relations it reads.
+EXPANSIONS = (
+    (Address, AddressSerializer, ()),
+    (Category, CategorySerializer, ()),
+    (Client, ClientSerializer, ('user',)),
+    (Company, CompanySerializer, ('equipments',)),
+    (Equipment, EquipmentSerializer, ('companies',)),
+)
+
+
+def expandable_relations(model) -> tuple:
+    """
+    List the relations of a model that can be expanded.
+
+    Args:
+        model: Model class.
+
+    Returns:
+        tuple: Names of the forward relations to a model of EXPANSIONS.
+    """
+    expandable = {related for related, _, _ in EXPANSIONS}
+    return tuple(
+        field.name
+        for field in model._meta.get_fields()  # noqa: WPS437
+        if field.is_relation and not field.auto_created and field.related_model in expandable
+    )
+
+
+def expansion(related_model) -> tuple:
+    """
+    Return how the rows of an expanded relation are serialized.
+
+    Args:
+        related_model: Model class of the relation, one of EXPANSIONS.
+
+    Returns:
+        tuple: Serializer class and the relations it reads.
+    """
+    return {related: expanded for related, *expanded in EXPANSIONS}[related_model]
+
+
+def expanded_field(model, name: str) -> serializers.Serializer:
+    """
+    Build the read-only nested serializer of an expanded relation.
+
+    Args:
+        model: Model class holding the relation.
+        name (str): Relation name, one of expandable_relations.
+
+    Returns:
+        Serializer: Nested serializer, listing the related rows of a many-to-many relation.
+    """
+    field = model._meta.get_field(name)  # noqa: WPS437
+    serializer_class, _ = expansion(field.related_model)
+    return serializer_class(many=field.many_to_many, read_only=True)
@@ -0,0 +1,250 @@
+"""
+Signal handlers keeping denormalized data in sync with model writes.
+
+Writes sending no signal, such as COPY or raw SQL, call rebuild_denormalized.
+"""
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import Signal, receiver
+
+from .counters import COUNTED_MODELS, invalidate_counters, shift_counter
+from .fragments import EQUIPMENT_REVIEWS, bump_fragments, invalidate_fragments, touched_fragments
+from .leaderboards import rebuild_rankings, shift_ranking
+from .models import Address, Category, Company, CompanyEquipment, Equipment, Review
+from .ratings import apply_rating, rebuild_ratings
+
+FRAGMENT_MODELS = frozenset((Address, Category, Company, CompanyEquipment, Equipment, Review))
+
+# Sent with the model as sender after bulk_create or bulk_update, which skip post_save.
+# Arguments: instances (written objects), created (bool), previous (objects before an update).
+post_bulk_write = Signal()
+
+
+@receiver(pre_save, sender=Review)
+def remember_review_rating(sender, instance, **kwargs):
+    """
+    Store the rating a review had before an update.
+
+    Args:
+        sender: Review model.
+        instance: Review being saved.
+        kwargs: Signal kwargs.
+    """
+    instance.rating_before_save = None
+    if not instance._state.adding:  # noqa: WPS437
+        instance.rating_before_save = Review.objects.filter(pk=instance.pk).values_list(
+            'equipment_id', 'rating',
+        ).first()
+
+
+@receiver(post_save, sender=Review)
+def update_rating_on_save(sender, instance, created, **kwargs):
+    """
+    Shift the equipment rating aggregates by a created or changed review.
+
+    Args:
+        sender: Review model.
+        instance: Saved review.
+        created (bool): Whether the review was inserted.
+        kwargs: Signal kwargs.
+    """
+    current = (instance.equipment_id, instance.rating)
+    previous = None if created else getattr(instance, 'rating_before_save', None)
+    if previous == current:
+        return
+    if previous:
+        apply_rating(*previous, delta=-1)
+    apply_rating(*current, delta=1)
+
+
+@receiver(post_delete, sender=Review)
+def update_rating_on_delete(sender, instance, **kwargs):
+    """
+    Remove a deleted review from the equipment rating aggregates.
+
+    Args:
+        sender: Review model.
+        instance: Deleted review.
+        kwargs: Signal kwargs.
+    """
+    apply_rating(instance.equipment_id, instance.rating, delta=-1)
+
+
+def count_created(sender, instance, created, **kwargs):
+    """
+    Add a created row to the exact counter of its model.
+
+    Args:
+        sender: Model of the saved instance.
+        instance: Saved instance.
+        created (bool): Whether the instance was inserted.
+        kwargs: Signal kwargs.
+    """
+    if created:
+        shift_counter(sender, 1)
+
+
+def count_deleted(sender, instance, **kwargs):
+    """
+    Remove a deleted row from the exact counter of its model.
+
+    Args:
+        sender: Model of the deleted instance.
+        instance: Deleted instance.
+        kwargs: Signal kwargs.
+    """
+    shift_counter(sender, -1)
+
+
+def count_bulk_created(sender, created, **kwargs):
+    """
+    Recount a model after a bulk insert.
+
+    Args:
+        sender: Model of the written instances.
+        created (bool): Whether the instances were inserted.
+        kwargs: Signal kwargs.
+    """
+    if created:
+        invalidate_counters(sender)
+
+
+@receiver(post_bulk_write, sender=Review)
+def rebuild_bulk_ratings(sender, instances, previous=(), **kwargs):
+    """
+    Rebuild the rating aggregates of the equipment touched by a bulk review write.
+
+    Args:
+        sender: Review model.
+        instances (list): Written reviews.
+        previous (list): Reviews before an update.
+        kwargs: Signal kwargs.
+    """
+    equipment_ids = _equipment_ids([*instances, *previous])
+    if equipment_ids:
+        rebuild_ratings(equipment_ids)
+
+
+@receiver(post_save, sender=Review)
+def rank_saved_review(sender, instance, created, **kwargs):
+    """
+    Shift the leaderboard ranking of the equipment of a created or changed review.
+
+    Args:
+        sender: Review model.
+        instance: Saved review.
+        created (bool): Whether the review was inserted.
+        kwargs: Signal kwargs.
+    """
+    current = (instance.equipment_id, instance.rating)
+    previous = None if created else getattr(instance, 'rating_before_save', None)
+    if previous == current:
+        return
+    if previous:
+        shift_ranking(*previous, delta=-1, created=instance.created)
+    shift_ranking(*current, delta=1, created=instance.created)
+
+
+@receiver(post_delete, sender=Review)
+def rank_deleted_review(sender, instance, **kwargs):
+    """
+    Remove a deleted review from the leaderboard ranking of its equipment.
+
+    Args:
+        sender: Review model.
+        instance: Deleted review.
+        kwargs: Signal kwargs.
+    """
+    shift_ranking(instance.equipment_id, instance.rating, delta=-1, created=instance.created)
+
+
+@receiver(post_bulk_write, sender=Review)
+def rebuild_bulk_rankings(sender, instances, previous=(), **kwargs):
+    """
+    Rebuild the leaderboard rankings of the equipment touched by a bulk review write.
+
+    Args:
+        sender: Review model.
+        instances (list): Written reviews.
+        previous (list): Reviews before an update.
+        kwargs: Signal kwargs.
+    """
+    equipment_ids = _equipment_ids([*instances, *previous])
+    if equipment_ids:
+        rebuild_rankings(equipment_ids)
+
+
+def bump_saved_fragments(sender, instance, **kwargs):
+    """
+    Replace the versions of the cached fragments showing a saved object.
+
+    A review moved to another equipment also changes the reviews of the previous one.
+
+    Args:
+        sender: Model of the saved instance.
+        instance: Saved instance.
+        kwargs: Signal kwargs.
+    """
+    fragments = touched_fragments(sender, [instance])
+    previous = getattr(instance, 'rating_before_save', None)
+    if previous:
+        fragments.add((EQUIPMENT_REVIEWS, previous[0]))
+    bump_fragments(fragments)
+
+
+def bump_deleted_fragments(sender, instance, **kwargs):
+    """
+    Replace the versions of the cached fragments showing a deleted object.
+
+    Args:
+        sender: Model of the deleted instance.
+        instance: Deleted instance.
+        kwargs: Signal kwargs.
+    """
+    bump_fragments(touched_fragments(sender, [instance]))
+
+
+def bump_bulk_fragments(sender, instances, previous=(), **kwargs):
+    """
+    Replace the versions of the cached fragments showing bulk written objects.
+
+    Args:
+        sender: Model of the written instances.
+        instances (list): Written instances.
+        previous (list): Instances before an update.
+        kwargs: Signal kwargs.
+    """
+    bump_fragments(touched_fragments(sender, [*instances, *previous]))
+
+
+def rebuild_denormalized(*models, equipment_ids=None) -> None:
+    """
+    Rebuild the denormalized data after rows were written without signals.
+
+    Args:
+        models: Models whose rows were written, every counted model if omitted.
+        equipment_ids: IDs of the equipment whose reviews were written, None for every one.
+    """
+    if equipment_ids is None or equipment_ids:
+        rebuild_ratings(equipment_ids)
+        rebuild_rankings(equipment_ids)
+    invalidate_counters(*models)
+    invalidate_fragments()
+
+
+def _equipment_ids(reviews) -> set:
+    equipment_ids = {review.equipment_id for review in reviews}
+    equipment_ids.discard(None)
+    return equipment_ids
+
+
+# Receivers of a few models are connected per model: a receiver without sender runs for
+# every model, and a post_delete one keeps Django from deleting any row without loading it.
+for _, counted_model in COUNTED_MODELS:
+    post_save.connect(count_created, sender=counted_model)
+    post_delete.connect(count_deleted, sender=counted_model)
+    post_bulk_write.connect(count_bulk_created, sender=counted_model)
+
+for fragment_model in FRAGMENT_MODELS:
+    post_save.connect(bump_saved_fragments, sender=fragment_model)
+    post_delete.connect(bump_deleted_fragments, sender=fragment_model)
+    post_bulk_write.connect(bump_bulk_fragments, sender=fragment_model)
@@ -0,0 +1,26 @@
+"""
+This module defines template tags reading the versions of cached fragments.
+
+Functions:
+    - fragment_version(name, pk): Returns the current version of a fragment.
+"""
+from django import template
+
+from companies_app import fragments
+
+register = template.Library()
+
+
+@register.simple_tag
+def fragment_version(name, pk=None):
+    """
+    Return the current version of a fragment, to vary its {% cache %} block on.
+
+    Args:
+        name (str): Fragment name, see companies_app.fragments.
+        pk: Primary key of the object shown by the fragment, None for list fragments.
+
+    Returns:
+        str: Fragment version.
+    """
+    return fragments.fragment_version(name, pk)
@@ -4,23 +4,43 @@ URL configuration for the companies application.
 Includes routes for:
 - Homepage
 - API endpoints for companies, equipment, and reviews
+- Nested read-only API endpoints for equipment and company details
+- Read-only API endpoints for company and category statistics
 - User registration, login, and logout
 - Profile viewing by user ID
 - Equipment and company management
+- Search
+- Equipment leaderboards
+- Streaming export
+- Async versions of the read-heavy pages
 """
 from django.contrib.auth import views as auth_views
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
-from . import views
+from . import discovery_views, views
+from .export import ExportView
+from .query_viewsets import CompanyAutocompleteViewSet, LeaderboardViewSet, SearchViewSet
+from .rollups import CategoryStatsViewSet, CompanyStatsViewSet
+from .viewsets import CompanyDetailViewSet, EquipmentDetailViewSet
 
 router = DefaultRouter()
 router.register('companies', views.CompanyViewSet)
 router.register('equipment', views.EquipmentViewSet)
 router.register('review', views.ReviewViewSet)
+router.register('equipment-details', EquipmentDetailViewSet, basename='equipment-details')
+router.register('company-details', CompanyDetailViewSet, basename='company-details')
+router.register('company-stats', CompanyStatsViewSet, basename='company-stats')
+router.register('category-stats', CategoryStatsViewSet, basename='category-stats')
+router.register('search', SearchViewSet, basename='search')
+router.register('leaderboards', LeaderboardViewSet, basename='leaderboards')
+router.register(
+    'company-autocomplete', CompanyAutocompleteViewSet, basename='company-autocomplete',
+)
 
 urlpatterns = [
     path('', views.homepage, name='homepage'),
+    path('api/export/<str:name>.<str:export_format>', ExportView.as_view(), name='export'),
     path('api/', include(router.urls)),
     path('register/', views.register, name='register'),
     path('logout/', auth_views.LogoutView.as_view(), name='logout'),
@@ -31,6 +51,8 @@ urlpatterns = [
     path('equipment/<uuid:equipment_id>/', views.equipment_view, name='equipment_view'),
     path('equipment/<uuid:equipment_id>/delete/', views.delete_equipment, name='delete_equipment'),
     path('companies/', views.companies_view, name='companies'),
+    path('search/', discovery_views.search_view, name='search'),
+    path('leaderboards/', discovery_views.leaderboards_view, name='leaderboards'),
     path('company/<uuid:company_id>/', views.company_detail_view, name='company_detail'),
     path('create_company/', views.create_company, name='create_company'),
     path('create_equipment/', views.create_equipment, name='create_equipment'),
@@ -41,4 +63,5 @@ urlpatterns = [
     ),
     path('delete_review/<uuid:review_id>/', views.delete_review, name='delete_review'),
     path('delete_company/<uuid:company_id>/', views.delete_company, name='delete_company'),
+    path('async/', include('companies_app.async_urls')),
 ]
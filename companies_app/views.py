@@ -4,11 +4,13 @@ from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.shortcuts import get_object_or_404, redirect, render
 
-from .forms import (AddressForm, CompanyForm, EquipmentForm, RegistrationForm,
-                    ReviewForm)
-from .models import Client, Company, CompanyEquipment, Equipment, Review
-from .serializers import (CompanySerializer, EquipmentSerializer,
-                          ReviewSerializer)
+from .autocomplete import linkable_companies, linkable_state
+from .conditional import conditional_page
+from .counters import get_counters
+from .forms import AddressForm, CompanyForm, EquipmentForm, RegistrationForm, ReviewForm
+from .models import Client, Company, CompanyEquipment, CompanyStats, Equipment, Review
+from .pagination import KeysetPaginator, lazy_page
+from .serializers import CompanySerializer, EquipmentSerializer, ReviewSerializer
 from .viewsets import create_view_set
 
 METHOD_POST = 'POST'
@@ -16,9 +18,11 @@ CONTEXT_COMPANIES = 'companies'
 CONTEXT_EQUIPMENTS = 'equipments'
 CONTEXT_REVIEWS = 'reviews'
 VIEW_EQUIPMENT = 'equipment_view'
+CLIENT_USER = 'client__user'
+CURSOR = 'cursor'
 
-CompanyViewSet = create_view_set(Company, CompanySerializer)
-EquipmentViewSet = create_view_set(Equipment, EquipmentSerializer)
+CompanyViewSet = create_view_set(Company, CompanySerializer, ('equipments',))
+EquipmentViewSet = create_view_set(Equipment, EquipmentSerializer, ('companies',))
 ReviewViewSet = create_view_set(Review, ReviewSerializer)
 
 
@@ -35,11 +39,7 @@ def homepage(request):
     return render(
         request,
         'index.html',
-        context={
-            CONTEXT_COMPANIES: Company.objects.count(),
-            CONTEXT_EQUIPMENTS: Equipment.objects.count(),
-            CONTEXT_REVIEWS: Review.objects.count(),
-        },
+        context=get_counters(),
     )
 
 
@@ -80,10 +80,10 @@ def profile_view(request):
     Returns:
         HttpResponse: Rendered HTML template.
     """
-    client = get_object_or_404(Client, user=request.user)
-    reviews = Review.objects.filter(client=client)
-    companies = Company.objects.filter(client=client)
-    equipments = Equipment.objects.filter(client=client)
+    client = get_object_or_404(Client.objects.select_related('user'), user=request.user)
+    reviews = Review.objects.filter(client=client).select_related(CLIENT_USER)
+    companies = Company.objects.filter(client=client).select_related(CLIENT_USER)
+    equipments = Equipment.objects.filter(client=client).select_related(CLIENT_USER)
     context = {
         'client': client,
         CONTEXT_REVIEWS: reviews,
@@ -105,8 +105,8 @@ def profile_view_by_id(request, user_id):
     Returns:
         HttpResponse: Rendered HTML template.
     """
-    client = get_object_or_404(Client, user_id=user_id)
-    reviews = Review.objects.filter(client=client)
+    client = get_object_or_404(Client.objects.select_related('user'), user_id=user_id)
+    reviews = Review.objects.filter(client=client).select_related(CLIENT_USER)
 
     context = {
         'client': client,
@@ -126,9 +126,12 @@ def equipments_view(request):
     Returns:
         HttpResponse: Rendered HTML template.
     """
-    equipments = Equipment.objects.all()
+    paginator = KeysetPaginator(
+        Equipment.objects.select_related(CLIENT_USER, 'category'), ('title', 'size'),
+    )
     context = {
-        CONTEXT_EQUIPMENTS: equipments,
+        # Fetched on first use, which a cached equipment-list fragment skips.
+        CONTEXT_EQUIPMENTS: lazy_page(paginator, request.GET.get(CURSOR)),
     }
     return render(request, 'pages/equipments.html', context)
 
@@ -144,7 +147,9 @@ def companies_view(request):
     Returns:
         HttpResponse: Rendered HTML template.
     """
-    companies = Company.objects.all()
+    companies = KeysetPaginator(
+        Company.objects.select_related(CLIENT_USER, 'address'), ('title', 'phone'),
+    ).page(request.GET.get(CURSOR))
     context = {
         CONTEXT_COMPANIES: companies,
     }
@@ -152,6 +157,7 @@ def companies_view(request):
 
 
 @login_required()
+@conditional_page(Company, 'company_id')
 def company_detail_view(request, company_id):
     """
     View function for rendering the company detail page.
@@ -166,11 +172,14 @@ def company_detail_view(request, company_id):
     company = get_object_or_404(Company, id=company_id)
     context = {
         'company': company,
+        # As of the last refresh of the rollups, None for a company created since.
+        'stats': CompanyStats.objects.filter(pk=company_id).first(),
     }
     return render(request, 'pages/company_detail.html', context)
 
 
 @login_required
+@conditional_page(Equipment, 'equipment_id', linkable_state)
 def equipment_view(request, equipment_id):
     """
     View function for rendering the equipment detail page.
@@ -183,7 +192,7 @@ def equipment_view(request, equipment_id):
         HttpResponse: Rendered HTML template.
     """
     equipment = get_object_or_404(Equipment, id=equipment_id)
-    reviews = equipment.reviews.select_related('client__user').all()
+    reviews = equipment.reviews.select_related(CLIENT_USER).all()
     if request.method == METHOD_POST:
         form = ReviewForm(request.POST)
         if form.is_valid():
@@ -195,15 +204,11 @@ def equipment_view(request, equipment_id):
     else:
         form = ReviewForm()
 
-    all_companies = Company.objects.all()
-    associated_companies = equipment.companies.all()
-    unassociated_companies = all_companies.difference(associated_companies)
-
     context = {
         'equipment': equipment,
         CONTEXT_REVIEWS: reviews,
         'form': form,
-        CONTEXT_COMPANIES: unassociated_companies,
+        CONTEXT_COMPANIES: linkable_companies(request.user, equipment.id),
     }
     return render(request, 'pages/equipment_details.html', context)
 
@@ -1,26 +1,65 @@
 """Contains viewsets for the API."""
-
 from rest_framework import viewsets
 
+from .bulk import BulkWriteMixin
+from .changes import ChangesFeedMixin
+from .conditional import ConditionalRetrieveMixin
+from .fieldsets import SparseFieldsetMixin
+from .nested import (
+    CompanyDetailSerializer,
+    EquipmentDetailSerializer,
+    company_details,
+    equipment_details,
+)
+from .pagination import APICursorPagination
 from .permissions import APIPermission
+from .rows import FastListMixin
 
 
-def create_view_set(model_class, serializer):
+def create_view_set(model_class, serializer, prefetch=()):
     """
     Create custom ViewSets for Django REST Framework.
 
     Args:
         model_class: Model class.
         serializer: Serializer class.
+        prefetch (tuple): Many-to-many relations listed by the serializer.
 
     Returns:
         class: Custom ViewSet class.
     """
-    class CustomViewSet(viewsets.ModelViewSet):
+    class CustomViewSet(  # noqa: WPS215
+        SparseFieldsetMixin,
+        FastListMixin,
+        ConditionalRetrieveMixin,
+        BulkWriteMixin,
+        ChangesFeedMixin,
+        viewsets.ModelViewSet,
+    ):
         """Custom ViewSets for Django REST Framework."""
 
-        queryset = model_class.objects.all()
+        queryset = model_class.objects.prefetch_related(*prefetch)
         serializer_class = serializer
+        prefetch_lookups = prefetch
         permission_classes = [APIPermission]
+        pagination_class = APICursorPagination
 
     return CustomViewSet
+
+
+class EquipmentDetailViewSet(viewsets.ReadOnlyModelViewSet):
+    """Equipment with their category, rating, recent reviews and companies."""
+
+    queryset = equipment_details()
+    serializer_class = EquipmentDetailSerializer
+    permission_classes = [APIPermission]
+    pagination_class = APICursorPagination
+
+
+class CompanyDetailViewSet(viewsets.ReadOnlyModelViewSet):
+    """Companies with their address and equipment."""
+
+    queryset = company_details()
+    serializer_class = CompanyDetailSerializer
+    permission_classes = [APIPermission]
+    pagination_class = APICursorPagination
@@ -0,0 +1,71 @@
+"""
+Execute wrappers scoped to a context rather than to a connection.
+
+connection.execute_wrapper installs a wrapper on the connection of the current
+thread. Under ASGI the ORM calls of every request share one thread, so the
+wrappers of concurrent requests would stack on the same connection and see
+each other's queries. Instead, every connection runs its queries through
+dispatch_query, installed once when it connects, which hands them to the
+wrappers wrap_queries holds in a context variable. sync_to_async runs the ORM
+calls of a request in a copy of its context, so they only reach the wrappers
+of that request.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import partial
+
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+_context_wrappers = ContextVar('context_wrappers', default=())
+
+
+@contextmanager
+def wrap_queries(wrapper):
+    """
+    Run the queries of the current context through an execute wrapper.
+
+    The wrapper sees the queries of the code running in this context, and in
+    the copies of it sync_to_async runs the ORM calls of async code in.
+
+    Args:
+        wrapper: Execute wrapper.
+
+    Yields:
+        None: While the wrapper is active.
+    """
+    token = _context_wrappers.set((*_context_wrappers.get(), wrapper))
+    try:
+        yield
+    finally:
+        _context_wrappers.reset(token)
+
+
+def dispatch_query(execute, *query):
+    """
+    Run a query through the wrappers of the current context, the first one outermost.
+
+    Args:
+        execute: Next wrapper or the query execution.
+        query: SQL statement, parameters, executemany flag and context of the query.
+
+    Returns:
+        Result of the query execution.
+    """
+    for wrapper in reversed(_context_wrappers.get()):
+        execute = partial(wrapper, execute)
+    return execute(*query)
+
+
+@receiver(connection_created)
+def install_dispatch(sender, connection, **kwargs):
+    """
+    Install dispatch_query on a connection, once as the wrappers outlive reconnections.
+
+    Args:
+        sender: Database wrapper class.
+        connection: Database wrapper.
+        kwargs: Signal kwargs.
+    """
+    if dispatch_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(dispatch_query)
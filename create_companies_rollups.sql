@@ -0,0 +1,52 @@
+CREATE MATERIALIZED VIEW IF NOT EXISTS companies_schema.company_stats AS
+WITH equipment_reviews AS (
+    SELECT equipment_id, COUNT(*) AS review_count, SUM(rating) AS rating_sum
+    FROM companies_schema.review
+    WHERE equipment_id IS NOT NULL
+    GROUP BY equipment_id
+)
+SELECT
+    company.id,
+    company.id AS company_id,
+    COUNT(link.equipment_id) AS equipment_count,
+    COALESCE(SUM(equipment_reviews.review_count), 0) AS review_count,
+    SUM(equipment_reviews.rating_sum)::double precision
+        / NULLIF(SUM(equipment_reviews.review_count), 0) AS rating_mean,
+    statement_timestamp() AS refreshed
+FROM companies_schema.company AS company
+LEFT JOIN companies_schema.company_equipment AS link ON link.company_id = company.id
+LEFT JOIN equipment_reviews ON equipment_reviews.equipment_id = link.equipment_id
+GROUP BY company.id;
+
+CREATE UNIQUE INDEX IF NOT EXISTS company_stats_id_idx ON companies_schema.company_stats (id);
+CREATE UNIQUE INDEX IF NOT EXISTS company_stats_company_id_idx
+    ON companies_schema.company_stats (company_id);
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS companies_schema.category_stats AS
+WITH equipment_reviews AS (
+    SELECT equipment_id, COUNT(*) AS review_count, SUM(rating) AS rating_sum
+    FROM companies_schema.review
+    WHERE equipment_id IS NOT NULL
+    GROUP BY equipment_id
+), category_companies AS (
+    SELECT equipment.category_id, COUNT(DISTINCT link.company_id) AS company_count
+    FROM companies_schema.equipment AS equipment
+    JOIN companies_schema.company_equipment AS link ON link.equipment_id = equipment.id
+    GROUP BY equipment.category_id
+)
+SELECT
+    category.id,
+    category.id AS category_id,
+    COUNT(equipment.id) AS equipment_count,
+    COALESCE(MAX(category_companies.company_count), 0) AS company_count,
+    COALESCE(SUM(equipment_reviews.review_count), 0) AS review_count,
+    SUM(equipment_reviews.rating_sum)::double precision
+        / NULLIF(SUM(equipment_reviews.review_count), 0) AS rating_mean,
+    statement_timestamp() AS refreshed
+FROM companies_schema.category AS category
+LEFT JOIN companies_schema.equipment AS equipment ON equipment.category_id = category.id
+LEFT JOIN equipment_reviews ON equipment_reviews.equipment_id = equipment.id
+LEFT JOIN category_companies ON category_companies.category_id = category.id
+GROUP BY category.id;
+
+CREATE UNIQUE INDEX IF NOT EXISTS category_stats_id_idx ON companies_schema.category_stats (id);
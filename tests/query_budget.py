@@ -0,0 +1,26 @@
+"""Test helper enforcing the number of queries a block of code may run."""
+from contextlib import contextmanager
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@contextmanager
+def assert_query_budget(test_case, budget: int):
+    """
+    Fail the test when the wrapped block runs more queries than its budget.
+
+    Args:
+        test_case (TestCase): The running test case.
+        budget (int): The maximum number of queries allowed.
+
+    Yields:
+        CaptureQueriesContext: The context capturing the executed queries.
+    """
+    context = CaptureQueriesContext(connection)
+    with context:
+        yield context
+    executed = len(context)
+    if executed > budget:
+        statements = '\n'.join(query['sql'] for query in context.captured_queries)
+        test_case.fail(f'{executed} queries executed, budget is {budget}:\n{statements}')
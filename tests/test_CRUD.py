@@ -3,8 +3,7 @@ from django.contrib.auth.models import User
 from django.test import TestCase
 from django.urls import reverse
 
-from companies_app.models import (Address, Category, Client, Company,
-                                  Equipment, Review)
+from companies_app.models import Address, Category, Client, Company, Equipment, Review
 
 
 class ViewTests(TestCase):
@@ -3,9 +3,13 @@ from django.contrib.auth.models import User
 from django.test import TestCase
 from rest_framework import status
 from rest_framework.authtoken.models import Token
-from rest_framework.test import APIClient
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
 
 from companies_app.models import Company, Equipment, Review
+from companies_app.pagination import API_MAX_PAGE_SIZE, APICursorPagination
+
+PAGINATED_ROWS = 3
 
 
 def create_apitest(model_class, model_url, creation_attrs):
@@ -111,3 +115,48 @@ EquipmentApiTest = create_apitest(
     Equipment, '/api/equipment/', {'title': 'Test Equipment', 'size': 10},
 )
 ReviewApiTest = create_apitest(Review, '/api/review/', {'text': 'Test Review', 'rating': 5})
+
+
+class PageSizeLimitTest(TestCase):
+    """Test case for the server-side limit of the API page size."""
+
+    def test_page_size_is_capped(self):
+        """Test that a page size above the maximum is lowered to the maximum."""
+        request = Request(APIRequestFactory().get('/', {'page_size': API_MAX_PAGE_SIZE * 10}))
+        self.assertEqual(APICursorPagination().get_page_size(request), API_MAX_PAGE_SIZE)
+
+
+class PaginationTest(TestCase):
+    """Test case for walking the paginated lists of the API by their cursors."""
+
+    def setUp(self):
+        """Set up the test environment with an authenticated API client."""
+        self.client = APIClient()
+        self.client.force_authenticate(user=User.objects.create_user(username='test'))
+
+    def test_companies(self):
+        """Test that the company list is split into pages."""
+        for index in range(PAGINATED_ROWS):
+            Company.objects.create(title=f'Test Company {index}', phone=f'123456789{index}')
+        self._assert_two_pages('/api/companies/')
+
+    def test_equipment(self):
+        """Test that the equipment list is split into pages."""
+        for index in range(PAGINATED_ROWS):
+            Equipment.objects.create(title=f'Test Equipment {index}', size=10)
+        self._assert_two_pages('/api/equipment/')
+
+    def test_reviews(self):
+        """Test that the review list is split into pages."""
+        for _ in range(PAGINATED_ROWS):
+            Review.objects.create(text='Test Review', rating=5)
+        self._assert_two_pages('/api/review/')
+
+    def _assert_two_pages(self, model_url: str):
+        response = self.client.get(model_url, {'page_size': PAGINATED_ROWS - 1})
+        self.assertEqual(len(response.data['results']), PAGINATED_ROWS - 1)
+        self.assertIsNone(response.data['previous'])
+
+        response = self.client.get(response.data['next'])
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertIsNone(response.data['next'])
@@ -0,0 +1,153 @@
+"""Tests for the async versions of the read-heavy pages and the ASGI load benchmark."""
+import asyncio
+import re
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from companies_app.load import LOAD_CONCURRENCY, VARIANTS, run_asgi
+from companies_app.models import Category, Client, Company, CompanyEquipment, Equipment, Review
+
+NOT_MODIFIED = 304
+REVIEW_TEXT = 'Sharp and quiet'
+ASYNC_EQUIPMENT = 'async:equipment_view'
+QUERY_COUNT = re.compile(r'desc="(\d+) queries"')
+
+
+class AsyncViewsSetUp(TestCase):
+    """Common setup of the async pages tests."""
+
+    def setUp(self):
+        """Set up the test environment with a reviewed equipment of a company."""
+        self.user = User.objects.create_user(username='user')
+        client_instance = Client.objects.create(user=self.user)
+        self.equipment = Equipment.objects.create(
+            title='Drill', client=client_instance, category=Category.objects.create(title='Tools'),
+        )
+        self.company = Company.objects.create(
+            title='Workshop', phone='1234567890', client=client_instance,
+        )
+        Company.objects.create(title='Garage', phone='1234567891', client=client_instance)
+        CompanyEquipment.objects.create(company=self.company, equipment=self.equipment)
+        Review.objects.create(
+            text='Good', rating=5, equipment=self.equipment, client=client_instance,
+        )
+        self.client.force_login(self.user)
+        self.async_client.force_login(self.user)
+        self.pages = (
+            ('homepage', []),
+            ('equipments', []),
+            ('companies', []),
+            ('company_detail', [self.company.id]),
+            ('equipment_view', [self.equipment.id]),
+        )
+
+
+class AsyncPagesTest(AsyncViewsSetUp):
+    """Test case for serving the async pages."""
+
+    def test_pages_match_sync_versions(self):
+        """Test that every async page renders the template and context of its sync version."""
+        for name, args in self.pages:
+            sync_response = self.client.get(reverse(name, args=args))
+            response = self.client.get(reverse(f'async:{name}', args=args))
+            self.assertEqual(response.status_code, 200, name)
+            self.assertEqual(
+                [template.name for template in response.templates],
+                [template.name for template in sync_response.templates],
+            )
+            self.assertEqual(response.context.keys(), sync_response.context.keys())
+
+    def test_equipment_page_content(self):
+        """Test that the equipment page shows the reviews and the companies it can join."""
+        response = self.client.get(reverse(ASYNC_EQUIPMENT, args=[self.equipment.id]))
+        self.assertContains(response, 'Good')
+        self.assertEqual([company.title for company in response.context['companies']], ['Garage'])
+
+    def test_homepage_counters(self):
+        """Test that the homepage counts the rows of every counted model."""
+        cache.clear()
+        response = self.client.get(reverse('async:homepage'))
+        self.assertEqual(
+            [response.context[name] for name in ('companies', 'equipments', 'reviews')],
+            [2, 1, 1],
+        )
+
+    async def test_pages_through_asgi(self):
+        """Test that the async pages are served by the ASGI handler with async middleware."""
+        for name, args in self.pages:
+            response = await self.async_client.get(reverse(f'async:{name}', args=args))
+            self.assertEqual(response.status_code, 200, name)
+            self.assertIn('Server-Timing', response)
+
+
+class ConcurrentRequestsTest(AsyncViewsSetUp):
+    """Test case for measuring concurrent requests served through ASGI."""
+
+    @override_settings(DUPLICATE_QUERIES='raise')
+    async def test_requests_see_their_own_queries(self):
+        """Test that concurrent requests count and check only the queries they ran."""
+        url = reverse('async:equipments')
+        await self.async_client.get(url)
+        single = await self.async_client.get(url)
+        responses = await asyncio.gather(
+            *(self.async_client.get(url) for _ in range(LOAD_CONCURRENCY)),
+        )
+        expected = QUERY_COUNT.search(single['Server-Timing']).group(1)
+        for response in responses:
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(QUERY_COUNT.search(response['Server-Timing']).group(1), expected)
+
+
+class AsyncPageAccessTest(AsyncViewsSetUp):
+    """Test case for the login, the conditional GET and the review form of the async pages."""
+
+    def test_login_required(self):
+        """Test that anonymous users are redirected to the login page."""
+        self.client.logout()
+        url = reverse('async:equipments')
+        login_url = reverse('login')
+        self.assertRedirects(
+            self.client.get(url), f'{login_url}?next={url}', fetch_redirect_response=False,
+        )
+
+    def test_missing_object(self):
+        """Test that a detail page of a missing object is not found."""
+        response = self.client.get(reverse(ASYNC_EQUIPMENT, args=[self.company.id]))
+        self.assertEqual(response.status_code, 404)
+
+    def test_not_modified(self):
+        """Test that the async detail page revalidates until the user adds a company."""
+        url = reverse(ASYNC_EQUIPMENT, args=[self.equipment.id])
+        etag = self.client.get(url)['ETag']
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, NOT_MODIFIED)
+        Company.objects.create(title='Depot', phone='1234567892', client=self.company.client)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_post_review(self):
+        """Test that posting a review saves it and redirects to the async page."""
+        url = reverse(ASYNC_EQUIPMENT, args=[self.equipment.id])
+        response = self.client.post(url, {'text': REVIEW_TEXT, 'rating': 4})
+        self.assertRedirects(response, url, fetch_redirect_response=False)
+        self.assertTrue(Review.objects.filter(equipment=self.equipment, text=REVIEW_TEXT).exists())
+
+
+class AsgiLoadTest(TestCase):
+    """Test case for the ASGI load benchmark."""
+
+    def test_run_asgi(self):
+        """Test that both versions of every async page are served under concurrent load."""
+        call_command('seed_data', '--clients', '1', '--reviews', '10', stdout=StringIO())
+        measurements = run_asgi(User.objects.get(username='seed0'), repeat=2, concurrency=3)
+        self.assertEqual(len(measurements), 5 * len(VARIANTS))
+        for name, measured in measurements.items():
+            self.assertEqual(measured['status'], 200, name)
+            self.assertEqual(measured['failed'], {}, name)
+            self.assertEqual(measured['requests'], 6)
+            self.assertLessEqual(measured['p50_ms'], measured['p95_ms'], name)
@@ -0,0 +1,110 @@
+"""Tests for the dataset generator and the benchmark."""
+import json
+import os
+from collections import Counter
+from io import StringIO
+from tempfile import TemporaryDirectory
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase, TestCase
+
+from companies_app.baselines import compare_baselines
+from companies_app.benchmark import discover_routes
+from companies_app.models import Client, Company, CompanyEquipment, Equipment, Review
+from companies_app.serializer_benchmark import run_serializers
+
+SEED_OPTIONS = (
+    '--clients', '3', '--categories', '2', '--companies-per-client', '2',
+    '--equipment-per-client', '4', '--links-per-company', '2', '--reviews', '300',
+)
+
+
+class BenchmarkTest(TestCase):
+    """Test case for seeding a dataset and benchmarking it."""
+
+    def setUp(self):
+        """Set up the test environment with a seeded dataset."""
+        call_command('seed_data', *SEED_OPTIONS, stdout=StringIO())
+
+    def test_seed_data(self):
+        """Test that the dataset has the requested shape and skewed reviews."""
+        self.assertEqual(Client.objects.count(), 3)
+        self.assertEqual(Company.objects.count(), 6)
+        self.assertEqual(Equipment.objects.count(), 12)
+        self.assertEqual(CompanyEquipment.objects.count(), 12)
+        self.assertEqual(Review.objects.count(), 300)
+        reviewed = Counter(Review.objects.values_list('equipment_id', flat=True))
+        self.assertGreater(reviewed.most_common(1)[0][1], 300 / 12 * 2)
+        top = Equipment.objects.order_by('-rating_count').first()
+        self.assertEqual(top.rating_count, reviewed.most_common(1)[0][1])
+
+    def test_seed_data_is_reproducible(self):
+        """Test that the same seed generates the same reviews."""
+        first = list(Review.objects.order_by('created').values_list('rating', flat=True))
+        call_command('seed_data', *SEED_OPTIONS, '--prefix', 'again', stdout=StringIO())
+        second = Review.objects.filter(client__user__username__startswith='again')
+        ratings = list(second.order_by('created').values_list('rating', flat=True))
+        self.assertEqual(ratings, first)
+
+    def test_benchmark(self):
+        """Test that every route is benchmarked and two baselines can be compared."""
+        with TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'baseline.json')
+            call_command('benchmark', '--repeat', '2', '--output', path, stdout=StringIO())
+            with open(path) as baseline_file:
+                baseline = json.load(baseline_file)
+            stdout = StringIO()
+            call_command(
+                'benchmark', '--repeat', '2', '--output', os.devnull, '--compare', path,
+                stdout=stdout,
+            )
+        self._assert_routes(baseline['suites']['routes'], stdout.getvalue())
+        self.assertEqual(baseline['dataset']['reviews'], 300)
+        self.assertIn('routes/homepage: queries', stdout.getvalue())
+
+    def test_serializers_large_pages(self):
+        """Test that pages of 500 rows are timed and report their rows, not a server error."""
+        call_command('seed_data', *SEED_OPTIONS, '--prefix', 'again', stdout=StringIO())
+        measurements = run_serializers(repeat=2, page_sizes=(500,))
+        for name in ('reviews-500-serializer', 'reviews-500-rows'):
+            self.assertEqual(measurements[name]['rows'], 500, name)
+            self.assertNotIn('server_error', measurements[name])
+            self.assertGreater(measurements[name]['rows_per_s'], 0, name)
+        self.assertEqual(measurements['equipment-details-500']['rows'], 24)
+
+    def test_benchmark_errors(self):
+        """Test that a missing user or a too small repeat is refused."""
+        with self.assertRaises(CommandError):
+            call_command('benchmark', '--username', 'missing', stdout=StringIO())
+        with self.assertRaises(CommandError):
+            call_command('benchmark', '--repeat', '1', stdout=StringIO())
+
+    def _assert_routes(self, routes: dict, comparison: str):
+        self.assertEqual(list(routes), [name for name, _ in discover_routes()])
+        for page in ('homepage', 'equipments', 'equipment-list', 'profile_by_id'):
+            self.assertGreater(routes[page]['queries'], 0, page)
+            self.assertEqual(routes[page]['status'], 200, page)
+        self.assertEqual(routes['export']['status'], 200)
+        for name, measured in routes.items():
+            if measured['status'] >= 500:
+                self.assertTrue(measured['server_error'], name)
+                self.assertIn(f'routes/{name}: server error', comparison)
+            else:
+                self.assertLessEqual(measured['p50_ms'], measured['p95_ms'], name)
+
+
+class BaselinesTest(SimpleTestCase):
+    """Test case for comparing baselines."""
+
+    def test_compare_baselines(self):
+        """Test that added, removed and changed benchmarks are reported."""
+        measured = {'queries': 2, 'p50_ms': 1, 'p95_ms': 2, 'peak_memory_kb': 10}
+        previous = {'suites': {'routes': {'old': measured, 'kept': measured}}}
+        current = {'suites': {'routes': {'new': measured, 'kept': {**measured, 'queries': 3}}}}
+        self.assertEqual(compare_baselines(previous, current), [
+            'routes/kept: queries 2 -> 3 (+50%), p50_ms 1 -> 1 (+0%), '
+            + 'p95_ms 2 -> 2 (+0%), peak_memory_kb 10 -> 10 (+0%)',
+            'routes/new: added',
+            'routes/old: removed',
+        ])
@@ -0,0 +1,105 @@
+"""Tests for the bulk write API actions."""
+from django.contrib.auth.models import User
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from companies_app.models import Company, Equipment, Review
+
+COMPANY_BULK_URL = '/api/companies/bulk/'
+REVIEW_BULK_URL = '/api/review/bulk/'
+PHONE = '1234567890'
+ERRORS = 'errors'
+
+
+class BulkSetUp(TestCase):
+    """Base test case sending bulk requests as a superuser."""
+
+    def setUp(self):
+        """Set up the test environment with a superuser API client."""
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_superuser(username='admin'))
+
+
+class BulkWriteTest(BulkSetUp):
+    """Test case for creating, updating and deleting objects in bulk."""
+
+    def test_bulk_create(self):
+        """Test that valid objects are created and invalid ones are reported."""
+        entries = [
+            {'title': 'First', 'phone': PHONE},
+            {'title': 'Second', 'phone': 'not a phone'},
+            {'title': 'Third', 'phone': PHONE},
+        ]
+        response = self.client.post(COMPANY_BULK_URL, entries, format='json')
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual(response.data[0]['title'], 'First')
+        self.assertIn('phone', response.data[1][ERRORS])
+        self.assertEqual(response.data[2]['title'], 'Third')
+        self.assertEqual(set(Company.objects.values_list('title', flat=True)), {'First', 'Third'})
+
+    def test_bulk_create_all_valid(self):
+        """Test that a fully valid batch is created with a single status."""
+        entries = [{'title': f'Company {index}', 'phone': PHONE} for index in range(3)]
+        response = self.client.post(COMPANY_BULK_URL, entries, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Company.objects.count(), len(entries))
+
+    def test_bulk_update(self):
+        """Test that objects are updated by id and unknown ids are reported."""
+        company = Company.objects.create(title='Old', phone=PHONE)
+        equipment = Equipment.objects.create(title='Drill')
+        entries = [
+            {'id': str(company.id), 'title': 'New', 'phone': PHONE},
+            {'id': str(equipment.id), 'title': 'Other', 'phone': PHONE},
+        ]
+        response = self.client.put(COMPANY_BULK_URL, entries, format='json')
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual(response.data[0]['title'], 'New')
+        self.assertIn('id', response.data[1][ERRORS])
+        company.refresh_from_db()
+        self.assertEqual(company.title, 'New')
+
+    def test_bulk_delete(self):
+        """Test that objects are deleted by id and unknown ids are reported."""
+        company = Company.objects.create(title='Company', phone=PHONE)
+        ids = [str(company.id), 'missing']
+        response = self.client.delete(COMPANY_BULK_URL, ids, format='json')
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual(response.data[0], {'id': company.id})
+        self.assertFalse(Company.objects.exists())
+
+    def test_not_a_list(self):
+        """Test that a request body other than a list is rejected."""
+        response = self.client.post(COMPANY_BULK_URL, {'title': 'First'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class BulkRulesTest(BulkSetUp):
+    """Test case for the permissions and side effects of bulk writes."""
+
+    def test_regular_user_forbidden(self):
+        """Test that bulk writes are reserved to superusers like single writes."""
+        self.client.force_authenticate(User.objects.create_user(username='user'))
+        response = self.client.post(COMPANY_BULK_URL, [], format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_bulk_reviews_update_ratings(self):
+        """Test that bulk review writes keep the equipment rating aggregates in sync."""
+        drill = Equipment.objects.create(title='Drill')
+        saw = Equipment.objects.create(title='Saw')
+        entries = [
+            {'text': 'Good', 'rating': 4, 'equipment': str(drill.id)},
+            {'text': 'Bad', 'rating': 2, 'equipment': str(drill.id)},
+        ]
+        self.client.post(REVIEW_BULK_URL, entries, format='json')
+        drill.refresh_from_db()
+        self.assertEqual((drill.rating_count, drill.rating_sum), (2, 6))
+
+        review = Review.objects.get(text='Bad')
+        entries = [{'id': str(review.id), 'text': 'Bad', 'rating': 1, 'equipment': str(saw.id)}]
+        self.client.put(REVIEW_BULK_URL, entries, format='json')
+        drill.refresh_from_db()
+        saw.refresh_from_db()
+        self.assertEqual((drill.rating_count, drill.rating_sum), (1, 4))
+        self.assertEqual((saw.rating_count, saw.rating_sum), (1, 1))
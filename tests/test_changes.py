@@ -0,0 +1,165 @@
+"""Tests for the changes feed of the API and the triggers keeping it exact."""
+from django.contrib.auth.models import User
+from django.db import connection
+from django.db.models.functions import Now
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from companies_app.changes import safe_watermark
+from companies_app.models import (
+    Category,
+    Client,
+    Company,
+    CompanyEquipment,
+    Equipment,
+    Review,
+    Tombstone,
+)
+from tests.query_budget import assert_query_budget
+
+REVIEWS_URL = '/api/review/changes/'
+EQUIPMENT_URL = '/api/equipment/changes/'
+REVIEW_ROWS = 3
+CHANGES = 'changes'
+WATERMARK = 'watermark'
+# Activity snapshot, watermark, page timestamps and changed rows; a first sync has no tombstones.
+FEED_QUERIES = 4
+
+
+class ChangesSetUp(TestCase):
+    """Common setup of the changes feed tests."""
+
+    def setUp(self):
+        """Set up the test environment with reviewed equipment and a company."""
+        self.user = User.objects.create_user(username='user', is_superuser=True)
+        self.client_instance = Client.objects.create(user=self.user)
+        self.equipment = Equipment.objects.create(
+            title='Drill', client=self.client_instance,
+            category=Category.objects.create(title='Tools'),
+        )
+        self.company = Company.objects.create(
+            title='Workshop', phone='1234567890', client=self.client_instance,
+        )
+        self.reviews = [
+            Review.objects.create(
+                text=f'Review {index}', rating=5, equipment=self.equipment,
+                client=self.client_instance,
+            )
+            for index in range(REVIEW_ROWS)
+        ]
+        self.api = APIClient()
+        self.api.force_authenticate(self.user)
+
+    def sync(self, url: str, since=None, page_size=None) -> dict:
+        """
+        Request a page of the changes feed.
+
+        Args:
+            url (str): URL of the feed.
+            since (str): Watermark of the previous page.
+            page_size (int): Number of rows of a page.
+
+        Returns:
+            dict: Response body.
+        """
+        query = {'since': since, 'page_size': page_size}
+        response = self.api.get(url, {name: given for name, given in query.items() if given})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.json()
+
+
+class ChangesFeedTest(ChangesSetUp):
+    """Test case for the rows and deletions returned by the changes feed."""
+
+    def test_first_sync(self):
+        """Test that a sync without watermark returns every row and no deletion."""
+        with assert_query_budget(self, FEED_QUERIES):
+            body = self.sync(REVIEWS_URL)
+        self.assertEqual(len(body[CHANGES]), REVIEW_ROWS)
+        self.assertEqual(body['deleted'], [])
+        self.assertTrue(body['complete'])
+
+    def test_only_changes_since_watermark(self):
+        """Test that a sync returns the rows changed and deleted after the watermark."""
+        watermark = self.sync(REVIEWS_URL)[WATERMARK]
+        self.assertEqual(self.sync(REVIEWS_URL, watermark)[CHANGES], [])
+        changed, deleted = self.reviews[:2]
+        changed.text = 'Changed'
+        changed.save()
+        deleted_id = str(deleted.id)
+        self.api.delete(f'/api/review/{deleted_id}/')
+        body = self.sync(REVIEWS_URL, watermark)
+        self.assertEqual([row['text'] for row in body[CHANGES]], ['Changed'])
+        self.assertEqual(body['deleted'], [deleted_id])
+
+    def test_pages_keep_timestamp_groups(self):
+        """Test that rows sharing a timestamp are returned on the same page."""
+        watermark = self.sync(REVIEWS_URL)[WATERMARK]
+        with connection.cursor() as cursor:
+            cursor.execute('SET CONSTRAINTS ALL IMMEDIATE')
+            cursor.execute(
+                'ALTER TABLE "companies_schema"."review" DISABLE TRIGGER "review_stamp_modified"',
+            )
+            Review.objects.update(modified=Now())
+            cursor.execute(
+                'ALTER TABLE "companies_schema"."review" ENABLE TRIGGER "review_stamp_modified"',
+            )
+        first = self.sync(REVIEWS_URL, watermark, page_size=2)
+        self.assertEqual(len(first[CHANGES]), REVIEW_ROWS)
+        self.assertFalse(first['complete'])
+        last = self.sync(REVIEWS_URL, first[WATERMARK], page_size=2)
+        self.assertEqual(last[CHANGES], [])
+        self.assertTrue(last['complete'])
+
+    def test_invalid_watermark(self):
+        """Test that a watermark without a time zone is refused."""
+        response = self.api.get(REVIEWS_URL, {'since': '2024-01-01T00:00:00'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class ChangesTriggersTest(ChangesSetUp):
+    """Test case for the database triggers behind the changes feed."""
+
+    def test_queryset_update_bumps_modified(self):
+        """Test that an update skipping save still sets modified."""
+        before = Equipment.objects.get(pk=self.equipment.pk).modified
+        Equipment.objects.filter(pk=self.equipment.pk).update(size=3)
+        self.assertGreater(Equipment.objects.get(pk=self.equipment.pk).modified, before)
+
+    def test_links_touch_both_sides(self):
+        """Test that linking a company to an equipment changes both."""
+        watermark = self.sync(EQUIPMENT_URL)[WATERMARK]
+        CompanyEquipment.objects.create(company=self.company, equipment=self.equipment)
+        body = self.sync(EQUIPMENT_URL, watermark)
+        self.assertEqual(body[CHANGES][0]['companies'], [str(self.company.id)])
+        companies = self.sync('/api/companies/changes/', watermark)[CHANGES]
+        self.assertEqual([company['id'] for company in companies], [str(self.company.id)])
+
+    def test_view_deletes_leave_tombstones(self):
+        """Test that deleting through the pages records the deleted rows."""
+        self.client.force_login(self.user)
+        self.client.post(reverse('delete_company', args=[self.company.id]))
+        self.client.post(reverse('delete_review', args=[self.reviews[0].id]))
+        self.assertEqual(
+            set(Tombstone.objects.values_list('model', 'object_id')),
+            {('company', self.company.id), ('review', self.reviews[0].id)},
+        )
+
+    def test_cascades_leave_tombstones(self):
+        """Test that rows deleted by a cascade are recorded."""
+        self.equipment.delete()
+        self.assertEqual(Tombstone.objects.filter(model='review').count(), REVIEW_ROWS)
+
+    def test_watermark_before_open_transactions(self):
+        """Test that the watermark stays before a transaction still in progress."""
+        other = connection.copy()
+        with other.cursor() as cursor:
+            cursor.execute('BEGIN')
+            cursor.execute('SELECT now()')
+            started = cursor.fetchone()[0]
+            watermark = safe_watermark()
+            cursor.execute('ROLLBACK')
+        other.close()
+        self.assertLessEqual(watermark, started)
@@ -0,0 +1,141 @@
+"""Tests for the conditional GET of detail pages and API objects."""
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+
+from companies_app.models import Category, Client, Company, CompanyEquipment, Equipment, Review
+from tests.query_budget import assert_query_budget
+
+NOT_MODIFIED = 304
+ETAG = 'ETag'
+# Session, user, the state of the object and the state of the user's companies.
+NOT_MODIFIED_QUERIES = 4
+
+
+class ConditionalSetUp(TestCase):
+    """Common setup of the conditional GET tests."""
+
+    def setUp(self):
+        """Set up the test environment with a reviewed equipment of a company."""
+        self.user = User.objects.create_user(username='user', is_superuser=True)
+        self.client_instance = Client.objects.create(user=self.user)
+        self.equipment = Equipment.objects.create(
+            title='Drill',
+            client=self.client_instance,
+            category=Category.objects.create(title='Tools'),
+        )
+        self.company = Company.objects.create(
+            title='Company', phone='1234567890', client=self.client_instance,
+        )
+        self.review = Review.objects.create(
+            text='Good', rating=5, equipment=self.equipment, client=self.client_instance,
+        )
+        self.client.force_login(self.user)
+        self.equipment_url = reverse('equipment_view', args=[self.equipment.id])
+
+    def revalidate(self, url, etag, status_code):
+        """
+        Request a URL with an ETag and check the status.
+
+        Args:
+            url (str): Requested URL.
+            etag (str): ETag of the copy held by the client.
+            status_code (int): Expected status.
+
+        Returns:
+            HttpResponse: Response of the request.
+        """
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status_code)
+        return response
+
+
+class ConditionalPageTest(ConditionalSetUp):
+    """Test case for ETag and Last-Modified revalidation of the detail pages."""
+
+    def test_save_bumps_modified(self):
+        """Test that saving an existing object updates modified, even with update_fields."""
+        before = self.equipment.modified
+        self.equipment.title = 'Saw'
+        self.equipment.save(update_fields=['title'])
+        self.equipment.refresh_from_db()
+        self.assertGreater(self.equipment.modified, before)
+
+    def test_page_not_modified(self):
+        """Test that an unchanged page is answered with 304 after the state queries."""
+        response = self.client.get(self.equipment_url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('no-cache', response['Cache-Control'])
+        self.assertTrue(response.has_header('Last-Modified'))
+        with assert_query_budget(self, NOT_MODIFIED_QUERIES):
+            self.revalidate(self.equipment_url, response[ETAG], NOT_MODIFIED)
+        modified_since = self.client.get(
+            self.equipment_url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'],
+        )
+        self.assertEqual(modified_since.status_code, NOT_MODIFIED)
+
+    def test_page_changes_with_children(self):
+        """Test that adding, editing and deleting reviews change the page state."""
+        etag = self.client.get(self.equipment_url)[ETAG]
+        other = Review.objects.create(
+            text='Bad', rating=1, equipment=self.equipment, client=self.client_instance,
+        )
+        etag = self.revalidate(self.equipment_url, etag, 200)[ETAG]
+        other.text = 'Poor'
+        other.save()
+        etag = self.revalidate(self.equipment_url, etag, 200)[ETAG]
+        self.review.delete()
+        etag = self.revalidate(self.equipment_url, etag, 200)[ETAG]
+        self.equipment.category.save()
+        self.revalidate(self.equipment_url, etag, 200)
+
+    def test_company_page_changes_with_links(self):
+        """Test that linking an equipment changes the company page state."""
+        url = reverse('company_detail', args=[self.company.id])
+        etag = self.client.get(url)[ETAG]
+        self.revalidate(url, etag, NOT_MODIFIED)
+        CompanyEquipment.objects.create(company=self.company, equipment=self.equipment)
+        etag = self.revalidate(url, etag, 200)[ETAG]
+        self.equipment.save()
+        self.revalidate(url, etag, 200)
+
+    def test_equipment_page_changes_with_companies(self):
+        """Test that the user's companies offered on the equipment page change its state."""
+        etag = self.client.get(self.equipment_url)[ETAG]
+        Company.objects.create(title='Garage', phone='1234567891', client=self.client_instance)
+        etag = self.revalidate(self.equipment_url, etag, 200)[ETAG]
+        self.revalidate(self.equipment_url, etag, NOT_MODIFIED)
+        CompanyEquipment.objects.create(company=self.company, equipment=self.equipment)
+        self.revalidate(self.equipment_url, etag, 200)
+
+    def test_page_etag_depends_on_user(self):
+        """Test that another user does not revalidate with the copy of the first one."""
+        etag = self.client.get(self.equipment_url)[ETAG]
+        self.client.force_login(User.objects.create_user(username='other'))
+        self.revalidate(self.equipment_url, etag, 200)
+
+
+class ConditionalAPITest(ConditionalSetUp):
+    """Test case for ETag revalidation of the API objects."""
+
+    def test_api_retrieve(self):
+        """Test that API objects revalidate until updated."""
+        url = reverse('equipment-detail', args=[self.equipment.id])
+        response = self.client.get(url)
+        self.assertIn('no-cache', response['Cache-Control'])
+        self.revalidate(url, response[ETAG], NOT_MODIFIED)
+        self.revalidate(f'{url}?format=api', response[ETAG], 200)
+        self.client.put(url, {'title': 'Saw'}, content_type='application/json')
+        self.revalidate(url, response[ETAG], 200)
+        self.assertEqual(self.client.get(reverse('equipment-detail', args=['x'])).status_code, 404)
+
+    def test_bulk_update_bumps_modified(self):
+        """Test that bulk updates set modified."""
+        before = self.equipment.modified
+        self.client.put(
+            reverse('equipment-bulk-create'),
+            [{'id': str(self.equipment.id), 'title': 'Saw'}],
+            content_type='application/json',
+        )
+        self.equipment.refresh_from_db()
+        self.assertGreater(self.equipment.modified, before)
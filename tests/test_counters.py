@@ -0,0 +1,73 @@
+"""Tests for the cached homepage counters."""
+from types import MappingProxyType
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from companies_app.counters import get_counters, invalidate_counters
+from companies_app.models import Company, Equipment, Review
+from tests.query_budget import assert_query_budget
+
+COMPANIES = 'companies'
+COUNTS = MappingProxyType({COMPANIES: 1, 'equipments': 2, 'reviews': 1})
+
+
+class CountersTest(TestCase):
+    """Test case for computing, caching and updating the homepage counters."""
+
+    def setUp(self):
+        """Set up the test environment with an empty cache and a few rows."""
+        cache.clear()
+        self.company = Company.objects.create(title='Company', phone='1234567890')
+        self.equipment = Equipment.objects.create(title='Drill')
+        Equipment.objects.create(title='Saw')
+        Review.objects.create(text='Good', rating=5, equipment=self.equipment)
+
+    def test_exact_counts_follow_writes(self):
+        """Test that exact counters are cached and shifted by creates and deletes."""
+        self.assertEqual(get_counters(), COUNTS)
+        with self.captureOnCommitCallbacks(execute=True):
+            Company.objects.create(title='Other', phone='1234567890')
+            self.equipment.delete()
+        with assert_query_budget(self, 0):
+            counters = get_counters()
+        self.assertEqual(counters, {COMPANIES: 2, 'equipments': 1, 'reviews': 0})
+
+    @override_settings(COUNTERS_TIMEOUT=60)
+    def test_exact_counts_expire(self):
+        """Test that exact counters are recounted once expired, as shifts may miss processes."""
+        with mock.patch.object(cache, 'set_many', wraps=cache.set_many) as set_many:
+            get_counters()
+            set_many.assert_called_once_with(mock.ANY, 60)
+
+    @override_settings(COUNTERS_MODE='refresh')
+    def test_refresh_counts_are_cached(self):
+        """Test that refreshed counters keep the cached value until invalidated."""
+        self.assertEqual(get_counters(), COUNTS)
+        Company.objects.create(title='Other', phone='1234567890')
+        self.assertEqual(get_counters()[COMPANIES], 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            invalidate_counters(Company)
+        self.assertEqual(get_counters()[COMPANIES], 2)
+
+    @override_settings(COUNTERS_MODE='estimate')
+    def test_estimate_counts_small_tables_exactly(self):
+        """Test that estimated counters fall back to an exact count on small tables."""
+        self.assertEqual(get_counters(), COUNTS)
+
+    @override_settings(COUNTERS_MODE='approximate')
+    def test_unknown_mode(self):
+        """Test that an unknown mode is reported as a configuration error."""
+        with self.assertRaises(ImproperlyConfigured):
+            get_counters()
+
+    def test_homepage(self):
+        """Test that the homepage renders the cached counters without counting rows."""
+        get_counters()
+        with assert_query_budget(self, 0):
+            response = self.client.get(reverse('homepage'))
+        for name, count in COUNTS.items():
+            self.assertEqual(response.context[name], count)
@@ -0,0 +1,102 @@
+"""Tests for the N+1 query detector."""
+from django.contrib.auth.models import User
+from django.shortcuts import render
+from django.test import TestCase, override_settings
+from django.urls import include, path, reverse
+
+from companies_app.duplicates import DuplicateQueriesError, suggest_prefetch
+from companies_app.models import Category, Client, Company, Equipment
+from companies_app.pagination import KeysetPaginator
+
+EQUIPMENT_COUNT = 3
+N_PLUS_ONE_URL = '/n-plus-one/'
+REVIEWS_OF_EQUIPMENT = 'SELECT * FROM "companies_schema"."review" WHERE "companies_schema"."review"."equipment_id" = %s'  # noqa: WPS323, E501
+EQUIPMENT_OF_COMPANY = 'SELECT * FROM "companies_schema"."equipment" INNER JOIN "companies_schema"."company_equipment" ON (TRUE) WHERE "companies_schema"."company_equipment"."company_id" = %s'  # noqa: WPS323, E501
+
+
+def equipments_without_joins(request):
+    """
+    Render the equipments page without loading the owners and categories upfront.
+
+    Args:
+        request: Request object.
+
+    Returns:
+        HttpResponse: Rendered HTML template.
+    """
+    page = KeysetPaginator(Equipment.objects.all(), ('title', 'size')).page(None)
+    return render(request, 'pages/equipments.html', {'equipments': page})
+
+
+urlpatterns = [
+    path(N_PLUS_ONE_URL.lstrip('/'), equipments_without_joins),
+    path('', include('companies.urls')),
+]
+
+
+@override_settings(ROOT_URLCONF=__name__, DUPLICATE_QUERIES='raise')
+class DuplicateQueriesTest(TestCase):
+    """Test case for detecting and reporting repeated queries."""
+
+    def setUp(self):
+        """Set up the test environment with equipment of one client linked to a company."""
+        self.user = User.objects.create_user(username='user')
+        client = Client.objects.create(user=self.user)
+        company = Company.objects.create(title='Company', phone='1234567890', client=client)
+        for index in range(EQUIPMENT_COUNT):
+            equipment = Equipment.objects.create(
+                title=f'Drill {index}',
+                client=client,
+                category=Category.objects.create(title=f'Tools {index}'),
+            )
+            company.equipments.add(equipment)
+        self.client.force_login(self.user)
+
+    def test_raise(self):
+        """Test that a loop over unjoined relations fails the request."""
+        with self.assertRaisesMessage(DuplicateQueriesError, f'{EQUIPMENT_COUNT} x SELECT'):
+            self.client.get(N_PLUS_ONE_URL)
+
+    @override_settings(DUPLICATE_QUERIES='log')
+    def test_log(self):
+        """Test that the logged report names the origin and the remedy of each repeat."""
+        with self.assertLogs('companies_app.duplicates', 'WARNING') as logs:
+            response = self.client.get(N_PLUS_ONE_URL)
+            report = logs.records[0].getMessage()
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(f'GET {N_PLUS_ONE_URL} repeated', report)
+        self.assertIn('template pages/equipments.html:16', report)
+        self.assertIn('tests/test_duplicates.py', report)
+        self.assertIn("Equipment.objects.select_related('client')", report)
+        self.assertIn("Equipment.objects.select_related('category')", report)
+
+    @override_settings(DUPLICATE_QUERIES='log', DUPLICATE_QUERIES_THRESHOLD=1)
+    def test_threshold_of_one(self):
+        """Test that a shape run once is reported with its origin at a threshold of 1."""
+        with self.assertLogs('companies_app.duplicates', 'WARNING') as logs:
+            response = self.client.get(N_PLUS_ONE_URL)
+            report = logs.records[0].getMessage()
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('1 x SELECT "django_session"', report)
+
+    @override_settings(DUPLICATE_QUERIES='off')
+    def test_off(self):
+        """Test that the detector does nothing when off."""
+        self.assertEqual(self.client.get(N_PLUS_ONE_URL).status_code, 200)
+
+    def test_pages_and_api_do_not_repeat_queries(self):
+        """Test that the joined pages and the prefetched API lists pass the detector."""
+        for url in (reverse('equipments'), reverse('equipment-list'), reverse('company-list')):
+            self.assertEqual(self.client.get(url).status_code, 200, url)
+
+    def test_suggest_prefetch(self):
+        """Test that reverse and many-to-many lookups suggest prefetch_related."""
+        self.assertEqual(
+            suggest_prefetch(REVIEWS_OF_EQUIPMENT),
+            "Equipment.objects.prefetch_related('reviews')",
+        )
+        self.assertEqual(
+            suggest_prefetch(EQUIPMENT_OF_COMPANY),
+            "Company.objects.prefetch_related('equipments')",
+        )
+        self.assertEqual(suggest_prefetch('SELECT 1'), '')
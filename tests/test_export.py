@@ -0,0 +1,86 @@
+"""Tests for the streaming export."""
+import csv
+import json
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from companies_app.export import EXPORT_NAMES, FORMATS, export_chunks
+from companies_app.models import Address, Category, Company, CompanyEquipment, Equipment, Review
+
+
+class ExportTest(TestCase):
+    """Test case for streaming tables as NDJSON and CSV."""
+
+    def setUp(self):
+        """Set up the test environment with a row in every exported table."""
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user(username='user'))
+        category = Category.objects.create(title='Tools')
+        self.equipment = Equipment.objects.create(title='Drill', category=category)
+        Equipment.objects.create(title='Saw')
+        address = Address.objects.create(
+            street_name='Main', city='Kazan', state='Tatarstan', house_number=1,
+        )
+        company = Company.objects.create(title='Company', phone='1234567890', address=address)
+        CompanyEquipment.objects.create(company=company, equipment=self.equipment)
+        Review.objects.create(text='Good, "really"', rating=5, equipment=self.equipment)
+
+    def export(self, name, export_format):
+        """
+        Download an export through the API.
+
+        Args:
+            name (str): Export name.
+            export_format (str): Export format.
+
+        Returns:
+            str: Downloaded text.
+        """
+        url = reverse('export', args=[name, export_format])
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode()
+
+    def test_ndjson(self):
+        """Test that NDJSON exports hold one object per row, encoded chunk by chunk."""
+        lines = self.export('equipment', 'ndjson').splitlines()
+        rows = {row['title']: row for row in map(json.loads, lines)}
+        self.assertEqual(set(rows), {'Drill', 'Saw'})
+        self.assertEqual(rows['Drill']['id'], str(self.equipment.id))
+        self.assertEqual(rows['Drill']['category_title'], 'Tools')
+        self.assertIsNone(rows['Saw']['category_title'])
+        chunks = list(export_chunks('equipment', 'ndjson', chunk_size=1))
+        self.assertEqual(len(chunks), len(lines))
+
+    def test_csv(self):
+        """Test that CSV exports start with a header and quote values."""
+        rows = list(csv.DictReader(StringIO(self.export('reviews', 'csv'))))
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]['text'], 'Good, "really"')
+        self.assertEqual(rows[0]['equipment_id'], str(self.equipment.id))
+
+    def test_every_export(self):
+        """Test that every table is exported in every format."""
+        for name in EXPORT_NAMES:
+            for export_format in FORMATS:
+                self.assertTrue(self.export(name, export_format))
+
+    def test_unknown_export(self):
+        """Test that unknown tables and formats are not found."""
+        for name, export_format in (('users', 'csv'), ('reviews', 'xml')):
+            response = self.client.get(reverse('export', args=[name, export_format]))
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_command(self):
+        """Test that the command writes the export to the standard output."""
+        out = StringIO()
+        call_command('export_data', 'companies', '--format', 'csv', stdout=out)
+        rows = list(csv.DictReader(StringIO(out.getvalue())))
+        self.assertEqual(rows[0]['address_city'], 'Kazan')
@@ -0,0 +1,111 @@
+"""Tests for the sparse fieldsets and relation expansion of the API."""
+from django.contrib.auth.models import User
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from companies_app.models import (
+    Address,
+    Category,
+    Client,
+    Company,
+    CompanyEquipment,
+    Equipment,
+    Review,
+)
+from tests.query_budget import assert_query_budget
+
+EQUIPMENT_URL = '/api/equipment/'
+PAGE_ROWS = 'results'
+EQUIPMENT_ROWS = 3
+# The equipment page with its category, client and user joined.
+EXPANDED_PAGE_QUERIES = 1
+# Companies with their addresses, their equipment, and the companies of that equipment.
+EXPANDED_COMPANIES_QUERIES = 3
+
+
+class FieldsetsTest(TestCase):
+    """Test case for the ?fields= and ?expand= parameters of the model endpoints."""
+
+    def setUp(self):
+        """Set up the test environment with equipment of a company at an address."""
+        self.user = User.objects.create_user(username='user', first_name='Ann', is_superuser=True)
+        self.client_instance = Client.objects.create(user=self.user)
+        category = Category.objects.create(title='Tools')
+        self.company = Company.objects.create(
+            title='Workshop',
+            phone='1234567890',
+            client=self.client_instance,
+            address=Address.objects.create(
+                street_name='Main', city='Town', state='State', house_number=1,
+            ),
+        )
+        self.equipments = [
+            Equipment.objects.create(
+                title=f'Drill {index}', category=category, client=self.client_instance,
+            )
+            for index in range(EQUIPMENT_ROWS)
+        ]
+        for equipment in self.equipments:
+            CompanyEquipment.objects.create(company=self.company, equipment=equipment)
+        self.api = APIClient()
+        self.api.force_authenticate(self.user)
+
+    def test_fields_narrow_rows_and_columns(self):
+        """Test that only the selected fields are returned and read from the database."""
+        with assert_query_budget(self, 1) as queries:
+            response = self.api.get(EQUIPMENT_URL, {'fields': 'id,title'})
+            statements = ' '.join(query['sql'] for query in queries.captured_queries)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        for row in response.json()[PAGE_ROWS]:
+            self.assertEqual(set(row), {'id', 'title'})
+        self.assertNotIn('rating_sum', statements)
+        self.assertNotIn('company_equipment', statements)
+
+    def test_expand_foreign_keys(self):
+        """Test that expanded relations are nested objects loaded with the main query."""
+        with assert_query_budget(self, EXPANDED_PAGE_QUERIES):
+            response = self.api.get(
+                EQUIPMENT_URL, {'fields': 'title', 'expand': 'category,client'},
+            )
+        rows = response.json()[PAGE_ROWS]
+        self.assertEqual(len(rows), EQUIPMENT_ROWS)
+        self.assertEqual(set(rows[0]), {'title', 'category', 'client'})
+        self.assertEqual(rows[0]['category']['title'], 'Tools')
+        self.assertEqual(rows[0]['client']['username'], 'user')
+        self.assertEqual(rows[0]['client']['first_name'], 'Ann')
+
+    def test_expand_many_to_many(self):
+        """Test that an expanded many-to-many relation lists the related objects."""
+        with assert_query_budget(self, EXPANDED_COMPANIES_QUERIES):
+            response = self.api.get('/api/companies/', {'expand': 'equipments,address'})
+        company = response.json()[PAGE_ROWS][0]
+        self.assertEqual(company['address']['city'], 'Town')
+        self.assertEqual(len(company['equipments']), EQUIPMENT_ROWS)
+        self.assertEqual(company['equipments'][0]['companies'], [str(self.company.id)])
+
+    def test_retrieve(self):
+        """Test that a single object honours the fieldset and skips the conditional GET."""
+        review = Review.objects.create(
+            text='Good', rating=5, equipment=self.equipments[0], client=self.client_instance,
+        )
+        response = self.api.get(
+            f'/api/review/{review.id}/', {'fields': 'rating', 'expand': 'equipment'},
+        )
+        body = response.json()
+        self.assertEqual(set(body), {'rating', 'equipment'})
+        self.assertEqual(body['equipment']['title'], 'Drill 0')
+        self.assertNotIn('ETag', response)
+
+    def test_unknown_names(self):
+        """Test that unknown fields and relations that cannot be expanded are refused."""
+        response = self.api.get(EQUIPMENT_URL, {'fields': 'title,secret', 'expand': 'title'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(set(response.json()), {'fields', 'expand'})
+
+    def test_writes_ignore_fieldset(self):
+        """Test that a create request validates and returns every field."""
+        response = self.api.post(f'{EQUIPMENT_URL}?fields=title', {'title': 'Saw', 'size': 3})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.json()['size'], 3)
+        self.assertTrue(Equipment.objects.filter(title='Saw', size=3).exists())
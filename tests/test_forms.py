@@ -2,8 +2,7 @@
 from django.contrib.auth.models import User
 from django.test import TestCase
 
-from companies_app.forms import (CompanyForm, EquipmentForm, LoginForm,
-                                 RegistrationForm, ReviewForm)
+from companies_app.forms import CompanyForm, EquipmentForm, LoginForm, RegistrationForm, ReviewForm
 from companies_app.models import Category, Client, Equipment
 
 
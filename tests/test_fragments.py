@@ -0,0 +1,155 @@
+"""Tests for the versioned template fragment cache."""
+from django.contrib.auth.models import User
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from django.db import connection
+from django.db.models.deletion import Collector
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from companies_app.fragments import (
+    COMPANY_EQUIPMENT,
+    EQUIPMENT_LIST,
+    EQUIPMENT_REVIEWS,
+    fragment_version,
+    invalidate_fragments,
+    touched_fragments,
+)
+from companies_app.models import (
+    Category,
+    Client,
+    Company,
+    CompanyEquipment,
+    Equipment,
+    EquipmentRanking,
+    Review,
+    Tombstone,
+)
+
+
+def count_queries(client, url):
+    """
+    Request a URL and count its queries.
+
+    Args:
+        client: Test client.
+        url (str): Requested URL.
+
+    Returns:
+        tuple: Response and number of queries.
+    """
+    context = CaptureQueriesContext(connection)
+    with context:
+        response = client.get(url)
+    return response, len(context.captured_queries)
+
+
+@override_settings(FRAGMENT_CACHE_TIMEOUT=600)
+class FragmentsSetUp(TestCase):
+    """Common setup of the fragment cache tests."""
+
+    def setUp(self):
+        """Set up the test environment with an empty cache and a reviewed, linked equipment."""
+        cache.clear()
+        user = User.objects.create_user(username='user', is_superuser=True)
+        self.client_instance = Client.objects.create(user=user)
+        self.category = Category.objects.create(title='Tools')
+        self.equipment = Equipment.objects.create(
+            title='Drill', client=self.client_instance, category=self.category,
+        )
+        self.company = Company.objects.create(
+            title='Company', phone='1234567890', client=self.client_instance,
+        )
+        CompanyEquipment.objects.create(company=self.company, equipment=self.equipment)
+        self.review = Review.objects.create(
+            text='Good', rating=5, equipment=self.equipment, client=self.client_instance,
+        )
+        self.client.force_login(user)
+        self.equipment_url = reverse('equipment_view', args=[self.equipment.id])
+
+
+class FragmentPagesTest(FragmentsSetUp):
+    """Test case for serving cached page fragments and replacing them on writes."""
+
+    def test_cached_reviews_skip_queries(self):
+        """Test that a cached review list is served without reading the reviews."""
+        response, first_queries = count_queries(self.client, self.equipment_url)
+        self.assertContains(response, 'form="delete-review-form"')
+        response, cached_queries = count_queries(self.client, self.equipment_url)
+        self.assertContains(response, 'Good - Rating: 5')
+        self.assertLess(cached_queries, first_queries)
+
+    def test_review_writes_invalidate(self):
+        """Test that creating and deleting reviews replace the cached review list."""
+        self.client.get(self.equipment_url)
+        with self.captureOnCommitCallbacks(execute=True):
+            Review.objects.create(
+                text='Bad', rating=1, equipment=self.equipment, client=self.client_instance,
+            )
+        self.assertContains(self.client.get(self.equipment_url), 'Bad - Rating: 1')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.review.delete()
+        self.assertNotContains(self.client.get(self.equipment_url), 'Good - Rating: 5')
+
+    def test_uncommitted_writes_keep_fragments(self):
+        """Test that versions are replaced only once the write commits."""
+        self.client.get(self.equipment_url)
+        Review.objects.create(
+            text='Bad', rating=1, equipment=self.equipment, client=self.client_instance,
+        )
+        self.assertNotContains(self.client.get(self.equipment_url), 'Bad - Rating: 1')
+
+    def test_company_fragment_follows_equipment(self):
+        """Test that renaming or unlinking an equipment replaces the cached company page."""
+        company_url = reverse('company_detail', args=[self.company.id])
+        self.assertContains(self.client.get(company_url), 'Drill')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.equipment.title = 'Hammer'
+            self.equipment.save()
+        self.assertContains(self.client.get(company_url), 'Hammer')
+        with self.captureOnCommitCallbacks(execute=True):
+            CompanyEquipment.objects.filter(company=self.company).delete()
+        self.assertContains(self.client.get(company_url), 'No equipments found.')
+
+    def test_equipment_list_follows_category(self):
+        """Test that renaming a category replaces the cached equipment list."""
+        equipments_url = reverse('equipments')
+        self.assertContains(self.client.get(equipments_url), 'Tools')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.category.title = 'Machines'
+            self.category.save()
+        self.assertContains(self.client.get(equipments_url), 'Machines')
+
+
+class FragmentVersionsTest(FragmentsSetUp):
+    """Test case for the fragments touched by writes and their versions."""
+
+    def test_touched_fragments(self):
+        """Test that a write touches the fragments showing the object and its links."""
+        self.assertEqual(
+            touched_fragments(Equipment, [self.equipment]),
+            {(EQUIPMENT_LIST, None), (COMPANY_EQUIPMENT, self.company.pk)},
+        )
+        self.assertEqual(
+            touched_fragments(Review, [self.review]),
+            {(EQUIPMENT_REVIEWS, self.equipment.pk)},
+        )
+
+    def test_versions_never_come_back(self):
+        """Test that a replaced or evicted version never comes back."""
+        version = fragment_version(EQUIPMENT_REVIEWS, self.equipment.pk)
+        self.assertEqual(fragment_version(EQUIPMENT_REVIEWS, self.equipment.pk), version)
+        with self.captureOnCommitCallbacks(execute=True):
+            invalidate_fragments()
+        invalidated = fragment_version(EQUIPMENT_REVIEWS, self.equipment.pk)
+        self.assertNotEqual(invalidated, version)
+        cache.clear()
+        evicted = fragment_version(EQUIPMENT_REVIEWS, self.equipment.pk)
+        self.assertNotIn(evicted, {version, invalidated})
+
+    def test_other_models_are_fast_deleted(self):
+        """Test that no receiver keeps the models no fragment shows from being fast deleted."""
+        collector = Collector(using=connection.alias)
+        for model in (Session, Tombstone, EquipmentRanking):
+            self.assertTrue(collector.can_fast_delete(model.objects.all()), model)
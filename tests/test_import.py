@@ -0,0 +1,116 @@
+"""Tests for the bulk import."""
+import json
+import os
+from io import StringIO
+from tempfile import TemporaryDirectory
+from uuid import uuid4
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+
+from companies_app.export import export_chunks
+from companies_app.importer import Importer
+from companies_app.models import Address, Client, Company, Equipment, Review
+
+COMPANIES_CSV = """id,title,phone,client_id,address_street_name,address_house_number,address_city,address_state
+,First,1234567890,{client},Main,1,Kazan,Tatarstan
+,Second,1234567890,,Main,1,Kazan,Tatarstan
+,Third,1234567890,,Other,2,Kazan,Tatarstan
+,No address,1234567890,,,,,
+,Bad phone,12,,,,,
+,Orphan,1234567890,{missing},,,,
+,Partial address,1234567890,,Main,,,
+"""
+
+
+class ImportTest(TestCase):
+    """Test case for loading files through the staging table."""
+
+    def setUp(self):
+        """Set up the test environment with a client, an equipment and an address."""
+        self.client_instance = Client.objects.create(user=User.objects.create_user(username='u'))
+        self.equipment = Equipment.objects.create(title='Drill')
+        Address.objects.create(
+            street_name='Other', house_number=2, city='Kazan', state='Tatarstan',
+        )
+
+    def run_import(self, name, source, import_format):
+        """
+        Import a text and collect the rejected records.
+
+        Args:
+            name (str): Import name.
+            source (str): Imported text.
+            import_format (str): csv or ndjson.
+
+        Returns:
+            tuple: Number of imported rows and rejected records by line.
+        """
+        rejects = StringIO()
+        imported = Importer(name, rejects, batch_size=2).run(StringIO(source), import_format)
+        rejected = map(json.loads, rejects.getvalue().splitlines())
+        return imported, {reject['line']: reject['errors'] for reject in rejected}
+
+    def test_companies(self):
+        """Test that companies are loaded and the bad rows rejected."""
+        source = COMPANIES_CSV.format(client=self.client_instance.id, missing=uuid4())
+        imported, rejected = self.run_import('companies', source, 'csv')
+        self.assertEqual(imported, 4)
+        self.assertEqual(set(rejected), {6, 7, 8})
+        self.assertIn('phone', rejected[6])
+        self.assertEqual(rejected[7], {'client_id': ['Not found.']})
+        self.assertIn('address_house_number', rejected[8])
+        self.assertEqual(Company.objects.get(title='First').client, self.client_instance)
+
+    def test_company_addresses(self):
+        """Test that the addresses of the loaded companies are deduplicated."""
+        source = COMPANIES_CSV.format(client=self.client_instance.id, missing=uuid4())
+        self.run_import('companies', source, 'csv')
+        self.assertEqual(Address.objects.count(), 2)
+        first, second, third = (
+            Company.objects.get(title=title) for title in ('First', 'Second', 'Third')
+        )
+        self.assertEqual(first.address_id, second.address_id)
+        self.assertEqual(third.address.street_name, 'Other')
+        self.assertIsNone(Company.objects.get(title='No address').address)
+
+    def test_reviews(self):
+        """Test that reviews are validated, deduplicated by id and counted in the ratings."""
+        review_id = str(uuid4())
+        lines = [
+            {'id': review_id, 'text': 'Bad', 'rating': 1, 'equipment_id': str(self.equipment.id)},
+            {'id': review_id, 'text': 'Good', 'rating': 4, 'equipment_id': str(self.equipment.id)},
+            {'text': 'Great', 'rating': 5, 'equipment_id': str(self.equipment.id)},
+            {'text': 'Too good', 'rating': 6, 'equipment_id': str(self.equipment.id)},
+        ]
+        source = '\n'.join([*map(json.dumps, lines), 'not json', ''])
+        imported, rejected = self.run_import('reviews', source, 'ndjson')
+        self.assertEqual(imported, 2)
+        self.assertEqual(set(rejected), {1, 4, 5})
+        self.assertIn('rating', rejected[4])
+        self.assertEqual(Review.objects.get(id=review_id).text, 'Good')
+        self.equipment.refresh_from_db()
+        self.assertEqual((self.equipment.rating_count, self.equipment.rating_sum), (2, 9))
+
+    def test_export_round_trip(self):
+        """Test that an export imports back as updates of the same rows."""
+        exported = ''.join(export_chunks('equipment', 'csv'))
+        Equipment.objects.update(title='Changed')
+        imported, rejected = self.run_import('equipment', exported, 'csv')
+        self.assertEqual((imported, rejected), (1, {}))
+        self.assertEqual(Equipment.objects.get().title, 'Drill')
+
+    def test_command(self):
+        """Test that the command reports the loading rate and writes the rejects file."""
+        with TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'equipment.csv')
+            with open(path, 'w') as source:
+                source.write('title,size\nSaw,2\nHammer,0\n')
+            out = StringIO()
+            call_command('import_data', 'equipment', path, stdout=out)
+            with open(f'{path}.rejects.ndjson') as rejects:
+                self.assertEqual(len(rejects.readlines()), 1)
+        self.assertIn('rows/s', out.getvalue())
+        self.assertIn('rejected 1', out.getvalue())
+        self.assertTrue(Equipment.objects.filter(title='Saw', size=2).exists())
@@ -0,0 +1,159 @@
+"""Tests checking that the main queries of the views are served by indexes."""
+from itertools import product
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from companies_app.models import (
+    Address,
+    Category,
+    Client,
+    Company,
+    CompanyEquipment,
+    Equipment,
+    Review,
+)
+
+SEEDED_CLIENTS = 10
+ROWS_PER_CLIENT = 20
+APP_SCHEMA = 'companies_schema'
+SEARCH_TERM = 'Street'
+
+
+def seed_owned_rows(clients, categories, addresses):
+    """
+    Create companies, equipment, links and reviews owned by the clients.
+
+    Args:
+        clients (list): Owners of the rows.
+        categories (list): Categories of the equipment.
+        addresses (list): Addresses of the companies.
+    """
+    companies = Company.objects.bulk_create([
+        Company(
+            title=f'Company {address.house_number}', phone='1234567890', address=address,
+            client=client,
+        )
+        for client, address in product(clients, addresses)
+    ])
+    equipments = Equipment.objects.bulk_create([
+        Equipment(title=f'Equipment {category.title}', size=1, category=category, client=client)
+        for client, category in product(clients, categories)
+    ])
+    CompanyEquipment.objects.bulk_create([
+        CompanyEquipment(company=company, equipment=equipment)
+        for company, equipment in zip(companies, equipments)
+    ])
+    Review.objects.bulk_create([
+        Review(text=f'Review {equipment.title}', rating=5, client=client, equipment=equipment)
+        for client, equipment in product(clients, equipments[:ROWS_PER_CLIENT])
+    ])
+
+
+def seed_dataset():
+    """
+    Create clients owning categories, addresses, companies, equipment, links and reviews.
+
+    Returns:
+        list: The created clients.
+    """
+    clients = [
+        Client.objects.create(user=User.objects.create_user(username=f'user{index}'))
+        for index in range(SEEDED_CLIENTS)
+    ]
+    categories = Category.objects.bulk_create([
+        Category(title=f'Category {index}') for index in range(ROWS_PER_CLIENT)
+    ])
+    addresses = Address.objects.bulk_create([
+        Address(street_name=f'Street {index}', city='City', state='State', house_number=index + 1)
+        for index in range(ROWS_PER_CLIENT)
+    ])
+    seed_owned_rows(clients, categories, addresses)
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+    return clients
+
+
+def create_plan_test(page_name, url_arg=None, method='get'):
+    """
+    Create a test method checking the query plans of a page.
+
+    Args:
+        page_name (str): The name of the page being tested.
+        url_arg (str, optional): Attribute of the test case passed as URL argument.
+        method (str, optional): HTTP method of the request.
+
+    Returns:
+        method: A test method for the specified page.
+    """
+
+    def test(self):
+        url_args = [getattr(self, url_arg)] if url_arg else []
+        form_data = {'company_id': self.company_id} if method == 'post' else {'q': SEARCH_TERM}
+        context = CaptureQueriesContext(connection)
+        with context:
+            response = getattr(self.client, method)(reverse(page_name, args=url_args), form_data)
+        self.assertLess(response.status_code, status.HTTP_400_BAD_REQUEST)
+        for query in context.captured_queries:
+            self.assert_no_seq_scan(query['sql'])
+
+    return test
+
+
+class QueryPlanSetUp(TestCase):
+    """Base test case running requests against a seeded dataset with sequential scans disabled."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Seed the dataset shared by the tests."""
+        cls.clients = seed_dataset()
+
+    def setUp(self):
+        """Log in as a seeded client and make the planner avoid sequential scans where possible."""
+        client = self.clients[0]
+        self.client.force_login(client.user)
+        self.user_id = client.user.id
+        self.equipment_id = Equipment.objects.filter(client=client).first().id
+        self.company_id = Company.objects.filter(client=client).first().id
+        with connection.cursor() as cursor:
+            cursor.execute('SET enable_seqscan = off')
+
+    def tearDown(self):
+        """Restore the planner settings."""
+        with connection.cursor() as cursor:
+            cursor.execute('RESET enable_seqscan')
+
+    def assert_no_seq_scan(self, sql: str):
+        """
+        Fail when the plan of a query over the application tables has a sequential scan.
+
+        With enable_seqscan off the planner only picks one when no index can serve the query.
+
+        Args:
+            sql (str): Executed SQL statement.
+        """
+        if APP_SCHEMA not in sql or not sql.startswith('SELECT'):
+            return
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN {sql}')
+            plan = '\n'.join(row[0] for row in cursor.fetchall())
+        self.assertNotIn('Seq Scan', plan, f'{sql}\n{plan}')
+
+
+plan_pages = (
+    ('equipments',),
+    ('companies',),
+    ('profile',),
+    ('profile_by_id', 'user_id'),
+    ('equipment_view', 'equipment_id'),
+    ('company_detail', 'company_id'),
+    ('add_equipment_to_company', 'equipment_id', 'post'),
+    ('search',),
+    ('company-autocomplete-list',),
+)
+plan_methods = {f'test_{page[0]}': create_plan_test(*page) for page in plan_pages}
+TestQueryPlans = type('TestQueryPlans', (QueryPlanSetUp,), plan_methods)
@@ -0,0 +1,83 @@
+"""Tests for the request instrumentation middleware."""
+import json
+import logging
+import re
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from companies_app.instrumentation import RequestMetrics
+from companies_app.models import Client, Equipment
+
+LOGGER = 'companies_app.instrumentation'
+SERVER_TIMING_HEADER = 'Server-Timing'
+SERVER_TIMING = re.compile(
+    r'^db;dur=[\d.]+;desc="(\d+) queries", template;dur=([\d.]+), view;dur=[\d.]+$',
+)
+
+
+class InstrumentationTest(TestCase):
+    """Test case for the Server-Timing header and the request log."""
+
+    def setUp(self):
+        """Set up the test environment with a logged in user."""
+        self.user = User.objects.create_user(username='user')
+        Equipment.objects.create(title='Drill', client=Client.objects.create(user=self.user))
+        self.client.force_login(self.user)
+        self.url = reverse('equipments')
+
+    def test_server_timing(self):
+        """Test that the header reports the queries and the template render time."""
+        response = self.client.get(self.url)
+        timing = SERVER_TIMING.match(response[SERVER_TIMING_HEADER])
+        self.assertIsNotNone(timing, response[SERVER_TIMING_HEADER])
+        self.assertGreater(int(timing.group(1)), 0)
+        self.assertGreater(float(timing.group(2)), 0)
+
+    def test_api_has_no_template_time(self):
+        """Test that a JSON API response spends no time in templates."""
+        response = self.client.get(reverse('equipment-list'))
+        timing = SERVER_TIMING.match(response[SERVER_TIMING_HEADER])
+        self.assertEqual(float(timing.group(2)), 0)
+
+    @override_settings(INSTRUMENTATION_SAMPLE_RATE=0)
+    def test_unsampled_request(self):
+        """Test that requests out of the sample are not measured."""
+        response = self.client.get(self.url)
+        self.assertNotIn(SERVER_TIMING_HEADER, response)
+
+    def test_request_log(self):
+        """Test that a sampled request is logged without its full SQL."""
+        with self.assertLogs(LOGGER, 'INFO') as logs:
+            self.client.get(self.url)
+            record = logs.records[0]
+        self.assertEqual(record.levelname, 'INFO')
+        entry = json.loads(record.getMessage())
+        self.assertEqual(entry['path'], self.url)
+        self.assertEqual(entry['status'], 200)
+        self.assertLessEqual(len(entry['slowest']), 3)
+        self.assertNotIn('sql', entry)
+
+    @override_settings(INSTRUMENTATION_SLOW_MS=60000)
+    def test_discarded_entry_is_not_built(self):
+        """Test that no log entry is built while the logger discards it."""
+        request_logger = logging.getLogger(LOGGER)
+        self.addCleanup(request_logger.setLevel, request_logger.level)
+        request_logger.setLevel(logging.WARNING)
+        with mock.patch.object(RequestMetrics, 'log_entry') as log_entry:
+            response = self.client.get(self.url)
+            log_entry.assert_not_called()
+        self.assertIn(SERVER_TIMING_HEADER, response)
+
+    @override_settings(INSTRUMENTATION_SLOW_MS=0)
+    def test_slow_request_log(self):
+        """Test that a slow request is logged as a warning with every statement."""
+        with self.assertLogs(LOGGER, 'WARNING') as logs:
+            self.client.get(self.url)
+            entry = json.loads(logs.records[0].getMessage())
+        statements = entry['sql']
+        self.assertEqual(len(statements), entry['queries'])
+        self.assertIn(entry['slowest'][0]['sql'], statements)
+        self.assertTrue(any('companies_schema' in sql for sql in statements))
@@ -0,0 +1,135 @@
+"""Tests for the equipment leaderboards and their ranking tables."""
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from companies_app.leaderboards import current_week, rebuild_rankings, week_start
+from companies_app.models import (
+    Category,
+    Client,
+    Equipment,
+    EquipmentRanking,
+    RankingPrior,
+    Review,
+)
+from tests.query_budget import assert_query_budget
+
+TOP_RATED_URL = '/api/leaderboards/top-rated/'
+TRENDING_URL = '/api/leaderboards/trending/'
+REVIEW_URL = '/api/review/'
+RANKED_FIELDS = ('rating_count', 'rating_sum', 'score', 'week', 'week_reviews')
+MANY_REVIEWS = 20
+
+
+class LeaderboardsTestCase(TestCase):
+    """Base test case with reviewed equipment and helpers reading their rankings."""
+
+    def setUp(self):
+        """Set up the test environment with a single 5 and many 4 in two categories."""
+        self.user = User.objects.create_user(username='user', is_superuser=True)
+        self.client_instance = Client.objects.create(user=self.user)
+        self.tools = Category.objects.create(title='Tools')
+        self.single = self._equipment('Single', self.tools)
+        self.popular = self._equipment('Popular', Category.objects.create(title='Garden'))
+        self._review(self.single, 5)
+        for _ in range(MANY_REVIEWS):
+            self._review(self.popular, 4)
+        self.api = APIClient()
+        self.api.force_authenticate(self.user)
+
+    def _equipment(self, title: str, category) -> Equipment:
+        return Equipment.objects.create(
+            title=title, category=category, client=self.client_instance,
+        )
+
+    def _review(self, equipment, rating: int, **extra) -> Review:
+        return Review.objects.create(
+            text='Review', rating=rating, equipment=equipment, client=self.client_instance,
+            **extra,
+        )
+
+    def _rankings(self) -> list:
+        rankings = EquipmentRanking.objects.order_by('equipment__title')
+        return list(rankings.values_list(*RANKED_FIELDS))
+
+
+class LeaderboardsTest(LeaderboardsTestCase):
+    """Test case for the leaderboards served from the ranking tables."""
+
+    def test_bayesian_average_order(self):
+        """Test that many good reviews outrank a single perfect one, in one query."""
+        with assert_query_budget(self, 1):
+            response = self.api.get(TOP_RATED_URL)
+        entries = response.json()
+        self.assertEqual([entry['title'] for entry in entries], ['Popular', 'Single'])
+        self.assertEqual([entry['rank'] for entry in entries], [1, 2])
+        self.assertEqual(entries[1]['rating_mean'], 5)
+        self.assertLess(entries[1]['score'], entries[0]['score'])
+
+    def test_category_leaderboard(self):
+        """Test that a leaderboard is limited to its category, and refused for an invalid one."""
+        response = self.api.get(TOP_RATED_URL, {'category': self.tools.id})
+        self.assertEqual([entry['title'] for entry in response.json()], ['Single'])
+        response = self.api.get(TRENDING_URL, {'category': 'tools'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_trending_counts_this_week(self):
+        """Test that reviews from before Monday are neither counted nor uncounted."""
+        old = self._review(self.single, 5, created=week_start(current_week()) - timedelta(days=1))
+        self._review(self.single, 5)
+        old.delete()
+        entries = self.api.get(TRENDING_URL).json()
+        self.assertEqual(
+            [(entry['title'], entry['week_reviews']) for entry in entries],
+            [('Popular', MANY_REVIEWS), ('Single', 2)],
+        )
+
+    def test_page(self):
+        """Test that the page lists both leaderboards, and refuses an unknown category."""
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('leaderboards'), {'category': self.tools.id})
+        self.assertContains(response, 'Best Tools')
+        self.assertEqual(list(response.context['top_rated']), [self.single.ranking])
+        response = self.client.get(reverse('leaderboards'), {'category': 'tools'})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class RankingsTest(LeaderboardsTestCase):
+    """Test case for the ranking tables kept in sync with the reviews."""
+
+    def test_incremental_writes_match_rebuild(self):
+        """Test that API creates, updates and deletes leave the rankings a rebuild computes."""
+        created = self.api.post(
+            REVIEW_URL, {'text': 'Moved', 'rating': 2, 'equipment': self.single.id},
+        ).json()
+        review_id = created['id']
+        self.api.patch(f'{REVIEW_URL}{review_id}/', {'rating': 3, 'equipment': self.popular.id})
+        deleted_id = self.single.reviews.first().id
+        self.api.delete(f'{REVIEW_URL}{deleted_id}/')
+        incremental = self._rankings()
+        rebuild_rankings([self.single.id, self.popular.id])
+        self.assertEqual(self._rankings(), incremental)
+
+    def test_deleted_equipment_leaves_no_ranking(self):
+        """Test that the reviews deleted with an equipment do not insert its ranking again."""
+        equipment_id = self.single.id
+        with self.captureOnCommitCallbacks(execute=True):
+            self.single.delete()
+        self.assertFalse(EquipmentRanking.objects.filter(equipment_id=equipment_id).exists())
+
+    def test_rebuild_command(self):
+        """Test that the rebuild command ranks bulk inserted reviews and refreshes the prior."""
+        Review.objects.bulk_create([
+            Review(text='Bulk', rating=1, equipment=self.single) for _ in range(MANY_REVIEWS)
+        ])
+        call_command('rebuild_leaderboards', stdout=StringIO())
+        ranking = EquipmentRanking.objects.get(equipment=self.single)
+        self.assertEqual(ranking.rating_count, MANY_REVIEWS + 1)
+        # One 5, twenty 4 and twenty 1.
+        self.assertEqual(RankingPrior.objects.get().mean, 105 / 41)
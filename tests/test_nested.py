@@ -0,0 +1,134 @@
+"""Tests for the nested equipment and company representations of the API."""
+from django.contrib.auth.models import User
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from companies_app.models import (
+    Address,
+    Category,
+    Client,
+    Company,
+    CompanyEquipment,
+    Equipment,
+    Review,
+)
+from companies_app.nested import RECENT_REVIEWS, company_details, equipment_details
+from companies_app.serializer_benchmark import SERIALIZED, run_serializers
+from tests.query_budget import assert_query_budget
+
+PAGE_ROWS = 'results'
+EQUIPMENT_ROWS = 3
+REVIEWS = RECENT_REVIEWS + 2
+# The equipment page, its recent reviews and its companies.
+EQUIPMENT_DETAILS_QUERIES = 3
+# The company page and its equipment.
+COMPANY_DETAILS_QUERIES = 2
+
+
+class NestedSetUp(TestCase):
+    """Common setup of the nested representations tests."""
+
+    def setUp(self):
+        """Set up the test environment with reviewed equipment of a company at an address."""
+        self.user = User.objects.create_user(username='user', is_superuser=True)
+        client_instance = Client.objects.create(user=self.user)
+        category = Category.objects.create(title='Tools')
+        self.company = Company.objects.create(
+            title='Workshop',
+            phone='1234567890',
+            client=client_instance,
+            address=Address.objects.create(
+                street_name='Main', city='Town', state='State', house_number=1,
+            ),
+        )
+        self.equipments = [
+            Equipment.objects.create(
+                title=f'Drill {index}', category=category, client=client_instance,
+            )
+            for index in range(EQUIPMENT_ROWS)
+        ]
+        for equipment in self.equipments:
+            CompanyEquipment.objects.create(company=self.company, equipment=equipment)
+        self.reviews = [
+            Review.objects.create(
+                text=f'Review {index}', rating=5, equipment=self.equipments[0],
+                client=client_instance,
+            )
+            for index in range(REVIEWS)
+        ]
+        self.api = APIClient()
+        self.api.force_authenticate(self.user)
+
+
+class NestedRepresentationTest(NestedSetUp):
+    """Test case for the nested equipment and company endpoints."""
+
+    def test_equipment_details(self):
+        """Test that an equipment comes with its category, rating, recent reviews and companies."""
+        with assert_query_budget(self, EQUIPMENT_DETAILS_QUERIES):
+            response = self.api.get('/api/equipment-details/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        rows = {row['title']: row for row in response.json()[PAGE_ROWS]}
+        self.assertEqual(len(rows), EQUIPMENT_ROWS)
+        reviewed = rows['Drill 0']
+        self.assertEqual(reviewed['category']['title'], 'Tools')
+        self.assertEqual(reviewed['rating']['histogram']['5'], REVIEWS)
+        self.assertEqual(reviewed['companies'][0]['title'], 'Workshop')
+        self.assertEqual(reviewed['companies_count'], 1)
+        self.assertEqual(reviewed['recent_reviews'][0]['username'], 'user')
+        self.assertEqual(rows['Drill 1']['recent_reviews'], [])
+
+    def test_recent_reviews_bounded(self):
+        """Test that only the most recent reviews are nested, newest first."""
+        equipment = self.equipments[0]
+        response = self.api.get(f'/api/equipment-details/{equipment.id}/')
+        texts = [review['text'] for review in response.json()['recent_reviews']]
+        expected = sorted(self.reviews, key=lambda review: review.created, reverse=True)
+        self.assertEqual(texts, [review.text for review in expected[:RECENT_REVIEWS]])
+
+    def test_company_details(self):
+        """Test that a company comes with its address and its equipment."""
+        company_id = self.company.id
+        url = f'/api/company-details/{company_id}/'
+        with assert_query_budget(self, COMPANY_DETAILS_QUERIES):
+            response = self.api.get(url)
+        body = response.json()
+        self.assertEqual(body['address']['city'], 'Town')
+        self.assertEqual(body['equipment_count'], EQUIPMENT_ROWS)
+        self.assertEqual(
+            [equipment['title'] for equipment in body['equipment']],
+            [f'Drill {index}' for index in range(EQUIPMENT_ROWS)],
+        )
+        self.assertEqual(body['equipment'][0]['category'], 'Tools')
+
+    def test_read_only(self):
+        """Test that the nested endpoints refuse writes."""
+        response = self.api.post('/api/company-details/', {'title': 'Garage'})
+        self.assertEqual(response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+
+
+class NestedQueriesTest(NestedSetUp):
+    """Test case for the query count of the nested querysets."""
+
+    def test_queries_do_not_grow(self):
+        """Test that more rows and deeper relations do not add queries."""
+        querysets = (
+            (equipment_details, EQUIPMENT_DETAILS_QUERIES),
+            (company_details, COMPANY_DETAILS_QUERIES),
+        )
+        for queryset, expected in querysets:
+            with self.assertNumQueries(expected):
+                list(queryset()[:1])
+            with self.assertNumQueries(expected):
+                list(queryset())
+
+    def test_run_serializers(self):
+        """Test that every nested representation is benchmarked at every page size."""
+        measurements = run_serializers(repeat=2, page_sizes=(1, 50))
+        for name, _, _ in SERIALIZED:
+            self.assertIn(f'{name}-1', measurements)
+        self.assertEqual(measurements['equipment-details-1']['rows'], 1)
+        self.assertEqual(measurements['equipment-details-50']['rows'], EQUIPMENT_ROWS)
+        self.assertEqual(measurements['company-details-50']['queries'], COMPANY_DETAILS_QUERIES)
+        self.assertGreater(measurements['company-details-50']['rows_per_s'], 0)
@@ -0,0 +1,102 @@
+"""Tests for keyset pagination."""
+from django.contrib.auth.models import User
+from django.db import models
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+
+from companies_app.models import Client, Equipment
+from companies_app.pagination import DIRECTION_NEXT
+from companies_app.pagination import PAGE_SIZE as DEFAULT_PAGE_SIZE
+from companies_app.pagination import KeysetPaginator, encode_cursor
+
+PAGE_SIZE = 3
+SIZES = (None, 1, 2, None, 2)
+TITLES = ('Drill', 'Saw', 'Drill')
+# Key values of the wrong types for the (title, size, id) and (title, phone, id) keys.
+BAD_TYPED_KEYS = (['a', 'b', 'nope'], ['a', [1], {'id': 1}])
+
+
+class KeysetPaginatorTest(TestCase):
+    """Test case for walking pages with KeysetPaginator."""
+
+    def setUp(self):
+        """Set up the test environment with equipment sharing titles and NULL sizes."""
+        for title in TITLES:
+            for size in SIZES:
+                Equipment.objects.create(title=title, size=size)
+        self.expected = self.expected_all()
+        self.paginator = KeysetPaginator(Equipment.objects.all(), ('title', 'size'), PAGE_SIZE)
+
+    def test_walk_forward(self):
+        """Test that following next cursors visits every row once in order."""
+        page = self.paginator.page()
+        self.assertIsNone(page.previous_cursor)
+        visited = [equipment.id for equipment in page]
+        while page.next_cursor:
+            page = self.paginator.page(page.next_cursor)
+            self.assertIsNotNone(page.previous_cursor)
+            visited.extend(equipment.id for equipment in page)
+        self.assertEqual(visited, self.expected)
+
+    def test_walk_backward(self):
+        """Test that following previous cursors from the last page returns every row in order."""
+        page = self.paginator.page()
+        while page.next_cursor:
+            page = self.paginator.page(page.next_cursor)
+        visited = [equipment.id for equipment in page]
+        while page.previous_cursor:
+            page = self.paginator.page(page.previous_cursor)
+            self.assertIsNotNone(page.next_cursor)
+            visited = [equipment.id for equipment in page] + visited
+        self.assertEqual(visited, self.expected)
+        self.assertEqual(len(page), PAGE_SIZE)
+
+    def test_malformed_cursor(self):
+        """Test that a malformed cursor falls back to the first page."""
+        page = self.paginator.page('not-a-cursor')
+        self.assertEqual([equipment.id for equipment in page], self.expected[:PAGE_SIZE])
+        for key in BAD_TYPED_KEYS:
+            page = self.paginator.page(encode_cursor(DIRECTION_NEXT, key))
+            self.assertEqual([equipment.id for equipment in page], self.expected[:PAGE_SIZE])
+
+    def test_bad_typed_cursor_pages(self):
+        """Test that the list pages serve their first page for cursors with bad-typed keys."""
+        user = User.objects.create_user(username='user')
+        Equipment.objects.update(client=Client.objects.create(user=user))
+        self.client.force_login(user)
+        for name in ('equipments', 'companies'):
+            for key in BAD_TYPED_KEYS:
+                cursor = encode_cursor(DIRECTION_NEXT, key)
+                response = self.client.get(reverse(name), {'cursor': cursor})
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_page_view(self):
+        """Test that the equipments page renders a next cursor that serves the following rows."""
+        user = User.objects.create_user(username='user', password='password')
+        client = Client.objects.create(user=user)
+        self.client.force_login(user)
+        Equipment.objects.bulk_create([
+            Equipment(title='Tool', size=size) for size in range(1, DEFAULT_PAGE_SIZE + 1)
+        ])
+        Equipment.objects.update(client=client)
+
+        response = self.client.get(reverse('equipments'))
+        first_page = response.context['equipments']
+        self.assertEqual(len(first_page), DEFAULT_PAGE_SIZE)
+        self.assertContains(response, first_page.next_cursor)
+
+        response = self.client.get(reverse('equipments'), {'cursor': first_page.next_cursor})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        second_page = [equipment.id for equipment in response.context['equipments']]
+        self.assertEqual(second_page, self.expected_all()[DEFAULT_PAGE_SIZE:])
+
+    def expected_all(self):
+        """
+        Return the IDs of all equipment in pagination order.
+
+        Returns:
+            list: Equipment IDs.
+        """
+        ordered = Equipment.objects.order_by('title', models.F('size').asc(nulls_last=True), 'id')
+        return list(ordered.values_list('id', flat=True))
@@ -0,0 +1,139 @@
+"""Tests for the pooled database backend and the connections benchmark."""
+from io import StringIO
+
+import psycopg2
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import DEFAULT_DB_ALIAS, connection
+from django.db.utils import load_backend
+from django.test import SimpleTestCase, TestCase, TransactionTestCase
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE, TRANSACTION_STATUS_INTRANS
+
+from companies_app.connection_benchmark import CONNECTION_MODES, run_connections
+from companies_app.pool.pools import ConnectionPool
+
+POOL_ENGINE = 'companies_app.pool'
+REUSED = 'reused'
+
+
+def run_query(db_connection):
+    """
+    Run a query on a Django connection.
+
+    Args:
+        db_connection: Django database connection.
+
+    Returns:
+        Underlying psycopg2 connection.
+    """
+    with db_connection.cursor() as cursor:
+        cursor.execute('SELECT 1')
+    return db_connection.connection
+
+
+class FakeConnection:
+    """Connection double recording rollbacks."""
+
+    def __init__(self):
+        """Initialize an open connection without transaction."""
+        self.closed = 0
+        self.status = TRANSACTION_STATUS_IDLE
+        self.rollbacks = 0
+
+    def get_transaction_status(self) -> int:
+        """
+        Return the transaction status.
+
+        Returns:
+            int: psycopg2 transaction status.
+        """
+        return self.status
+
+    def rollback(self):
+        """End the transaction."""
+        self.rollbacks += 1
+        self.status = TRANSACTION_STATUS_IDLE
+
+    def close(self):
+        """Close the connection."""
+        self.closed = 1
+
+
+class ConnectionPoolTest(SimpleTestCase):
+    """Test case for checking connections out of a pool and back in."""
+
+    def test_reuse(self):
+        """Test that a returned connection is reused instead of opening a new one."""
+        pool = ConnectionPool()
+        first = pool.checkout(FakeConnection)
+        pool.checkin(first)
+        self.assertIs(pool.checkout(FakeConnection), first)
+        stats = pool.stats()
+        self.assertEqual((stats['checkouts'], stats['created'], stats[REUSED]), (2, 1, 1))
+        self.assertEqual((stats['idle'], stats['in_use']), (0, 1))
+
+    def test_timeout(self):
+        """Test that a checkout from a full pool waits and then fails."""
+        pool = ConnectionPool(max_size=1, timeout=0.01)
+        pool.checkout(FakeConnection)
+        with self.assertRaises(psycopg2.OperationalError):
+            pool.checkout(FakeConnection)
+        stats = pool.stats()
+        self.assertEqual((stats['waits'], stats['timeouts']), (1, 1))
+        self.assertGreater(stats['wait_ms'], 0)
+
+    def test_idle_timeout(self):
+        """Test that connections idle for too long are closed instead of reused."""
+        pool = ConnectionPool(idle_timeout=0)
+        first = pool.checkout(FakeConnection)
+        pool.checkin(first)
+        self.assertIsNot(pool.checkout(FakeConnection), first)
+        self.assertTrue(first.closed)
+        self.assertEqual(pool.stats()['expired'], 1)
+
+    def test_checkin_cleans_connections(self):
+        """Test that open transactions are rolled back and closed connections dropped."""
+        pool = ConnectionPool(max_size=2)
+        in_transaction, broken = [pool.checkout(FakeConnection) for _ in range(2)]
+        in_transaction.status = TRANSACTION_STATUS_INTRANS
+        broken.close()
+        pool.checkin(in_transaction)
+        pool.checkin(broken)
+        self.assertEqual(in_transaction.rollbacks, 1)
+        stats = pool.stats()
+        self.assertEqual((stats['discarded'], stats['idle'], stats['in_use']), (1, 1, 0))
+
+
+class PooledBackendTest(TestCase):
+    """Test case for the database backend using the pool."""
+
+    def test_connections_are_returned(self):
+        """Test that closing a pooled connection keeps it open for the next use."""
+        settings_dict = {**connection.settings_dict, 'ENGINE': POOL_ENGINE}
+        pooled = load_backend(POOL_ENGINE).DatabaseWrapper(settings_dict, DEFAULT_DB_ALIAS)
+        reused = pooled.pool.stats()[REUSED]
+        first = run_query(pooled)
+        pooled.close()
+        self.assertFalse(first.closed)
+        self.assertIs(run_query(pooled), first)
+        pooled.close()
+        self.assertEqual(pooled.pool.stats()[REUSED], reused + 1)
+        pooled.pool.close()
+        self.assertTrue(first.closed)
+
+
+class ConnectionsBenchmarkTest(TransactionTestCase):
+    """Test case for benchmarking a page with each way of handling connections."""
+
+    # Flushes with TRUNCATE ... CASCADE, reaching the tables of companies_schema through auth_user.
+    available_apps = tuple(settings.INSTALLED_APPS)
+
+    def test_run_connections(self):
+        """Test that every mode serves the page and the pooled one reuses its connection."""
+        call_command('seed_data', '--clients', '1', '--reviews', '10', stdout=StringIO())
+        measurements = run_connections(User.objects.get(username='seed0'), repeat=2)
+        self.assertEqual(list(measurements), [mode for mode, _, _ in CONNECTION_MODES])
+        for mode, measured in measurements.items():
+            self.assertEqual(measured['status'], 200, mode)
+        self.assertGreaterEqual(measurements['pooled']['pool'][REUSED], 2)
@@ -0,0 +1,86 @@
+"""Tests for denormalized equipment rating aggregates."""
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from companies_app.models import Client, Equipment, Review
+
+REVIEW_URL = '/api/review/'
+
+
+class RatingAggregatesTest(TestCase):
+    """Test case for keeping Equipment rating aggregates in sync with reviews."""
+
+    def setUp(self):
+        """Set up the test environment by creating a user, a client and an equipment."""
+        self.user = User.objects.create_user(username='user', password='password')
+        self.client_instance = Client.objects.create(user=self.user)
+        self.client.force_login(self.user)
+        self.equipment = Equipment.objects.create(
+            title='Test Equipment', size=10, client=self.client_instance,
+        )
+
+    def assert_aggregates(self, count, total, histogram):
+        """
+        Check the stored aggregates of the test equipment.
+
+        Args:
+            count (int): Expected review count.
+            total (int): Expected rating sum.
+            histogram (dict): Expected counts per rating.
+        """
+        self.equipment.refresh_from_db()
+        self.assertEqual(self.equipment.rating_count, count)
+        self.assertEqual(self.equipment.rating_sum, total)
+        if count:
+            self.assertAlmostEqual(self.equipment.rating_mean, total / count)
+        else:
+            self.assertIsNone(self.equipment.rating_mean)
+        empty_histogram = {1: 0, 2: 0, 3: 0, 4: 0, 5: 0}
+        self.assertEqual(self.equipment.rating_histogram, empty_histogram | histogram)
+
+    def test_review_created_through_view(self):
+        """Test that posting a review on the equipment page updates the aggregates."""
+        url = reverse('equipment_view', args=[self.equipment.id])
+        self.client.post(url, {'text': 'Good', 'rating': 4})
+        self.client.post(url, {'text': 'Bad', 'rating': 1})
+        self.assert_aggregates(2, 5, {4: 1, 1: 1})
+
+    def test_review_deleted_through_view(self):
+        """Test that deleting a review removes it from the aggregates."""
+        review = Review.objects.create(
+            text='Good', rating=5, client=self.client_instance, equipment=self.equipment,
+        )
+        self.assert_aggregates(1, 5, {5: 1})
+        self.client.post(reverse('delete_review', args=[review.id]))
+        self.assert_aggregates(0, 0, {})
+
+    def test_reviews_through_api(self):
+        """Test that API create, update and delete keep the aggregates in sync."""
+        api_client = APIClient()
+        api_client.force_authenticate(User.objects.create_superuser(username='admin'))
+        creation_attrs = {'text': 'Review', 'rating': 2, 'equipment': self.equipment.id}
+        response = api_client.post(REVIEW_URL, creation_attrs)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assert_aggregates(1, 2, {2: 1})
+
+        url = f'{REVIEW_URL}{response.data["id"]}/'
+        api_client.put(url, creation_attrs | {'rating': 3})
+        self.assert_aggregates(1, 3, {3: 1})
+
+        api_client.delete(url)
+        self.assert_aggregates(0, 0, {})
+
+    def test_rebuild_command(self):
+        """Test that the rebuild command recomputes aggregates from reviews."""
+        Review.objects.bulk_create([
+            Review(text='Bulk', rating=rating, equipment=self.equipment) for rating in (1, 3, 3)
+        ])
+        self.assert_aggregates(0, 0, {})
+        call_command('rebuild_ratings', stdout=StringIO())
+        self.assert_aggregates(3, 7, {1: 1, 3: 2})
@@ -0,0 +1,78 @@
+"""Tests for the read replica router, run with POSTGRES_REPLICAS set."""
+from contextlib import ExitStack
+from functools import partial
+from unittest import skipUnless
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test import TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from companies_app.models import Client, Equipment
+from companies_app.routers import PIN_COOKIE, ReplicaRouter
+
+REPLICAS = tuple(settings.DATABASE_REPLICAS)
+REVIEW_TEXT = 'Fresh review'
+
+
+def replica_queries(send) -> tuple:
+    """
+    Send a request and count the queries it ran on the replicas.
+
+    Args:
+        send: Callable sending the request.
+
+    Returns:
+        tuple: Response and number of replica queries.
+    """
+    contexts = [CaptureQueriesContext(connections[alias]) for alias in REPLICAS]
+    with ExitStack() as stack:
+        for context in contexts:
+            stack.enter_context(context)
+        response = send()
+    return response, sum(len(captured.captured_queries) for captured in contexts)
+
+
+@skipUnless(REPLICAS, 'set POSTGRES_REPLICAS to test the replica router')
+class ReplicaRouterTest(TransactionTestCase):
+    """Test case for reading safe requests from a replica and pinning writers to the primary."""
+
+    databases = frozenset((DEFAULT_DB_ALIAS, *REPLICAS))
+    # Flushes with TRUNCATE ... CASCADE, reaching the tables of companies_schema through auth_user.
+    available_apps = tuple(settings.INSTALLED_APPS)
+
+    def setUp(self):
+        """Set up the test environment with an equipment and a logged in user."""
+        user = User.objects.create_user(username='user')
+        self.equipment = Equipment.objects.create(
+            title='Drill', client=Client.objects.create(user=user),
+        )
+        self.client.force_login(user)
+        self.equipment_url = reverse('equipment_view', args=[self.equipment.id])
+
+    def test_safe_requests_read_replica(self):
+        """Test that pages and API endpoints read the models from a replica."""
+        for url in (self.equipment_url, reverse('equipment-list')):
+            response, queries = replica_queries(partial(self.client.get, url))
+            self.assertEqual(response.status_code, 200)
+            self.assertGreater(queries, 0)
+            self.assertNotIn(PIN_COOKIE, response.cookies)
+
+    def test_writes_pin_browser_to_primary(self):
+        """Test that a browser reads its own review from the primary after posting it."""
+        response, queries = replica_queries(partial(
+            self.client.post, self.equipment_url, {'text': REVIEW_TEXT, 'rating': 5},
+        ))
+        self.assertEqual(queries, 0)
+        self.assertIn(PIN_COOKIE, response.cookies)
+        response, queries = replica_queries(partial(self.client.get, self.equipment_url))
+        self.assertEqual(queries, 0)
+        self.assertContains(response, REVIEW_TEXT)
+
+    def test_reads_outside_requests_use_primary(self):
+        """Test that code running outside a request, such as commands, reads the primary."""
+        self.assertEqual(ReplicaRouter().db_for_read(Equipment), DEFAULT_DB_ALIAS)
+        equipment = Equipment.objects.get(pk=self.equipment.pk)
+        self.assertEqual(equipment._state.db, DEFAULT_DB_ALIAS)  # noqa: WPS437
@@ -0,0 +1,129 @@
+"""Tests for the company and category statistics of the materialized views."""
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from companies_app.models import (
+    Category,
+    CategoryStats,
+    Client,
+    Company,
+    CompanyEquipment,
+    CompanyStats,
+    Equipment,
+    Review,
+)
+from companies_app.rollups import refresh_rollups
+from tests.query_budget import assert_query_budget
+
+COMPANY_STATS_URL = '/api/company-stats/'
+REFRESH_URL = '/api/company-stats/refresh/'
+RATINGS = (5, 4, 3)
+
+
+class RollupsTestCase(TestCase):
+    """Base test case with two companies sharing reviewed equipment."""
+
+    def setUp(self):
+        """Set up the test environment with two companies sharing reviewed equipment."""
+        self.user = User.objects.create_user(username='user', is_superuser=True)
+        self.client_instance = Client.objects.create(user=self.user)
+        self.category = Category.objects.create(title='Tools')
+        self.company = self._company('Workshop', '1234567890')
+        other = self._company('Garage', '1234567891')
+        equipments = [
+            Equipment.objects.create(
+                title=f'Drill {index}', category=self.category, client=self.client_instance,
+            )
+            for index in range(2)
+        ]
+        for equipment in equipments:
+            CompanyEquipment.objects.create(company=self.company, equipment=equipment)
+        CompanyEquipment.objects.create(company=other, equipment=equipments[0])
+        self.equipment = equipments[0]
+        for rating in RATINGS:
+            self._review(rating)
+        refresh_rollups()
+        self.api = APIClient()
+        self.api.force_authenticate(self.user)
+
+    def _company(self, title: str, phone: str) -> Company:
+        return Company.objects.create(title=title, phone=phone, client=self.client_instance)
+
+    def _review(self, rating: int) -> Review:
+        return Review.objects.create(
+            text='Review', rating=rating, equipment=self.equipment, client=self.client_instance,
+        )
+
+
+class RollupsTest(RollupsTestCase):
+    """Test case for the company and category statistics of the materialized views."""
+
+    def test_company_stats(self):
+        """Test that a company counts its equipment and the reviews of that equipment."""
+        stats = CompanyStats.objects.get(company=self.company)
+        self.assertEqual((stats.equipment_count, stats.review_count), (2, len(RATINGS)))
+        self.assertEqual(stats.rating_mean, 4)
+        self.assertEqual(CompanyStats.objects.get(company__title='Garage').equipment_count, 1)
+
+    def test_category_stats(self):
+        """Test that a category counts its equipment, the companies holding them and reviews."""
+        stats = CategoryStats.objects.get(category=self.category)
+        self.assertEqual(
+            (stats.equipment_count, stats.company_count, stats.review_count),
+            (2, 2, len(RATINGS)),
+        )
+
+    def test_list_queries(self):
+        """Test that a page of statistics is read with the company titles in one query."""
+        with assert_query_budget(self, 1):
+            response = self.api.get(COMPANY_STATS_URL)
+        titles = {row['title'] for row in response.json()['results']}
+        self.assertEqual(titles, {'Workshop', 'Garage'})
+
+    def test_page(self):
+        """Test that the company page shows the statistics."""
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('company_detail', args=[self.company.id]))
+        self.assertEqual(response.context['stats'].review_count, len(RATINGS))
+        self.assertContains(response, 'Reviews:</strong> 3')
+
+
+class RefreshTest(RollupsTestCase):
+    """Test case for refreshing the materialized views."""
+
+    def test_refresh_on_demand(self):
+        """Test that the statistics stay as of the last refresh until refreshed through the API."""
+        self._review(1)
+        stats_url = reverse('company-stats-detail', args=[self.company.id])
+        self.assertEqual(self.api.get(stats_url).json()['review_count'], len(RATINGS))
+        response = self.api.post(REFRESH_URL)
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(self.api.get(stats_url).json()['review_count'], len(RATINGS) + 1)
+
+    def test_refresh_needs_superuser(self):
+        """Test that only superusers can refresh the statistics."""
+        api = APIClient()
+        api.force_authenticate(User.objects.create_user(username='reader'))
+        self.assertEqual(api.post(REFRESH_URL).status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_refresh_changes_page_etag(self):
+        """Test that a refresh of the statistics is not answered with 304 Not Modified."""
+        self.client.force_login(self.user)
+        url = reverse('company_detail', args=[self.company.id])
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        refresh_rollups()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_commands(self):
+        """Test that the views can be created again and refreshed by command."""
+        stdout = StringIO()
+        call_command('create_schema', rollups=True, stdout=stdout)
+        call_command('refresh_rollups', stdout=stdout)
+        self.assertIn('Successfully refreshed', stdout.getvalue())
@@ -0,0 +1,100 @@
+"""Tests for the fast serialization of the API list pages."""
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from companies_app.models import (
+    Address,
+    Category,
+    Client,
+    Company,
+    CompanyEquipment,
+    Equipment,
+    Review,
+)
+from companies_app.rows import row_serializer
+from companies_app.serializer_benchmark import LISTED, run_serializers
+from companies_app.serializers import CompanySerializer
+from tests.query_budget import assert_query_budget
+
+LIST_URLS = ('/api/companies/', '/api/equipment/', '/api/review/')
+PAGE_SIZE = 2
+EQUIPMENT_ROWS = 3
+
+
+class RowsTest(TestCase):
+    """Test case for the list pages served from database rows."""
+
+    def setUp(self):
+        """Set up the test environment with linked companies and equipment, some fields null."""
+        self.user = User.objects.create_user(username='user', is_superuser=True)
+        client_instance = Client.objects.create(user=self.user)
+        category = Category.objects.create(title='Tools')
+        companies = [
+            Company.objects.create(title='Workshop', phone='1234567890', client=client_instance),
+            Company.objects.create(
+                title='Garage',
+                phone='1234567891',
+                client=client_instance,
+                address=Address.objects.create(
+                    street_name='Main', city='Town', state='State', house_number=1,
+                ),
+            ),
+        ]
+        equipments = [
+            Equipment.objects.create(
+                title=f'Drill {index}', size=index or None, category=category,
+                client=client_instance,
+            )
+            for index in range(EQUIPMENT_ROWS)
+        ]
+        for equipment in reversed(equipments):
+            for company in companies:
+                CompanyEquipment.objects.create(company=company, equipment=equipment)
+        Review.objects.create(
+            text='Good', rating=5, equipment=equipments[0], client=client_instance,
+        )
+        self.api = APIClient()
+        self.api.force_authenticate(self.user)
+
+    def test_pages_match_serializer_path(self):
+        """Test that every page of every endpoint renders the bytes of the serializer path."""
+        for url in LIST_URLS:
+            self.assertEqual(self._pages(url, fast=True), self._pages(url, fast=False), url)
+
+    def test_list_queries(self):
+        """Test that the fast path reads a page and each many-to-many relation once."""
+        with assert_query_budget(self, 2):
+            response = self.api.get('/api/companies/')
+        for company in response.json()['results']:
+            self.assertEqual(len(company['equipments']), EQUIPMENT_ROWS)
+
+    def test_fieldset_uses_serializer_path(self):
+        """Test that a page narrowed by ?fields= is still served with the fieldset."""
+        response = self.api.get('/api/equipment/', {'fields': 'title'})
+        self.assertEqual(set(response.json()['results'][0]), {'title'})
+
+    def test_columns(self):
+        """Test that a row serializer reads each column once, primary key first."""
+        columns = row_serializer(CompanySerializer).columns
+        self.assertEqual(columns[0], 'id')
+        self.assertEqual(len(columns), len(set(columns)))
+        self.assertNotIn('equipments', columns)
+
+    def test_run_serializers(self):
+        """Test that both paths of every model endpoint are benchmarked with the same rows."""
+        measurements = run_serializers(repeat=2, page_sizes=(2,))
+        for name, _ in LISTED:
+            rows = measurements[f'{name}-2-rows']
+            self.assertEqual(rows['rows'], measurements[f'{name}-2-serializer']['rows'])
+            self.assertGreater(rows['rows_per_s'], 0)
+
+    def _pages(self, url: str, fast: bool) -> list:
+        pages = []
+        with override_settings(FAST_LIST_SERIALIZATION=fast):
+            response = self.api.get(url, {'page_size': PAGE_SIZE})
+            pages.append(response.content)
+            while response.json()['next']:
+                response = self.api.get(response.json()['next'])
+                pages.append(response.content)
+        return pages
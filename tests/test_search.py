@@ -0,0 +1,67 @@
+"""Tests for full-text search."""
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from companies_app.models import Address, Client, Company, Equipment, Review
+from companies_app.search import search
+
+SEARCH_URL = '/api/search/'
+
+
+class SearchTest(TestCase):
+    """Test case for searching equipment, companies and reviews."""
+
+    def setUp(self):
+        """Set up the test environment with rows matching different searches."""
+        self.user = User.objects.create_user(username='user')
+        client = Client.objects.create(user=self.user)
+        self.drill = Equipment.objects.create(title='Hammer drill', client=client)
+        self.saw = Equipment.objects.create(title='Circular saw', client=client)
+        address = Address.objects.create(
+            street_name='Drillers street', city='Kazan', state='Tatarstan', house_number=1,
+        )
+        self.by_address = Company.objects.create(
+            title='Tools', phone='1234567890', address=address, client=client,
+        )
+        self.by_title = Company.objects.create(title='Drill masters', phone='1234567890')
+        self.review = Review.objects.create(
+            text='The drill never stalls', rating=5, equipment=self.saw,
+        )
+
+    def test_prefix_search(self):
+        """Test that every kind of object is found by a word prefix."""
+        found = search('dril')
+        self.assertEqual(found['equipments'], [self.drill])
+        self.assertEqual(set(found['companies']), {self.by_address, self.by_title})
+        self.assertEqual(found['reviews'], [self.review])
+
+    def test_all_words_must_match(self):
+        """Test that a query with several words only matches rows containing all of them."""
+        found = search('hammer saw')
+        self.assertEqual(found['equipments'], [])
+        self.assertEqual(search('kazan drill')['companies'], [self.by_address])
+
+    def test_empty_query(self):
+        """Test that a query without words finds nothing."""
+        self.assertEqual(search(' !? '), {'equipments': [], 'companies': [], 'reviews': []})
+
+    def test_search_page(self):
+        """Test that the search page renders the results."""
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('search'), {'q': 'circular'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.context['equipments'], [self.saw])
+        self.assertContains(response, 'Circular saw')
+
+    def test_search_api(self):
+        """Test that the search API returns serialized results with their rank."""
+        api_client = APIClient()
+        api_client.force_authenticate(self.user)
+        response = api_client.get(SEARCH_URL, {'q': 'stalls'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        reviews = response.data['reviews']
+        self.assertEqual([review['id'] for review in reviews], [str(self.review.id)])
+        self.assertGreater(reviews[0]['rank'], 0)
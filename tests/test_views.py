@@ -5,7 +5,10 @@ from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
 
-from companies_app.models import Client, Company, Equipment
+from companies_app.models import Address, Category, Client, Company, Equipment, Review
+from tests.query_budget import assert_query_budget
+
+SEEDED_ROWS = 5
 
 
 def create_test_with_auth(url, page_name, template, auth=True):
@@ -122,3 +125,103 @@ instance_pages = (
 )
 methods_instance = {f'test_{page[1]}': create_test_instance(*page) for page in instance_pages}
 TestInstancePages = type('TestInstancePages', (TestCase,), methods_instance)
+
+
+def create_test_query_budget(page_name, budget):
+    """
+    Create a test method checking that a page stays within its query budget.
+
+    Args:
+        page_name (str): The name of the page being tested.
+        budget (int): The maximum number of queries the page may run.
+
+    Returns:
+        method: A test method for the specified page and budget.
+    """
+
+    def method(self):
+        url_args = [self.user.id] if page_name == 'profile_by_id' else []
+        with assert_query_budget(self, budget):
+            response = self.client.get(reverse(page_name, args=url_args))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    return method
+
+
+class QueryBudgetSetUp(TestCase):
+    """Base test case seeding related rows rendered by the list pages."""
+
+    def setUp(self):
+        """Set up the test environment by creating a user and rows owned by several clients."""
+        self.user = User.objects.create_user(username='user', password='password')
+        self.client_user = Client.objects.create(user=self.user)
+        self.client.force_login(self.user)
+        for index in range(SEEDED_ROWS):
+            owner = Client.objects.create(
+                user=User.objects.create_user(username=f'owner{index}', password='password'),
+            )
+            category = Category.objects.create(title=f'Category {index}')
+            address = Address.objects.create(
+                street_name='Street', city='City', state='State', house_number=index + 1,
+            )
+            for client in (owner, self.client_user):
+                equipment = Equipment.objects.create(
+                    title=f'Equipment {index}', size=index + 1, category=category, client=client,
+                )
+                Company.objects.create(
+                    title=f'Company {index}', phone='1234567890', address=address, client=client,
+                )
+                Review.objects.create(
+                    text=f'Review {index}', rating=5, client=client, equipment=equipment,
+                )
+
+
+query_budgets = (
+    ('equipments', 3),
+    ('companies', 3),
+    ('profile', 6),
+    ('profile_by_id', 4),
+)
+methods_budget = {
+    f'test_{page_name}': create_test_query_budget(page_name, budget) for page_name, budget in
+    query_budgets
+}
+TestQueryBudget = type('TestQueryBudget', (QueryBudgetSetUp,), methods_budget)
+
+
+class TestLinkableCompanies(TestCase):
+    """Test case for the companies offered when adding an equipment to a company."""
+
+    def setUp(self):
+        """Set up the test environment with linked, unlinked and foreign companies."""
+        self.user = User.objects.create_user(username='user', password='password')
+        self.client_user = Client.objects.create(user=self.user)
+        self.client.force_login(self.user)
+        self.equipment = Equipment.objects.create(title='Drill', client=self.client_user)
+        self.linked = Company.objects.create(
+            title='Linked', phone='1234567890', client=self.client_user,
+        )
+        self.linked.equipments.add(self.equipment)
+        self.unlinked = Company.objects.create(
+            title='Unlinked', phone='1234567890', client=self.client_user,
+        )
+        other = Client.objects.create(user=User.objects.create_user(username='other'))
+        Company.objects.create(title='Foreign', phone='1234567890', client=other)
+
+    def test_equipment_page(self):
+        """Test that the equipment page only offers the user's unlinked companies."""
+        response = self.client.get(reverse('equipment_view', args=[self.equipment.id]))
+        self.assertEqual(list(response.context['companies']), [self.unlinked])
+
+    def test_autocomplete(self):
+        """Test that the autocomplete API filters the user's unlinked companies by prefix."""
+        url = reverse('company-autocomplete-list')
+        response = self.client.get(url, {'equipment': self.equipment.id, 'q': 'unl'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), [{'id': str(self.unlinked.id), 'title': 'Unlinked'}])
+
+        response = self.client.get(url, {'q': 'li'})
+        self.assertEqual(response.json(), [{'id': str(self.linked.id), 'title': 'Linked'}])
+
+        response = self.client.get(url, {'equipment': 'not-a-uuid'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)